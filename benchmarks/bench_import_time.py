@@ -0,0 +1,107 @@
+"""Cold start benchmark: time to import the SDK and create a client in a fresh interpreter.
+
+Each measurement runs in a new Python process, as a serverless worker would on a cold start, and reports the
+median and minimum over the runs:
+    import package      import fireblocks_sdk
+    import client       from fireblocks_sdk import FireblocksSDK
+    create client       the import, then FireblocksSDK(private_key, api_key)
+    create 2nd client   creating another client in the same process
+
+With --top, also lists the slowest modules imported by "create client", from python -X importtime.
+
+Usage:
+    python benchmarks/bench_import_time.py [--runs 20] [--top 15]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+SNIPPETS = {
+    "import package": "import fireblocks_sdk",
+    "import client": "from fireblocks_sdk import FireblocksSDK",
+    "create client": (
+        "from fireblocks_sdk import FireblocksSDK\n"
+        "FireblocksSDK(open(KEY_PATH).read(), 'api-key')"
+    ),
+}
+
+TIMER = """
+import time
+KEY_PATH = {key_path!r}
+start = time.perf_counter()
+{snippet}
+print(time.perf_counter() - start)
+"""
+
+SECOND_CLIENT = """
+import time
+from fireblocks_sdk import FireblocksSDK
+pem = open({key_path!r}).read()
+FireblocksSDK(pem, 'api-key')
+start = time.perf_counter()
+FireblocksSDK(pem, 'api-key')
+print(time.perf_counter() - start)
+"""
+
+
+def run_python(code, *flags):
+    result = subprocess.run(
+        [sys.executable, *flags, "-c", code], capture_output=True, text=True, check=True, env=dict(os.environ)
+    )
+    return result
+
+
+def time_snippet(code, runs):
+    return [float(run_python(code).stdout.strip()) * 1000 for _ in range(runs)]
+
+
+def slowest_imports(code, top):
+    stderr = run_python(code, "-X", "importtime").stderr
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if not name.startswith("  "):  # top level imports only, their cumulative time includes their children
+            modules.append((int(cumulative) / 1000, name.strip()))
+    return sorted(modules, reverse=True)[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=20, help="fresh interpreters per measurement")
+    parser.add_argument("--top", type=int, default=0, help="list the slowest top level imports")
+    args = parser.parse_args()
+
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    pem = key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    )
+    with tempfile.NamedTemporaryFile(suffix=".pem", delete=False) as f:
+        f.write(pem)
+    try:
+        print(f"{'measurement':20} {'median ms':>10} {'min ms':>8}")
+        codes = {name: TIMER.format(key_path=f.name, snippet=snippet) for name, snippet in SNIPPETS.items()}
+        codes["create 2nd client"] = SECOND_CLIENT.format(key_path=f.name)
+        for name, code in codes.items():
+            timings = time_snippet(code, args.runs)
+            print(f"{name:20} {statistics.median(timings):10.1f} {min(timings):8.1f}")
+
+        if args.top:
+            print("\nslowest top level imports of 'create client':")
+            for milliseconds, module in slowest_imports(codes["create client"], args.top):
+                print(f"{module:50} {milliseconds:8.1f} ms")
+    finally:
+        os.unlink(f.name)
+
+
+if __name__ == "__main__":
+    main()
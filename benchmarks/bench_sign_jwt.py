@@ -0,0 +1,112 @@
+"""Micro-benchmark for SdkTokenProvider.sign_jwt.
+
+Compares signing with the raw PEM string (re-parsed by PyJWT on every call, the previous behaviour)
+against signing with the private key object SdkTokenProvider loads once at construction, then signing from
+several threads in-process against offloading the signatures to a ProcessPoolSigner, and finally the signing rate
+of each supported key type.
+
+Usage:
+    python benchmarks/bench_sign_jwt.py [--seconds 3] [--threads 8] [--processes 4]
+"""
+import argparse
+import os
+import threading
+import time
+
+import jwt
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519, rsa
+
+from fireblocks_sdk.sdk_token_provider import SdkTokenProvider
+from fireblocks_sdk.signing import ProcessPoolSigner
+
+
+def generate_pem(key=None):
+    key = key or rsa.generate_private_key(public_exponent=65537, key_size=4096)
+    return key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    ).decode("utf-8")
+
+
+def measure(sign, seconds):
+    count = 0
+    start = time.perf_counter()
+    deadline = start + seconds
+    while time.perf_counter() < deadline:
+        sign()
+        count += 1
+    return count / (time.perf_counter() - start)
+
+
+def measure_threads(sign, seconds, threads):
+    counts = []
+    lock = threading.Lock()
+
+    def worker():
+        count = 0
+        deadline = time.perf_counter() + seconds
+        while time.perf_counter() < deadline:
+            sign()
+            count += 1
+        with lock:
+            counts.append(count)
+
+    start = time.perf_counter()
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    return sum(counts) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seconds", type=float, default=3.0, help="duration of each measurement")
+    parser.add_argument("--threads", type=int, default=8, help="signing threads of the concurrent measurements")
+    parser.add_argument("--processes", type=int, default=os.cpu_count(), help="workers of the ProcessPoolSigner")
+    args = parser.parse_args()
+
+    pem = generate_pem()
+    provider = SdkTokenProvider(pem, "api-key", 55)
+    path = "/v1/vault/accounts_paged?limit=200"
+
+    def sign_with_pem():
+        jwt.encode({"uri": path, "sub": "api-key"}, key=pem, algorithm="RS256")
+
+    def sign_with_loaded_key():
+        provider.sign_jwt(path)
+
+    before = measure(sign_with_pem, args.seconds)
+    after = measure(sign_with_loaded_key, args.seconds)
+    print(f"PEM string (before):  {before:10.1f} signs/sec")
+    print(f"loaded key (after):   {after:10.1f} signs/sec")
+    print(f"speedup:              {after / before:10.2f}x")
+
+    threaded = measure_threads(sign_with_loaded_key, args.seconds, args.threads)
+    signing_pool = ProcessPoolSigner(max_workers=args.processes)
+    pooled_provider = SdkTokenProvider(pem, "api-key", 55, signing_pool=signing_pool)
+    try:
+        pooled_provider.sign_jwt(path)  # start the workers
+        pooled = measure_threads(lambda: pooled_provider.sign_jwt(path), args.seconds, args.threads)
+    finally:
+        pooled_provider.close()
+    print(f"{args.threads} threads, in-process: {threaded:10.1f} signs/sec")
+    print(f"{args.threads} threads, {args.processes} processes: {pooled:10.1f} signs/sec")
+
+    key_types = {
+        "RSA 2048 (RS256)": rsa.generate_private_key(public_exponent=65537, key_size=2048),
+        "RSA 4096 (RS256)": rsa.generate_private_key(public_exponent=65537, key_size=4096),
+        "EC P-256 (ES256)": ec.generate_private_key(ec.SECP256R1()),
+        "Ed25519 (EdDSA)": ed25519.Ed25519PrivateKey.generate(),
+    }
+    for name, key in key_types.items():
+        key_provider = SdkTokenProvider(generate_pem(key), "api-key", 55)
+        rate = measure(lambda: key_provider.sign_jwt(path), args.seconds)
+        print(f"{name + ':':22}{rate:10.1f} signs/sec")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+"""Local stand-in for the Fireblocks API, used by the benchmarks.
+
+Emulates the shape (not the semantics) of a few /v1 endpoints over a generated dataset:
+    GET  /v1/transactions              paged with limit/before/after and the next-page header
+    GET  /v1/transactions/{id}
+    POST /v1/transactions
+    GET  /v1/vault/accounts_paged      paged with limit/after
+    GET  /v1/vault/accounts/{id}
+    GET  /v1/supported_assets
+    GET  /v1/assets                    paged with pageSize/pageCursor
+    GET  /v1/assets/{id}
+
+Requests are not authenticated. Usage:
+    python benchmarks/mock_server.py [--port 8080] [--latency-ms 20] [--transactions 10000] [--vault-accounts 10000]
+"""
+import argparse
+import json
+import random
+import re
+import threading
+import time
+import urllib.parse
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ASSETS = ["BTC", "ETH", "SOL", "USDC", "USDT_ERC20", "MATIC_POLYGON", "AVAX", "XRP", "DOGE", "LTC"]
+STATUSES = ["COMPLETED", "COMPLETED", "COMPLETED", "FAILED", "CONFIRMING", "BROADCASTING", "PENDING_AUTHORIZATION"]
+
+
+class MockDataset:
+    def __init__(self, transactions=10000, vault_accounts=10000, assets_per_vault=3, seed=0):
+        rng = random.Random(seed)
+        start = 1_600_000_000_000
+        self.transactions = [
+            {
+                "id": str(uuid.UUID(int=rng.getrandbits(128))),
+                "createdAt": start + i * 1000,
+                "lastUpdated": start + i * 1000 + 500,
+                "status": rng.choice(STATUSES),
+                "assetId": rng.choice(ASSETS),
+                "amount": round(rng.uniform(0.0001, 100), 8),
+                "source": {"type": "VAULT_ACCOUNT", "id": str(rng.randrange(vault_accounts))},
+                "destination": {"type": "EXTERNAL_WALLET", "id": str(uuid.UUID(int=rng.getrandbits(128)))},
+                "txHash": "%064x" % rng.getrandbits(256),
+                "fee": round(rng.uniform(0, 0.01), 8),
+                "networkFee": round(rng.uniform(0, 0.01), 8),
+            }
+            for i in range(transactions)
+        ]
+        self.transactions_by_id = {tx["id"]: tx for tx in self.transactions}
+        self.vault_accounts = [
+            {
+                "id": str(i),
+                "name": f"vault-{i}",
+                "hiddenOnUI": False,
+                "customerRefId": f"customer-{i % 1000}",
+                "autoFuel": False,
+                "assets": [
+                    {
+                        "id": asset,
+                        "total": str(round(rng.uniform(0, 1000), 8)),
+                        "available": str(round(rng.uniform(0, 1000), 8)),
+                        "pending": "0",
+                        "frozen": "0",
+                        "lockedAmount": "0",
+                        "blockHeight": str(rng.randrange(10 ** 7)),
+                    }
+                    for asset in rng.sample(ASSETS, assets_per_vault)
+                ],
+            }
+            for i in range(vault_accounts)
+        ]
+        self.assets = [
+            {"id": asset, "name": asset, "type": "BASE_ASSET", "decimals": 18, "nativeAsset": asset}
+            for asset in ASSETS
+        ]
+
+
+def make_handler(dataset, latency, page_size):
+    class MockFireblocksHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        # send headers and body in one segment, avoiding delayed ACK stalls on keep-alive connections
+        disable_nagle_algorithm = True
+        wbufsize = 64 * 1024
+
+        def do_GET(self):
+            self._handle()
+
+        def do_POST(self):
+            self._handle()
+
+        def log_message(self, format, *args):
+            pass
+
+        def _handle(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            body = self.rfile.read(length) if length else b""
+            if latency:
+                time.sleep(latency)
+            url = urllib.parse.urlparse(self.path)
+            query = dict(urllib.parse.parse_qsl(url.query))
+            try:
+                status, payload, headers = self._route(self.command, url.path, query, body)
+            except (KeyError, ValueError, IndexError):
+                status, payload, headers = 404, {"message": "Not found", "code": 404}, {}
+            data = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(data)
+
+        def _route(self, method, path, query, body):
+            if path == "/v1/transactions" and method == "POST":
+                return 200, {"id": str(uuid.uuid4()), "status": "SUBMITTED"}, {}
+            if path == "/v1/transactions":
+                return self._transactions(query)
+            match = re.fullmatch(r"/v1/transactions/([^/]+)", path)
+            if match:
+                return 200, dataset.transactions_by_id[match.group(1)], {}
+            if path == "/v1/vault/accounts_paged":
+                return self._vault_accounts(query)
+            match = re.fullmatch(r"/v1/vault/accounts/(\d+)", path)
+            if match:
+                return 200, dataset.vault_accounts[int(match.group(1))], {}
+            if path == "/v1/supported_assets":
+                return 200, dataset.assets, {}
+            if path == "/v1/assets":
+                start = int(query.get("pageCursor") or 0)
+                size = int(query.get("pageSize") or page_size)
+                next_cursor = str(start + size) if start + size < len(dataset.assets) else None
+                return 200, {"data": dataset.assets[start:start + size], "next": next_cursor}, {}
+            match = re.fullmatch(r"/v1/assets/([^/]+)", path)
+            if match:
+                return 200, next(asset for asset in dataset.assets if asset["id"] == match.group(1)), {}
+            raise KeyError(path)
+
+        def _transactions(self, query):
+            after = int(query.get("after") or 0)
+            before = int(query.get("before") or 2 ** 63)
+            limit = min(int(query.get("limit") or page_size), 500)
+            offset = int(query.get("offset") or 0)
+            selected = [tx for tx in dataset.transactions if after <= tx["createdAt"] <= before]
+            if query.get("sort") != "ASC":
+                selected.reverse()
+            page = selected[offset:offset + limit]
+            headers = {}
+            if offset + limit < len(selected):
+                next_query = dict(query, offset=offset + limit)
+                host = self.headers.get("Host", "localhost")
+                headers["next-page"] = f"http://{host}/v1/transactions?{urllib.parse.urlencode(next_query)}'"
+            return 200, page, headers
+
+        def _vault_accounts(self, query):
+            start = int(query.get("after") or 0)
+            limit = int(query.get("limit") or page_size)
+            accounts = dataset.vault_accounts[start:start + limit]
+            paging = {"after": str(start + limit)} if start + limit < len(dataset.vault_accounts) else {}
+            return 200, {"accounts": accounts, "paging": paging}, {}
+
+    return MockFireblocksHandler
+
+
+class MockFireblocksServer:
+    def __init__(self, host="127.0.0.1", port=0, latency=0.0, page_size=200, dataset=None):
+        """Threaded mock API server, use as a context manager or call start()/stop().
+
+        Args:
+            latency (float): Seconds added to every response
+            page_size (int): Default page size of the paged endpoints
+            dataset (MockDataset, optional): Data served, a default sized dataset is generated if not given
+        """
+        self.dataset = dataset or MockDataset()
+        self.server = ThreadingHTTPServer((host, port), make_handler(self.dataset, latency, page_size))
+        self.server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--page-size", type=int, default=200)
+    parser.add_argument("--transactions", type=int, default=10000)
+    parser.add_argument("--vault-accounts", type=int, default=10000)
+    args = parser.parse_args()
+
+    dataset = MockDataset(args.transactions, args.vault_accounts)
+    server = MockFireblocksServer(args.host, args.port, args.latency_ms / 1000, args.page_size, dataset)
+    print(f"Mock Fireblocks API listening on {server.url}")
+    try:
+        server.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
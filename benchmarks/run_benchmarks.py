@@ -0,0 +1,241 @@
+"""Offline benchmark suite for the SDK hot paths.
+
+Runs each scenario against a local mock API server (benchmarks/mock_server.py, started in a separate process so
+its CPU time isn't counted) and reports, per scenario:
+    ops/s         operations per second
+    p50, p99      operation latency in milliseconds
+    CPU/op        process CPU time per operation in microseconds
+    peak KiB      peak memory traced while running a sample of the operations under tracemalloc
+    KiB/op        memory still allocated after the sample, per operation
+
+Usage:
+    python benchmarks/run_benchmarks.py [--ops 2000] [--threads 8] [--latency-ms 0] [--page-size 200]
+                                        [--scenario sign_jwt --scenario get_transaction ...] [--json results.json]
+"""
+import argparse
+import json
+import multiprocessing
+import statistics
+import sys
+import threading
+import time
+import tracemalloc
+
+import requests
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+from fireblocks_sdk import (
+    FireblocksSDK,
+    PagedVaultAccountsRequestFilters,
+    PresignedTokenPool,
+    RequestsTransport,
+    TransferPeerPath,
+)
+from fireblocks_sdk.api_types import VAULT_ACCOUNT
+from fireblocks_sdk.sdk import handle_response
+
+try:
+    from mock_server import MockDataset, MockFireblocksServer
+except ImportError:
+    from benchmarks.mock_server import MockDataset, MockFireblocksServer
+
+# transactions polled over and over by the poll_transactions scenarios
+POLLED_TRANSACTIONS = 16
+
+
+def generate_pem():
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    return key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    ).decode("utf-8")
+
+
+def serve(port_queue, latency, page_size, transactions, vault_accounts):
+    server = MockFireblocksServer(latency=latency, page_size=page_size, dataset=MockDataset(transactions, vault_accounts))
+    port_queue.put(server.server.server_address[1])
+    server.server.serve_forever()
+
+
+def start_mock_server_process(latency, page_size, transactions, vault_accounts):
+    port_queue = multiprocessing.Queue()
+    process = multiprocessing.Process(
+        target=serve, args=(port_queue, latency, page_size, transactions, vault_accounts), daemon=True
+    )
+    process.start()
+    return process, f"http://127.0.0.1:{port_queue.get(timeout=60)}"
+
+
+def fake_response(payload):
+    response = requests.Response()
+    response.status_code = 200
+    response._content = json.dumps(payload).encode("utf-8")
+    response.encoding = "utf-8"
+    return response
+
+
+def build_scenarios(sdk, presigned_sdk, dataset, page_size):
+    tx_ids = [tx["id"] for tx in dataset.transactions]
+    vault_page = {"accounts": dataset.vault_accounts[:page_size], "paging": {"after": str(page_size)}}
+    vault_page_body = json.dumps(vault_page).encode("utf-8")
+    transaction_body = {
+        "assetId": "ETH",
+        "source": {"type": VAULT_ACCOUNT, "id": "0"},
+        "destination": {"type": VAULT_ACCOUNT, "id": "1"},
+        "amount": "0.01",
+        "operation": "TRANSFER",
+    }
+    encoded_body = sdk._encode_body(transaction_body)
+
+    def handle_vault_page(i):
+        response = requests.Response()
+        response.status_code = 200
+        response._content = vault_page_body
+        response.encoding = "utf-8"
+        handle_response(response, json_codec=sdk.json_codec)
+
+    def iter_vault_accounts(i, stream=False):
+        for _ in sdk.iter_vault_accounts(PagedVaultAccountsRequestFilters(limit=page_size), max_pages=5, stream=stream):
+            pass
+
+    # name -> (operation taking the operation index, whether it is network bound)
+    return {
+        "sign_jwt": (lambda i: sdk.token_provider.sign_jwt(f"/v1/transactions/{tx_ids[i % len(tx_ids)]}"), False),
+        "sign_jwt_with_body": (lambda i: sdk.token_provider.sign_jwt("/v1/transactions", encoded_body), False),
+        "build_request": (
+            lambda i: sdk._build_request("/v1/transactions", sdk._encode_body(transaction_body)), False
+        ),
+        "handle_response_vault_page": (handle_vault_page, False),
+        "get_transaction": (lambda i: sdk.get_transaction_by_id(tx_ids[i % len(tx_ids)]), True),
+        "poll_transactions": (lambda i: sdk.get_transaction_by_id(tx_ids[i % POLLED_TRANSACTIONS]), True),
+        "poll_transactions_presigned": (
+            lambda i: presigned_sdk.get_transaction_by_id(tx_ids[i % POLLED_TRANSACTIONS]), True
+        ),
+        "create_transaction": (
+            lambda i: sdk.create_transaction(
+                asset_id="ETH",
+                amount="0.01",
+                source=TransferPeerPath(VAULT_ACCOUNT, "0"),
+                destination=TransferPeerPath(VAULT_ACCOUNT, "1"),
+            ),
+            True,
+        ),
+        "iter_vault_accounts_5_pages": (iter_vault_accounts, True),
+        "iter_vault_accounts_5_pages_streamed": (lambda i: iter_vault_accounts(i, stream=True), True),
+    }
+
+
+def run(operation, ops, threads):
+    latencies = []
+    lock = threading.Lock()
+    counter = iter(range(ops))
+
+    def worker():
+        local = []
+        while True:
+            with lock:
+                i = next(counter, None)
+            if i is None:
+                break
+            start = time.perf_counter()
+            operation(i)
+            local.append(time.perf_counter() - start)
+        with lock:
+            latencies.extend(local)
+
+    cpu_start = time.process_time()
+    wall_start = time.perf_counter()
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    wall = time.perf_counter() - wall_start
+    cpu = time.process_time() - cpu_start
+    return latencies, wall, cpu
+
+
+def measure_allocations(operation, ops):
+    tracemalloc.start()
+    try:
+        baseline, _ = tracemalloc.get_traced_memory()
+        for i in range(ops):
+            operation(i)
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return (peak - baseline) / 1024, (current - baseline) / 1024 / ops
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ops", type=int, default=2000, help="operations per scenario")
+    parser.add_argument("--threads", type=int, default=8, help="concurrent callers for network bound scenarios")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="latency added by the mock server")
+    parser.add_argument("--page-size", type=int, default=200)
+    parser.add_argument("--allocation-ops", type=int, default=200, help="operations sampled under tracemalloc")
+    parser.add_argument("--scenario", action="append", help="only run these scenarios")
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args()
+
+    dataset = MockDataset(transactions=10000, vault_accounts=10000)
+    process, url = start_mock_server_process(args.latency_ms / 1000, args.page_size, 10000, 10000)
+    try:
+        transport = RequestsTransport(pool_maxsize=max(10, args.threads))
+        private_key = generate_pem()
+        sdk = FireblocksSDK(private_key, "benchmark-api-key", api_base_url=url, transport=transport)
+        token_pool = PresignedTokenPool(
+            [f"/v1/transactions/{tx['id']}" for tx in dataset.transactions[:POLLED_TRANSACTIONS]],
+            tokens_per_path=4,
+            max_workers=2,
+        )
+        presigned_sdk = FireblocksSDK(
+            private_key, "benchmark-api-key", api_base_url=url, transport=transport, token_pool=token_pool
+        )
+        scenarios = build_scenarios(sdk, presigned_sdk, dataset, args.page_size)
+        names = args.scenario or list(scenarios)
+
+        results = []
+        print(f"{'scenario':38} {'ops/s':>10} {'p50 ms':>9} {'p99 ms':>9} {'CPU/op us':>10} {'peak KiB':>9} {'KiB/op':>8}")
+        for name in names:
+            operation, network_bound = scenarios[name]
+            threads = args.threads if network_bound else 1
+            ops = args.ops if not name.startswith("iter_vault_accounts") else max(1, args.ops // 100)
+            operation(0)  # warm up connections and caches
+            latencies, wall, cpu = run(operation, ops, threads)
+            peak_kib, retained_kib = measure_allocations(operation, min(ops, args.allocation_ops))
+            result = {
+                "scenario": name,
+                "ops": ops,
+                "threads": threads,
+                "ops_per_sec": ops / wall,
+                "p50_ms": percentile(latencies, 0.5) * 1000,
+                "p99_ms": percentile(latencies, 0.99) * 1000,
+                "mean_ms": statistics.mean(latencies) * 1000,
+                "cpu_per_op_us": cpu / ops * 1e6,
+                "alloc_peak_kib": peak_kib,
+                "alloc_retained_kib_per_op": retained_kib,
+            }
+            results.append(result)
+            print(
+                f"{name:38} {result['ops_per_sec']:10.1f} {result['p50_ms']:9.3f} {result['p99_ms']:9.3f} "
+                f"{result['cpu_per_op_us']:10.1f} {peak_kib:9.1f} {retained_kib:8.2f}"
+            )
+            sys.stdout.flush()
+
+        if args.json:
+            with open(args.json, "w") as f:
+                json.dump({"python": sys.version, "args": vars(args), "results": results}, f, indent=2)
+    finally:
+        process.terminate()
+
+
+if __name__ == "__main__":
+    main()
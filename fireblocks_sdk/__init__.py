@@ -1,5 +1,89 @@
-from fireblocks_sdk.sdk import FireblocksSDK
-from fireblocks_sdk.ncw_sdk import FireblocksNCW
-from fireblocks_sdk.sdk_token_provider import SdkTokenProvider
-from fireblocks_sdk.api_types import *
-from fireblocks_sdk.tokenization_api_types import *
+"""Fireblocks API client.
+
+The public names are imported on first access, so importing the package only loads what is actually used.
+asyncio is slow to import, modules used by the sync client import it in their async functions only.
+"""
+import importlib
+
+# public name -> submodule defining it
+_LAZY_IMPORTS = {
+    "FireblocksSDK": "sdk",
+    "FireblocksNCW": "ncw_sdk",
+    "AsyncFireblocksSDK": "async_sdk",
+    "AsyncFireblocksNCW": "async_sdk",
+    "SdkTokenProvider": "sdk_token_provider",
+    "BalanceMatrix": "balance_matrix",
+    "BalanceSnapshotter": "balance_snapshot",
+    "BalanceDelta": "balance_snapshot",
+    "ResponseCache": "cache",
+    "Instrumentation": "instrumentation",
+    "MetricsCollector": "instrumentation",
+    "RequestContext": "instrumentation",
+    "JsonCodec": "json_codec",
+    "StdlibJsonCodec": "json_codec",
+    "OrjsonCodec": "json_codec",
+    "RateLimiter": "rate_limiter",
+    "RetryPolicy": "retry",
+    "ProcessPoolSigner": "signing",
+    "CallbackSigner": "signing",
+    "StreamedResponse": "streaming",
+    "AsyncStreamedResponse": "streaming",
+    "PresignedTokenPool": "token_pool",
+    "instrument_tracing": "tracing",
+    "TracingInstrumentation": "tracing",
+    "TransactionStore": "transaction_store",
+    "TransactionWatcher": "transaction_watcher",
+    "Transport": "transport",
+    "AsyncTransport": "transport",
+    "RequestsTransport": "transport",
+    "HttpxAsyncTransport": "transport",
+    "VaultAccountSpec": "vault_provisioning",
+    "ProvisionedVaultAccount": "vault_provisioning",
+    "BulkProvisioningResult": "vault_provisioning",
+    "AddressSpec": "vault_provisioning",
+    "GeneratedAddress": "vault_provisioning",
+    "BulkAddressResult": "vault_provisioning",
+    "WebhookReceiver": "webhooks",
+    "WebhookVerifier": "webhooks",
+    "AddressIndex": "address_index",
+    "IndexedAddress": "address_index",
+}
+
+# modules whose public names are all re-exported, as by a star import
+_STAR_MODULES = ("api_types", "tokenization_api_types")
+
+# submodules resolve too, as when the package imported them eagerly
+_SUBMODULES = frozenset(_LAZY_IMPORTS.values()) | frozenset(_STAR_MODULES)
+
+
+def _import(module):
+    return importlib.import_module(f"{__name__}.{module}")
+
+
+def _star_names(module):
+    return [name for name in vars(module) if not name.startswith("_")]
+
+
+def __getattr__(name):
+    if name in _LAZY_IMPORTS:
+        value = getattr(_import(_LAZY_IMPORTS[name]), name)
+    elif name in _SUBMODULES:
+        value = _import(name)
+    elif name == "__all__":
+        value = list(_LAZY_IMPORTS)
+        for module in _STAR_MODULES:
+            value += [star_name for star_name in _star_names(_import(module)) if star_name not in value]
+    else:
+        for module in _STAR_MODULES:
+            module = _import(module)
+            if name in _star_names(module):
+                value = getattr(module, name)
+                break
+        else:
+            raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__getattr__("__all__")))
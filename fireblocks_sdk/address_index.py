@@ -0,0 +1,155 @@
+import threading
+from typing import Dict, Optional, Tuple
+
+from .pagination import cursor_from_paging_after
+
+
+class IndexedAddress:
+    def __init__(self, address, vault_account_id, asset_id, customer_ref_id=None, bip44_address_index=None, tag=None):
+        """Owner of a deposit address, as kept by an AddressIndex"""
+        self.address = address
+        self.vault_account_id = vault_account_id
+        self.asset_id = asset_id
+        self.customer_ref_id = customer_ref_id
+        self.bip44_address_index = bip44_address_index
+        self.tag = tag
+
+    def to_dict(self):
+        return {
+            "address": self.address,
+            "vaultAccountId": self.vault_account_id,
+            "assetId": self.asset_id,
+            "customerRefId": self.customer_ref_id,
+            "bip44AddressIndex": self.bip44_address_index,
+            "tag": self.tag,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(
+            data["address"], data["vaultAccountId"], data["assetId"], data.get("customerRefId"),
+            data.get("bip44AddressIndex"), data.get("tag"),
+        )
+
+
+def _key(address, tag):
+    # EVM addresses are hex, their checksummed and lowercase forms are the same address
+    if address.startswith("0x"):
+        address = address.lower()
+    return address, tag or ""
+
+
+class AddressIndex:
+    def __init__(self):
+        """In memory index of deposit addresses to their vault account, asset, customer ref id and BIP44 index.
+
+        Attributes deposits to their owner without an API call. Fill it with the results of
+        FireblocksSDK.generate_new_addresses (pass it as `address_index`) and with
+        FireblocksSDK.update_address_index, which scans the addresses of a vault account asset incrementally.
+        Legacy and enterprise formats of an address are indexed too. Safe to share between threads.
+        """
+        self._addresses: Dict[Tuple[str, str], IndexedAddress] = {}
+        self._cursors: Dict[Tuple[str, str], Optional[str]] = {}
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return self._count
+
+    def __contains__(self, address):
+        return self.lookup(address) is not None
+
+    def lookup(self, address, tag=None) -> Optional[IndexedAddress]:
+        """Returns the owner of an address, or None when it isn't indexed
+
+        Args:
+            address (str): The address, in any of its formats
+            tag (str, optional): The XRP tag, or EOS memo, of tag based assets
+        """
+        return self._addresses.get(_key(address, tag))
+
+    def add(self, address: IndexedAddress, *aliases: str):
+        """Indexes an address, and the other formats of it given as aliases. Returns True if it wasn't indexed yet"""
+        with self._lock:
+            new = _key(address.address, address.tag) not in self._addresses
+            self._count += new
+            for alias in (address.address,) + aliases:
+                if alias:
+                    self._addresses[_key(alias, address.tag)] = address
+            return new
+
+    def add_generated(self, vault_account_id, asset_id, response, customer_ref_id=None):
+        """Indexes an address returned by generate_new_address"""
+        return self._add_response(vault_account_id, asset_id, response, customer_ref_id)
+
+    def add_page(self, vault_account_id, asset_id, addresses):
+        """Indexes the addresses of a get_paginated_addresses page, returns how many weren't indexed yet"""
+        return sum(self._add_response(vault_account_id, asset_id, address) for address in addresses)
+
+    def _add_response(self, vault_account_id, asset_id, response, customer_ref_id=None):
+        entry = IndexedAddress(
+            response["address"], vault_account_id, asset_id, response.get("customerRefId") or customer_ref_id,
+            response.get("bip44AddressIndex"), response.get("tag"),
+        )
+        return self.add(entry, response.get("legacyAddress"), response.get("enterpriseAddress"))
+
+    def scan_cursor(self, vault_account_id, asset_id) -> Optional[str]:
+        """Cursor of the last page read by update_address_index for a vault account asset, None before any scan"""
+        return self._cursors.get((vault_account_id, asset_id))
+
+    def set_scan_cursor(self, vault_account_id, asset_id, cursor):
+        with self._lock:
+            self._cursors[(vault_account_id, asset_id)] = cursor
+
+    def to_state(self):
+        """Returns the index as JSON serializable data, restore it with from_state()"""
+        with self._lock:
+            entries = {}
+            for (address, _), entry in self._addresses.items():
+                entries.setdefault(id(entry), (entry, []))[1].append(address)
+            return {
+                "addresses": [dict(entry.to_dict(), aliases=aliases) for entry, aliases in entries.values()],
+                "cursors": [
+                    {"vaultAccountId": vault_account_id, "assetId": asset_id, "cursor": cursor}
+                    for (vault_account_id, asset_id), cursor in self._cursors.items()
+                ],
+            }
+
+    @classmethod
+    def from_state(cls, state):
+        index = cls()
+        for data in state["addresses"]:
+            index.add(IndexedAddress.from_dict(data), *data.get("aliases", []))
+        for cursor in state.get("cursors", []):
+            index.set_scan_cursor(cursor["vaultAccountId"], cursor["assetId"], cursor["cursor"])
+        return index
+
+
+def update_address_index(sdk, address_index, vault_account_id, asset_id, page_size, full):
+    """Runs FireblocksSDK.update_address_index"""
+    cursor = None if full else address_index.scan_cursor(vault_account_id, asset_id)
+    added = 0
+    while True:
+        page = sdk.get_paginated_addresses(vault_account_id, asset_id, page_size, after=cursor)
+        added += address_index.add_page(vault_account_id, asset_id, page.get("addresses") or [])
+        next_cursor = cursor_from_paging_after(page)
+        if not next_cursor:
+            break
+        cursor = next_cursor
+    address_index.set_scan_cursor(vault_account_id, asset_id, cursor)
+    return added
+
+
+async def aupdate_address_index(sdk, address_index, vault_account_id, asset_id, page_size, full):
+    """Runs AsyncFireblocksSDK.update_address_index"""
+    cursor = None if full else address_index.scan_cursor(vault_account_id, asset_id)
+    added = 0
+    while True:
+        page = await sdk.get_paginated_addresses(vault_account_id, asset_id, page_size, after=cursor)
+        added += address_index.add_page(vault_account_id, asset_id, page.get("addresses") or [])
+        next_cursor = cursor_from_paging_after(page)
+        if not next_cursor:
+            break
+        cursor = next_cursor
+    address_index.set_scan_cursor(vault_account_id, asset_id, cursor)
+    return added
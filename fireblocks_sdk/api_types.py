@@ -115,6 +115,15 @@ TRANSACTION_STATUS_TYPES = (
     TRANSACTION_STATUS_BLOCKED
 )
 
+TRANSACTION_FINAL_STATUS_TYPES = (
+    TRANSACTION_STATUS_COMPLETED,
+    TRANSACTION_STATUS_CANCELLED,
+    TRANSACTION_STATUS_REJECTED,
+    TRANSACTION_STATUS_FAILED,
+    TRANSACTION_STATUS_TIMEOUT,
+    TRANSACTION_STATUS_BLOCKED
+)
+
 VAULT_ACCOUNT = "VAULT_ACCOUNT"
 EXCHANGE_ACCOUNT = "EXCHANGE_ACCOUNT"
 INTERNAL_WALLET = "INTERNAL_WALLET"
@@ -0,0 +1,149 @@
+import asyncio
+import inspect
+from typing import List
+
+from .address_index import aupdate_address_index
+from .cache import ResponseCache
+from .instrumentation import Instrumentation
+from .json_codec import JsonCodec
+from .ncw_sdk import FireblocksNCW
+from .pagination import aiterate_pages
+from .rate_limiter import RateLimiter
+from .retry import RetryPolicy
+from .sdk import _STEP_SEND, _STEP_SLEEP, FireblocksSDK
+from .streaming import AsyncStreamedResponse
+from .signing import ProcessPoolSigner
+from .token_pool import PresignedTokenPool
+from .transaction_export import aexport_transactions
+from .transport import AsyncTransport, HttpxAsyncTransport
+from .vault_provisioning import agenerate_new_addresses, aprovision_vault_accounts
+
+
+class AsyncFireblocksSDK(FireblocksSDK):
+    def __init__(
+            self,
+            private_key,
+            api_key,
+            api_base_url="https://api.fireblocks.io",
+            timeout=None,
+            anonymous_platform=False,
+            seconds_jwt_exp=55,
+            max_connections=100,
+            max_keepalive_connections=20,
+            transport: AsyncTransport = None,
+            rate_limiter: RateLimiter = None,
+            retry_policy: RetryPolicy = None,
+            response_cache: ResponseCache = None,
+            json_codec: JsonCodec = None,
+            token_pool: PresignedTokenPool = None,
+            signing_pool: ProcessPoolSigner = None,
+            instrumentation: List[Instrumentation] = None,
+    ):
+        """Creates a new asyncio Fireblocks API Client.
+
+        Exposes the same methods as FireblocksSDK, but every API call returns a coroutine that must be awaited,
+        and the iter_* methods return async generators.
+        Requests are sent over a pooled httpx.AsyncClient by default, so many calls can be in flight at once.
+
+        Args:
+            private_key (str): A string representation of your private key (in PEM format), or a CallbackSigner
+            api_key (str): Your api key. This is a uuid you received from Fireblocks
+            api_base_url (str): The fireblocks server URL. Leave empty to use the default server
+            timeout (number): Timeout for http requests in seconds
+            max_connections (int): Maximum number of concurrent connections of the default transport
+            max_keepalive_connections (int): Maximum number of idle connections kept alive by the default transport
+            transport (AsyncTransport, optional): HTTP transport used to send requests, overrides the pool settings
+            rate_limiter (RateLimiter, optional): Throttles outgoing requests and retries the ones rejected with HTTP 429
+            retry_policy (RetryPolicy, optional): Resends requests failing with transient errors when it is safe to
+            response_cache (ResponseCache, optional): Caches reference data such as supported assets and blockchains
+            json_codec (JsonCodec, optional): Encodes request bodies and decodes responses, orjson when installed
+            token_pool (PresignedTokenPool, optional): Signs the JWTs of polled GET requests ahead of time
+            signing_pool (ProcessPoolSigner, optional): Not supported, waiting for the workers would block the event loop
+            instrumentation (list of Instrumentation, optional): Hooks called around each phase of every request
+        """
+        if signing_pool is not None:
+            raise ValueError(
+                "AsyncFireblocksSDK doesn't support signing_pool, waiting for a ProcessPoolSigner blocks the event loop"
+            )
+        self.max_connections = max_connections
+        self.max_keepalive_connections = max_keepalive_connections
+        super().__init__(
+            private_key, api_key, api_base_url, timeout, anonymous_platform, seconds_jwt_exp, transport, rate_limiter,
+            retry_policy, response_cache, json_codec, token_pool, signing_pool, instrumentation,
+        )
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def close(self):
+        """Closes the underlying connection pool, and stops the token presigning threads"""
+        await self.transport.close()
+        self.token_provider.close()
+
+    def get_transactions_with_page_info(self, *args, **kwargs):
+        result = super().get_transactions_with_page_info(*args, **kwargs)
+        if inspect.isawaitable(result):
+            return result
+        return self._as_coroutine(result)
+
+    async def _send_request(
+            self, method, path, body=None, page_mode=False, idempotency_key=None, ncw_wallet_id=None, stream=False,
+            items_key=None,
+    ):
+        steps = self._request_steps(method, path, body, page_mode, idempotency_key, ncw_wallet_id, stream, items_key)
+        stream_kwargs = {"stream": True} if stream else {}
+        try:
+            step, argument = next(steps)
+            while True:
+                try:
+                    outcome = None
+                    if step == _STEP_SEND:
+                        url, headers, data = argument
+                        outcome = await self.transport.request(
+                            method, url, headers=headers, data=data, timeout=self.timeout, **stream_kwargs
+                        )
+                    elif step == _STEP_SLEEP:
+                        await asyncio.sleep(argument)
+                    else:
+                        await argument.aread()
+                        await argument.aclose()
+                except BaseException as e:
+                    step, argument = steps.throw(e)
+                else:
+                    step, argument = steps.send(outcome)
+        except StopIteration as done:
+            return done.value
+
+    def _create_transport(self):
+        return HttpxAsyncTransport(self.max_connections, self.max_keepalive_connections)
+
+    def _create_streamed_response(self, response, items_key, trace):
+        return AsyncStreamedResponse(response, items_key, trace=trace)
+
+    def _iterate_pages(self, fetch_page, items_key, next_cursor, max_items=None, max_pages=None, prefetch=False):
+        return aiterate_pages(fetch_page, items_key, next_cursor, max_items, max_pages, prefetch)
+
+    def _export_transactions(self, boundaries, page_size, max_workers, max_buffered_pages, filters):
+        return aexport_transactions(self, boundaries, page_size, max_workers, max_buffered_pages, filters)
+
+    def _provision_vault_accounts(self, specs, max_workers, resume_from, on_item_done):
+        return aprovision_vault_accounts(self, specs, max_workers, resume_from, on_item_done)
+
+    def _generate_new_addresses(self, specs, max_workers, resume_from, on_item_done, address_index):
+        return agenerate_new_addresses(self, specs, max_workers, resume_from, on_item_done, address_index)
+
+    def _update_address_index(self, address_index, vault_account_id, asset_id, page_size, full):
+        return aupdate_address_index(self, address_index, vault_account_id, asset_id, page_size, full)
+
+    @staticmethod
+    async def _as_coroutine(result):
+        return result
+
+
+class AsyncFireblocksNCW(FireblocksNCW):
+    def __init__(self, sdk: AsyncFireblocksSDK):
+        """Non-custodial wallets API over an AsyncFireblocksSDK, every call returns a coroutine"""
+        super().__init__(sdk)
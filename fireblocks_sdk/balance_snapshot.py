@@ -0,0 +1,253 @@
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .api_types import PagedVaultAccountsRequestFilters
+
+DELTA_ADDED = "added"
+DELTA_CHANGED = "changed"
+DELTA_REMOVED = "removed"
+
+DEFAULT_BALANCE_FIELDS = ("total", "available", "pending", "frozen", "lockedAmount", "staked")
+
+
+class BalanceDelta:
+    def __init__(self, kind, vault_account_id, asset_id, balance, previous):
+        """A change of a vault account asset balance, emitted by BalanceSnapshotter.
+
+        Attributes:
+            kind: DELTA_ADDED, DELTA_CHANGED or DELTA_REMOVED
+            vault_account_id, asset_id: The vault account asset
+            balance: The tracked balance fields after the change, None when removed
+            previous: The tracked balance fields before the change, None when added
+        """
+        self.kind = kind
+        self.vault_account_id = vault_account_id
+        self.asset_id = asset_id
+        self.balance = balance
+        self.previous = previous
+
+    def __repr__(self):
+        return f"BalanceDelta({self.kind!r}, {self.vault_account_id!r}, {self.asset_id!r}, {self.balance!r})"
+
+    def to_dict(self):
+        return {
+            "kind": self.kind,
+            "vaultAccountId": self.vault_account_id,
+            "assetId": self.asset_id,
+            "balance": self.balance,
+            "previous": self.previous,
+        }
+
+
+class BalanceSnapshotter:
+    def __init__(
+            self,
+            sdk,
+            asset_ids: Sequence[str] = None,
+            min_amount_threshold=None,
+            hot_accounts: Iterable[Tuple[str, str]] = (),
+            full_scan_interval: float = 60,
+            hot_interval: float = 5,
+            page_size: int = 500,
+            fields: Sequence[str] = DEFAULT_BALANCE_FIELDS,
+            emit_initial: bool = True,
+            on_delta: Callable[[BalanceDelta], None] = None,
+    ):
+        """Keeps the last known balance of every vault account asset, and reports what changed between polls.
+
+        A full scan pages through the vault accounts, filtered by asset and minimum amount when given, and diffs
+        them against the snapshot. Between full scans only the hot accounts are refreshed, one
+        get_vault_account_asset call each. A vault account asset missing from a full scan (e.g. its balance fell
+        under min_amount_threshold) is reported removed.
+
+        Drive it either with start()/stop() (or as a context manager), which polls on a background thread and
+        passes the deltas to on_delta, by iterating over iter_deltas(), or by calling poll() from your own loop.
+
+        Args:
+            sdk (FireblocksSDK): The client used for the lookups
+            asset_ids (list of str, optional): Only track these assets, one scan per asset, all assets by default
+            min_amount_threshold (number, optional): Only track assets with at least this total balance
+            hot_accounts (list of (vault_account_id, asset_id), optional): Refreshed every hot_interval
+            full_scan_interval (float, optional): Seconds between full scans
+            hot_interval (float, optional): Seconds between refreshes of the hot accounts
+            page_size (int, optional): Vault accounts per page of a full scan
+            fields (list of str, optional): The balance fields compared, and reported in the deltas
+            emit_initial (bool, optional): Report the vault account assets found by the first scan as added
+            on_delta (callable, optional): Called with every BalanceDelta
+        """
+        self.sdk = sdk
+        self.asset_ids = list(asset_ids) if asset_ids else None
+        self.min_amount_threshold = min_amount_threshold
+        self.full_scan_interval = full_scan_interval
+        self.hot_interval = hot_interval
+        self.page_size = page_size
+        self.fields = tuple(fields)
+        self.emit_initial = emit_initial
+        self.on_delta = on_delta
+        self._balances: Dict[Tuple[str, str], tuple] = {}
+        self._hot = set(hot_accounts)
+        self._scanned = False
+        self._next_full_scan_at = 0.0
+        self._next_hot_refresh_at = 0.0
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def add_hot_account(self, vault_account_id, asset_id):
+        with self._lock:
+            self._hot.add((vault_account_id, asset_id))
+
+    def remove_hot_account(self, vault_account_id, asset_id):
+        with self._lock:
+            self._hot.discard((vault_account_id, asset_id))
+
+    def balance(self, vault_account_id, asset_id) -> Optional[dict]:
+        """Returns the last known balance of a vault account asset, None when it isn't tracked"""
+        values = self._balances.get((vault_account_id, asset_id))
+        return dict(zip(self.fields, values)) if values is not None else None
+
+    def snapshot(self) -> Dict[Tuple[str, str], dict]:
+        """Returns the last known balances by (vault_account_id, asset_id)"""
+        with self._lock:
+            balances = list(self._balances.items())
+        return {key: dict(zip(self.fields, values)) for key, values in balances}
+
+    def start(self):
+        if self._thread is None:
+            self._stopped.clear()
+            self._thread = threading.Thread(target=self._run, name="fireblocks-balance-snapshotter", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def poll(self) -> List[BalanceDelta]:
+        """Runs the full scan or hot accounts refresh that is due, if any, and returns the deltas found"""
+        now = time.monotonic()
+        if now >= self._next_full_scan_at:
+            deltas = self.full_scan()
+        elif now >= self._next_hot_refresh_at:
+            deltas = self.refresh_hot_accounts()
+        else:
+            return []
+        if self.on_delta:
+            for delta in deltas:
+                self.on_delta(delta)
+        return deltas
+
+    def iter_deltas(self):
+        """Polls from the calling thread and yields the deltas as they are found, forever"""
+        while True:
+            yield from self.poll()
+            wait = self.next_poll_in()
+            if wait > 0:
+                time.sleep(wait)
+
+    def next_poll_in(self) -> float:
+        """Seconds until the next full scan or hot accounts refresh is due"""
+        next_at = self._next_full_scan_at
+        if self._hot:
+            next_at = min(next_at, self._next_hot_refresh_at)
+        return max(0.0, next_at - time.monotonic())
+
+    def full_scan(self) -> List[BalanceDelta]:
+        """Reads the balances of every tracked vault account asset, returns the deltas"""
+        found = {}
+        for asset_id in self.asset_ids or [None]:
+            filters = PagedVaultAccountsRequestFilters(
+                asset_id=asset_id, min_amount_threshold=self.min_amount_threshold, limit=self.page_size
+            )
+            for account in self.sdk.iter_vault_accounts(filters, prefetch=True):
+                for asset in account.get("assets") or []:
+                    if (asset_id is None or asset["id"] == asset_id) and self._tracked(asset["id"], asset):
+                        found[(account["id"], asset["id"])] = self._values(asset)
+
+        emit = self._scanned or self.emit_initial
+        with self._lock:
+            deltas = [
+                BalanceDelta(DELTA_REMOVED, key[0], key[1], None, dict(zip(self.fields, values)))
+                for key, values in self._balances.items()
+                if key not in found
+            ]
+            for key, values in found.items():
+                delta = self._update(key, values)
+                if delta is not None:
+                    deltas.append(delta)
+            self._balances = found
+        self._scanned = True
+        now = time.monotonic()
+        self._next_full_scan_at = now + self.full_scan_interval
+        self._next_hot_refresh_at = now + self.hot_interval
+        return deltas if emit else []
+
+    def refresh_hot_accounts(self) -> List[BalanceDelta]:
+        """Reads the balances of the hot accounts only, returns the deltas"""
+        with self._lock:
+            hot = list(self._hot)
+        deltas = []
+        for vault_account_id, asset_id in hot:
+            try:
+                asset = self.sdk.get_vault_account_asset(vault_account_id, asset_id)
+            except Exception:
+                # the next full scan settles it
+                continue
+            with self._lock:
+                if self._tracked(asset_id, asset):
+                    delta = self._update((vault_account_id, asset_id), self._values(asset))
+                else:
+                    delta = self._remove((vault_account_id, asset_id))
+            if delta is not None:
+                deltas.append(delta)
+        self._next_hot_refresh_at = time.monotonic() + self.hot_interval
+        return deltas
+
+    def _tracked(self, asset_id, asset):
+        """Whether a vault account asset passes the asset and threshold filters of the full scans"""
+        return (self.asset_ids is None or asset_id in self.asset_ids) and self._above_threshold(asset)
+
+    def _above_threshold(self, asset):
+        # accounts are filtered by the API, their other assets are filtered here
+        if self.min_amount_threshold is None:
+            return True
+        return float(asset.get("total") or 0) >= float(self.min_amount_threshold)
+
+    def _values(self, asset):
+        return tuple(asset.get(field) for field in self.fields)
+
+    def _update(self, key, values):
+        """Stores the balance of a vault account asset, returns its delta or None when unchanged. Holds the lock"""
+        previous = self._balances.get(key)
+        if previous == values:
+            return None
+        self._balances[key] = values
+        balance = dict(zip(self.fields, values))
+        if previous is None:
+            return BalanceDelta(DELTA_ADDED, key[0], key[1], balance, None)
+        return BalanceDelta(DELTA_CHANGED, key[0], key[1], balance, dict(zip(self.fields, previous)))
+
+    def _remove(self, key):
+        """Stops tracking a vault account asset, returns its delta or None when it wasn't tracked. Holds the lock"""
+        previous = self._balances.pop(key, None)
+        if previous is None:
+            return None
+        return BalanceDelta(DELTA_REMOVED, key[0], key[1], None, dict(zip(self.fields, previous)))
+
+    def _run(self):
+        while not self._stopped.is_set():
+            try:
+                self.poll()
+                wait = self.next_poll_in()
+            except Exception:
+                wait = min(self.hot_interval, self.full_scan_interval)
+            self._stopped.wait(wait)
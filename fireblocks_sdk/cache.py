@@ -0,0 +1,115 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict
+
+DEFAULT_CACHE_TTLS = {
+    "/v1/supported_assets": 3600,
+    "/v1/assets": 3600,
+    "/v1/blockchains": 3600,
+    "/v1/estimate_network_fee": 15,
+}
+
+
+class ResponseCache:
+    def __init__(self, ttls: Dict[str, float] = None, max_entries: int = 1024):
+        """Opt-in TTL cache for GET responses of slowly changing reference data, safe to share between threads.
+
+        Only GET requests whose path starts with one of the `ttls` prefixes are cached, each prefix with its own TTL.
+        By default this covers get_supported_assets, list_assets, get_asset_by_id, list_blockchains,
+        get_blockchain_by_id and get_fee_for_asset. A successful POST/PUT/PATCH/DELETE under a cached prefix
+        invalidates that prefix.
+
+        Every hit returns a copy of the cached response, so callers may modify it. Responses are cached per client
+        (base URL and API key), a cache shared by clients of different workspaces never mixes their responses.
+
+        Args:
+            ttls (dict, optional): Seconds to keep responses, keyed by path prefix. Defaults to DEFAULT_CACHE_TTLS.
+                The longest matching prefix applies
+            max_entries (int, optional): Maximum number of cached responses, the least recently used are evicted
+        """
+        ttls = DEFAULT_CACHE_TTLS if ttls is None else ttls
+        self.ttls = dict(sorted(ttls.items(), key=lambda item: -len(item[0])))
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._hits = {prefix: 0 for prefix in self.ttls}
+        self._misses = {prefix: 0 for prefix in self.ttls}
+        self._lock = threading.Lock()
+
+    def get(self, path, scope=None):
+        """Returns (True, response) on a hit, (False, None) on a miss or for a path that isn't cached
+
+        Args:
+            path (str): The request path, with its query string
+            scope (optional): Hashable identifying the client, responses cached for another scope are misses
+        """
+        prefix = self._prefix(path)
+        if prefix is None:
+            return False, None
+        key = (scope, path)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                self._hits[prefix] += 1
+                response = entry[1]
+            else:
+                if entry is not None:
+                    del self._entries[key]
+                self._misses[prefix] += 1
+                return False, None
+        return True, _copy(response)
+
+    def set(self, path, response, scope=None):
+        prefix = self._prefix(path)
+        if prefix is None:
+            return
+        response = _copy(response)
+        key = (scope, path)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttls[prefix], response)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, path_prefix: str = None):
+        """Drops the cached responses whose path starts with `path_prefix`, or all of them, of every client"""
+        with self._lock:
+            if path_prefix is None:
+                self._entries.clear()
+                return
+            for key in [key for key in self._entries if key[1].startswith(path_prefix)]:
+                del self._entries[key]
+
+    def on_write(self, path):
+        prefix = self._prefix(path)
+        if prefix is not None:
+            self.invalidate(prefix)
+
+    def stats(self):
+        """Hit and miss counters per cached path prefix, plus totals and the current number of entries"""
+        with self._lock:
+            return {
+                "hits": sum(self._hits.values()),
+                "misses": sum(self._misses.values()),
+                "entries": len(self._entries),
+                "endpoints": {
+                    prefix: {"hits": self._hits[prefix], "misses": self._misses[prefix]} for prefix in self.ttls
+                },
+            }
+
+    def _prefix(self, path):
+        path_only = path.split("?", 1)[0]
+        for prefix in self.ttls:
+            if path_only == prefix or path_only.startswith(prefix + "/"):
+                return prefix
+        return None
+
+
+def _copy(value):
+    """Copies decoded JSON, several times faster than copy.deepcopy"""
+    if isinstance(value, dict):
+        return {key: _copy(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_copy(item) for item in value]
+    return value
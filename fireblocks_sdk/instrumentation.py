@@ -0,0 +1,245 @@
+import bisect
+import re
+import threading
+import time
+from functools import lru_cache
+from typing import Dict, Sequence
+
+PHASE_REQUEST = "request"
+PHASE_SERIALIZE = "serialize"
+PHASE_SIGN = "sign"
+PHASE_SEND = "send"
+PHASE_RECEIVE = "receive"
+PHASE_PARSE = "parse"
+
+_ID_SEGMENT = re.compile(
+    r"\d+|[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}|0x[0-9a-fA-F]+|[0-9a-fA-F]{16,}"
+)
+
+
+@lru_cache(maxsize=4096)
+def endpoint_template(path: str) -> str:
+    """Groups request paths by endpoint, replacing ids with "{id}", e.g. /v1/vault/accounts/12 -> /v1/vault/accounts/{id}
+
+    Numeric, UUID and long hexadecimal path segments are considered ids, the query string is dropped.
+    """
+    segments = path.split("?", 1)[0].split("/")
+    return "/".join("{id}" if _ID_SEGMENT.fullmatch(segment) else segment for segment in segments)
+
+
+class RequestContext:
+    def __init__(self, method: str, path: str):
+        """State of a request passed to the Instrumentation hooks, filled in as the request progresses.
+
+        Attributes:
+            method, path: The HTTP method and path, including the query string
+            endpoint: The path template, see endpoint_template()
+            attempts: Number of times the request was sent, more than 1 when it was retried
+            status_code: Status of the last response, None before a response is received
+            request_size: Bytes of the encoded request body
+            response_size: Bytes of the response body, for streamed responses set once they were iterated
+            cached: Whether the response came from the ResponseCache
+            error: The exception failing the request, if any
+            timings: Seconds spent per phase, summed over the attempts
+            attributes: Free for hooks to keep per-request state in
+        """
+        self.method = method
+        self.path = path
+        self.endpoint = endpoint_template(path)
+        self.attempts = 0
+        self.status_code = None
+        self.request_size = 0
+        self.response_size = None
+        self.cached = False
+        self.error = None
+        self.timings: Dict[str, float] = {}
+        self.attributes = {}
+
+
+class Instrumentation:
+    """Receives the events of every request sent by a client, subclass it and override the hooks you need.
+
+    A request goes through these phases: PHASE_REQUEST spans the whole call, PHASE_SERIALIZE encodes the body,
+    then for each attempt PHASE_SIGN signs the JWT and PHASE_SEND sends the request and waits for the response,
+    including its body, and finally PHASE_PARSE decodes it.
+
+    For streamed responses, PHASE_SEND only waits for the status and headers. The body is read and decoded in
+    PHASE_RECEIVE, while the StreamedResponse is iterated, and PHASE_REQUEST ends once it was iterated or closed.
+    Hooks run on the calling thread (or event loop) and should be quick.
+    """
+
+    def before(self, phase: str, context: RequestContext):
+        pass
+
+    def after(self, phase: str, context: RequestContext):
+        pass
+
+
+class _RequestTrace:
+    """Times the phases of a request and calls the hooks"""
+
+    def __init__(self, hooks, method, path):
+        self.hooks = hooks
+        self.context = RequestContext(method, path)
+        self._started = {}
+
+    def begin(self, phase):
+        for hook in self.hooks:
+            hook.before(phase, self.context)
+        self._started[phase] = time.perf_counter()
+
+    def end(self, phase):
+        started = self._started.pop(phase, None)
+        if started is None:
+            # already ended by fail()
+            return
+        elapsed = time.perf_counter() - started
+        timings = self.context.timings
+        timings[phase] = timings.get(phase, 0.0) + elapsed
+        for hook in self.hooks:
+            hook.after(phase, self.context)
+
+    def fail(self, error):
+        self.context.error = error
+        for phase in [phase for phase in self._started if phase != PHASE_REQUEST]:
+            self.end(phase)
+
+
+class _NoTrace:
+    """Stands in for _RequestTrace when no instrumentation is configured"""
+
+    context = None
+
+    def begin(self, phase):
+        pass
+
+    def end(self, phase):
+        pass
+
+    def fail(self, error):
+        pass
+
+
+NO_TRACE = _NoTrace()
+
+
+def start_trace(hooks, method, path):
+    return _RequestTrace(hooks, method, path) if hooks else NO_TRACE
+
+
+DEFAULT_LATENCY_BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000, 30000)
+
+
+class LatencyHistogram:
+    def __init__(self, buckets_ms: Sequence[float] = DEFAULT_LATENCY_BUCKETS_MS):
+        """Counts durations in fixed buckets, each bucket counting the durations up to its upper bound in ms"""
+        self.buckets_ms = tuple(buckets_ms)
+        self.counts = [0] * (len(self.buckets_ms) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def record(self, seconds: float):
+        ms = seconds * 1000
+        self.counts[bisect.bisect_left(self.buckets_ms, ms)] += 1
+        self.count += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+
+    def percentile(self, fraction: float):
+        """Upper bound of the bucket holding the percentile, or the maximum for the overflow bucket"""
+        if not self.count:
+            return None
+        rank = fraction * self.count
+        seen = 0
+        for i, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank and count:
+                return self.buckets_ms[i] if i < len(self.buckets_ms) else self.max_ms
+        return self.max_ms
+
+    def snapshot(self):
+        return {
+            "count": self.count,
+            "mean_ms": self.total_ms / self.count if self.count else None,
+            "p50_ms": self.percentile(0.5),
+            "p90_ms": self.percentile(0.9),
+            "p99_ms": self.percentile(0.99),
+            "max_ms": self.max_ms,
+            "buckets_ms": list(self.buckets_ms),
+            "counts": list(self.counts),
+        }
+
+
+class _EndpointMetrics:
+    def __init__(self, buckets_ms):
+        self.buckets_ms = buckets_ms
+        self.phases: Dict[str, LatencyHistogram] = {}
+        self.errors = 0
+        self.retries = 0
+        self.cache_hits = 0
+
+    def histogram(self, phase):
+        histogram = self.phases.get(phase)
+        if histogram is None:
+            histogram = self.phases[phase] = LatencyHistogram(self.buckets_ms)
+        return histogram
+
+
+class MetricsCollector(Instrumentation):
+    def __init__(self, buckets_ms: Sequence[float] = DEFAULT_LATENCY_BUCKETS_MS):
+        """Keeps latency histograms per endpoint template and phase, and error counts, safe to share between clients.
+
+        Args:
+            buckets_ms (list of float, optional): Upper bounds of the histogram buckets, in milliseconds
+        """
+        self.buckets_ms = tuple(buckets_ms)
+        self._endpoints: Dict[str, _EndpointMetrics] = {}
+        self._errors_by_status: Dict[int, int] = {}
+        self._errors_by_code: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def after(self, phase: str, context: RequestContext):
+        if phase != PHASE_REQUEST:
+            return
+        key = f"{context.method} {context.endpoint}"
+        error = context.error
+        with self._lock:
+            metrics = self._endpoints.get(key)
+            if metrics is None:
+                metrics = self._endpoints[key] = _EndpointMetrics(self.buckets_ms)
+            for name, seconds in context.timings.items():
+                metrics.histogram(name).record(seconds)
+            metrics.retries += max(0, context.attempts - 1)
+            metrics.cache_hits += context.cached
+            if error is None:
+                return
+            metrics.errors += 1
+            if context.status_code is not None and context.status_code >= 300:
+                self._errors_by_status[context.status_code] = self._errors_by_status.get(context.status_code, 0) + 1
+            error_code = getattr(error, "error_code", None)
+            code = str(error_code) if error_code is not None else type(error).__name__
+            self._errors_by_code[code] = self._errors_by_code.get(code, 0) + 1
+
+    def snapshot(self):
+        """Returns the collected metrics as plain, JSON serializable, data"""
+        with self._lock:
+            return {
+                "endpoints": {
+                    key: {
+                        "errors": metrics.errors,
+                        "retries": metrics.retries,
+                        "cache_hits": metrics.cache_hits,
+                        "phases": {phase: histogram.snapshot() for phase, histogram in metrics.phases.items()},
+                    }
+                    for key, metrics in self._endpoints.items()
+                },
+                "errors_by_status": {str(status): count for status, count in self._errors_by_status.items()},
+                "errors_by_code": dict(self._errors_by_code),
+            }
+
+    def reset(self):
+        with self._lock:
+            self._endpoints.clear()
+            self._errors_by_status.clear()
+            self._errors_by_code.clear()
@@ -0,0 +1,52 @@
+import json
+
+
+class JsonCodec:
+    """Encodes request bodies to bytes and decodes response bodies.
+
+    Subclass it to plug in another JSON library. dumps() must be deterministic, its output is both hashed into
+    the request JWT and sent as the request body.
+    """
+
+    name = None
+
+    def dumps(self, obj) -> bytes:
+        raise NotImplementedError
+
+    def loads(self, data):
+        raise NotImplementedError
+
+
+class StdlibJsonCodec(JsonCodec):
+    name = "json"
+
+    def dumps(self, obj) -> bytes:
+        return json.dumps(obj).encode("utf-8")
+
+    def loads(self, data):
+        return json.loads(data)
+
+
+class OrjsonCodec(JsonCodec):
+    name = "orjson"
+
+    def __init__(self):
+        """JSON codec backed by orjson (https://github.com/ijl/orjson), several times faster than the stdlib"""
+        import orjson
+
+        self._orjson = orjson
+        self._options = orjson.OPT_NON_STR_KEYS
+
+    def dumps(self, obj) -> bytes:
+        return self._orjson.dumps(obj, option=self._options)
+
+    def loads(self, data):
+        return self._orjson.loads(data)
+
+
+def default_json_codec() -> JsonCodec:
+    """Returns an OrjsonCodec when orjson is installed, a StdlibJsonCodec otherwise"""
+    try:
+        return OrjsonCodec()
+    except ImportError:
+        return StdlibJsonCodec()
@@ -1,3 +1,4 @@
+from .pagination import cursor_from_next
 from .sdk import FireblocksSDK
 import urllib
 
@@ -55,6 +56,22 @@ class FireblocksNCW:
 
         return self.sdk._get_request(url, query_params=query_params)
 
+    def iter_wallet_accounts(
+        self,
+        wallet_id: str,
+        page_size: int = None,
+        sort: str = None,
+        order: str = None,
+        enabled: bool = None,
+        max_items: int = None,
+        max_pages: int = None,
+        prefetch: bool = False,
+    ):
+        return self.sdk._iterate_pages(
+            lambda cursor: self.get_wallet_accounts(wallet_id, cursor, page_size, sort, order, enabled),
+            "data", cursor_from_next, max_items, max_pages, prefetch,
+        )
+
     def get_wallet_account(self, wallet_id: str, account_id: str):
         url = f"{self._wallet_url}/{wallet_id}/accounts/{account_id}"
         return self.sdk._get_request(url)
@@ -89,6 +106,23 @@ class FireblocksNCW:
 
         return self.sdk._get_request(url, query_params=query_params)
 
+    def iter_wallet_assets(
+        self,
+        wallet_id: str,
+        account_id: str,
+        page_size: int = None,
+        sort: str = None,
+        order: str = None,
+        enabled: bool = None,
+        max_items: int = None,
+        max_pages: int = None,
+        prefetch: bool = False,
+    ):
+        return self.sdk._iterate_pages(
+            lambda cursor: self.get_wallet_assets(wallet_id, account_id, cursor, page_size, sort, order, enabled),
+            "data", cursor_from_next, max_items, max_pages, prefetch,
+        )
+
     def get_wallet_asset(self, wallet_id: str, account_id: str, asset_id: str):
         url = f"{self._wallet_url}/{wallet_id}/accounts/{account_id}/assets/{asset_id}"
         return self.sdk._get_request(url)
@@ -140,6 +174,26 @@ class FireblocksNCW:
 
         return self.sdk._get_request(url, query_params=query_params)
 
+    def iter_wallet_asset_addresses(
+        self,
+        wallet_id: str,
+        account_id: str,
+        asset_id: str,
+        page_size: int = None,
+        sort: str = None,
+        order: str = None,
+        enabled: bool = None,
+        max_items: int = None,
+        max_pages: int = None,
+        prefetch: bool = False,
+    ):
+        return self.sdk._iterate_pages(
+            lambda cursor: self.get_wallet_asset_addresses(
+                wallet_id, account_id, asset_id, cursor, page_size, sort, order, enabled
+            ),
+            "data", cursor_from_next, max_items, max_pages, prefetch,
+        )
+
     def get_devices(self, wallet_id: str):
         url = f"{self._wallet_url}/{wallet_id}/devices"
         return self.sdk._get_request(url)
@@ -0,0 +1,112 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from .streaming import StreamedResponse, AsyncStreamedResponse
+
+
+def cursor_from_paging_after(page):
+    """Next page cursor of endpoints paged with before/after, e.g. {"accounts": [...], "paging": {"after": "..."}}"""
+    return (page.get("paging") or {}).get("after")
+
+
+def cursor_from_next(page):
+    """Next page cursor of endpoints paged with pageCursor, e.g. {"data": [...], "next": "..."}"""
+    return page.get("next") or (page.get("paging") or {}).get("next")
+
+
+def cursor_from_cursor(page):
+    """Next page cursor of endpoints returning {"data": [...], "cursor": "..."}"""
+    return page.get("cursor")
+
+
+def _has_next(cursor, pages, count, max_items, max_pages):
+    return bool(cursor) and (max_pages is None or pages < max_pages) and (max_items is None or count < max_items)
+
+
+def iterate_pages(fetch_page, items_key, next_cursor, max_items=None, max_pages=None, prefetch=False):
+    """Lazily yields the items of a cursor paginated endpoint, one page in memory at a time.
+
+    Pages may also be StreamedResponse objects, whose cursor is only known once their items were consumed, so
+    they are never prefetched.
+
+    Args:
+        fetch_page (callable): Gets a cursor (None for the first page) and returns the page response
+        items_key (str): Key of the items list in the page response
+        next_cursor (callable): Gets a page response and returns the next page cursor, or a falsy value on the last page
+        max_items (int, optional): Stop after yielding this many items
+        max_pages (int, optional): Stop after fetching this many pages
+        prefetch (bool, optional): Fetch the next page in a background thread while the current one is consumed
+    """
+    executor = ThreadPoolExecutor(max_workers=1) if prefetch else None
+    try:
+        page = fetch_page(None)
+        pages = 1
+        count = 0
+        while True:
+            pending = None
+            if isinstance(page, StreamedResponse):
+                items = page
+            else:
+                items = page.get(items_key) or []
+                if executor and _has_next(next_cursor(page), pages, count + len(items), max_items, max_pages):
+                    pending = executor.submit(fetch_page, next_cursor(page))
+
+            for item in items:
+                if max_items is not None and count >= max_items:
+                    if isinstance(page, StreamedResponse):
+                        page.close()
+                    return
+                yield item
+                count += 1
+
+            cursor = next_cursor(page)
+            if not _has_next(cursor, pages, count, max_items, max_pages):
+                return
+            page = pending.result() if pending else fetch_page(cursor)
+            pages += 1
+    finally:
+        if executor:
+            executor.shutdown(wait=False)
+
+
+async def aiterate_pages(fetch_page, items_key, next_cursor, max_items=None, max_pages=None, prefetch=False):
+    """Async generator counterpart of iterate_pages, where fetch_page returns an awaitable.
+
+    With prefetch, the next page is requested in a task while the current one is consumed.
+    """
+    import asyncio
+
+    pending = None
+    try:
+        page = await fetch_page(None)
+        pages = 1
+        count = 0
+        while True:
+            streamed = isinstance(page, AsyncStreamedResponse)
+            if not streamed:
+                items = page.get(items_key) or []
+                if prefetch and _has_next(next_cursor(page), pages, count + len(items), max_items, max_pages):
+                    pending = asyncio.ensure_future(fetch_page(next_cursor(page)))
+
+            if streamed:
+                async for item in page:
+                    if max_items is not None and count >= max_items:
+                        await page.close()
+                        return
+                    yield item
+                    count += 1
+            else:
+                for item in items:
+                    if max_items is not None and count >= max_items:
+                        return
+                    yield item
+                    count += 1
+
+            cursor = next_cursor(page)
+            if not _has_next(cursor, pages, count, max_items, max_pages):
+                return
+            page = await pending if pending else await fetch_page(cursor)
+            pending = None
+            pages += 1
+    finally:
+        if pending:
+            pending.cancel()
@@ -0,0 +1,124 @@
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict
+
+
+class TokenBucket:
+    def __init__(self, rate, burst=None):
+        """Token bucket refilled at `rate` tokens per second, holding up to `burst` tokens.
+
+        Tokens are reserved ahead of time: a reservation may take the bucket below zero, and the caller waits
+        until the tokens it took would have been refilled.
+        """
+        self.max_rate = rate
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1.0, rate)
+        self.tokens = self.burst
+        self.updated_at = time.monotonic()
+        self.blocked_until = 0.0
+
+    def reserve(self, now):
+        """Takes one token and returns how many seconds the caller must wait before using it"""
+        self.tokens = min(self.burst, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+        self.tokens -= 1
+        wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        return max(wait, self.blocked_until - now)
+
+    def block(self, now, seconds, adaptive):
+        self.blocked_until = max(self.blocked_until, now + seconds)
+        self.tokens = min(self.tokens, 0)
+        if adaptive:
+            self.rate = max(self.max_rate * 0.1, self.rate * 0.5)
+
+    def recover(self):
+        if self.rate < self.max_rate:
+            self.rate = min(self.max_rate, self.rate + self.max_rate * 0.05)
+
+
+class RateLimiter:
+    def __init__(
+            self,
+            requests_per_second: float = None,
+            burst: float = None,
+            endpoint_limits: Dict[str, float] = None,
+            max_retries_on_429: int = 3,
+            default_retry_after: float = 1.0,
+            adaptive: bool = True,
+    ):
+        """Client-side request scheduler, shared by all the calls of a FireblocksSDK instance.
+
+        Args:
+            requests_per_second (float, optional): Global request rate, unlimited if not set
+            burst (float, optional): Requests allowed in a burst above the global rate, defaults to one second worth
+            endpoint_limits (dict, optional): Request rate per endpoint family, keyed by path prefix,
+                e.g. {"/v1/transactions": 5, "/v1/vault": 20}. The longest matching prefix applies
+            max_retries_on_429 (int, optional): How many times a request rejected with HTTP 429 is resent
+            default_retry_after (float, optional): Seconds to pause after a 429 without a Retry-After header
+            adaptive (bool, optional): Halve the rate of the throttled family on 429, and slowly restore it on success
+        """
+        self.max_retries_on_429 = max_retries_on_429
+        self.default_retry_after = default_retry_after
+        self.adaptive = adaptive
+        self._global = TokenBucket(requests_per_second, burst) if requests_per_second else None
+        self._families = {
+            prefix: TokenBucket(rate)
+            for prefix, rate in sorted((endpoint_limits or {}).items(), key=lambda item: -len(item[0]))
+        }
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self, path):
+        """Reserves a slot for a request to `path`, returns the seconds to wait before sending it"""
+        now = time.monotonic()
+        with self._lock:
+            wait = self._blocked_until - now
+            for bucket in self._buckets(path):
+                wait = max(wait, bucket.reserve(now))
+        return max(wait, 0.0)
+
+    def on_rate_limited(self, path, headers):
+        """Records a 429 response and returns the seconds to wait before retrying"""
+        retry_after = parse_retry_after(headers.get("Retry-After"))
+        if retry_after is None:
+            retry_after = self.default_retry_after
+        now = time.monotonic()
+        with self._lock:
+            buckets = self._buckets(path)
+            if buckets:
+                # throttle the most specific bucket: the endpoint family if it has one, otherwise the global one
+                buckets[-1].block(now, retry_after, self.adaptive)
+            else:
+                self._blocked_until = max(self._blocked_until, now + retry_after)
+        return retry_after
+
+    def on_success(self, path):
+        if not self.adaptive:
+            return
+        with self._lock:
+            for bucket in self._buckets(path):
+                bucket.recover()
+
+    def _buckets(self, path):
+        path = path.split("?", 1)[0]
+        buckets = [self._global] if self._global else []
+        for prefix, bucket in self._families.items():
+            if path.startswith(prefix):
+                buckets.append(bucket)
+                break
+        return buckets
+
+
+def parse_retry_after(value):
+    """Parses a Retry-After header, given either in seconds or as an HTTP date"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
@@ -0,0 +1,59 @@
+import random
+
+from .rate_limiter import parse_retry_after
+
+
+class RetryPolicy:
+    def __init__(
+            self,
+            max_retries: int = 3,
+            backoff_factor: float = 0.5,
+            max_backoff: float = 30.0,
+            jitter: bool = True,
+            retry_statuses=(500, 502, 503, 504),
+            retry_on_connection_errors: bool = True,
+            idempotent_methods=("GET",),
+            auto_idempotency_keys: bool = False,
+    ):
+        """Retries transient failures with exponential backoff.
+
+        Requests using an idempotent method are always safe to resend. Other requests (e.g. create_transaction)
+        are only resent when they carry an Idempotency-Key, so the server never executes them twice.
+
+        Args:
+            max_retries (int, optional): Maximum number of times a request is resent
+            backoff_factor (float, optional): The n-th retry waits up to backoff_factor * 2^n seconds
+            max_backoff (float, optional): Upper bound of a single wait, in seconds
+            jitter (bool, optional): Wait a random duration between 0 and the backoff ("full jitter"),
+                so clients failing together don't retry together
+            retry_statuses (tuple, optional): HTTP statuses that are retried
+            retry_on_connection_errors (bool, optional): Whether to retry the transport's connection errors and timeouts
+            idempotent_methods (tuple, optional): HTTP methods retried without an Idempotency-Key
+            auto_idempotency_keys (bool, optional): Generate an Idempotency-Key for POST requests that have none,
+                making calls such as create_transaction or create_vault_account safe to retry
+        """
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.retry_statuses = frozenset(retry_statuses)
+        self.retry_on_connection_errors = retry_on_connection_errors
+        self.idempotent_methods = frozenset(idempotent_methods)
+        self.auto_idempotency_keys = auto_idempotency_keys
+
+    def is_retryable(self, method, retries, has_idempotency_key, status_code=None, error=None):
+        if retries >= self.max_retries:
+            return False
+        if method not in self.idempotent_methods and not has_idempotency_key:
+            return False
+        if error is not None:
+            return self.retry_on_connection_errors
+        return status_code in self.retry_statuses
+
+    def backoff(self, retries, headers=None):
+        """Seconds to wait before the retry following `retries` previous ones, honoring Retry-After when sent"""
+        retry_after = parse_retry_after(headers.get("Retry-After")) if headers is not None else None
+        if retry_after is not None:
+            return min(retry_after, self.max_backoff)
+        backoff = min(self.max_backoff, self.backoff_factor * (2 ** retries))
+        return random.uniform(0, backoff) if self.jitter else backoff
@@ -1,12 +1,12 @@
-import json
-import platform
+import copy
+import time
 import urllib
-from importlib.metadata import version
+import uuid
+from functools import lru_cache
 from operator import attrgetter
 from typing import Any, Dict, Optional, List
 
-import requests
-
+from .address_index import AddressIndex, update_address_index
 from .api_types import (
     FireblocksApiException,
     TRANSACTION_TYPES,
@@ -48,7 +48,36 @@ from .api_types import (
     # New screening, AML, and travel rule types
     VaspReviewValues,
 )
+from .pagination import iterate_pages, cursor_from_paging_after, cursor_from_next, cursor_from_cursor
+from .cache import ResponseCache
+from .instrumentation import (
+    Instrumentation,
+    PHASE_REQUEST,
+    PHASE_SERIALIZE,
+    PHASE_SIGN,
+    PHASE_SEND,
+    PHASE_RECEIVE,
+    PHASE_PARSE,
+    NO_TRACE,
+    start_trace,
+)
+from .json_codec import JsonCodec, default_json_codec
+from .rate_limiter import RateLimiter
+from .retry import RetryPolicy
 from .sdk_token_provider import SdkTokenProvider
+from .signing import ProcessPoolSigner
+from .token_pool import PresignedTokenPool
+from .streaming import StreamedResponse
+from .transaction_export import split_time_range, export_transactions
+from .vault_provisioning import (
+    AddressSpec,
+    BulkAddressResult,
+    BulkProvisioningResult,
+    VaultAccountSpec,
+    generate_new_addresses,
+    provision_vault_accounts,
+)
+from .transport import Transport, RequestsTransport
 from .tokenization_api_types import \
     CreateTokenRequest, \
     ContractUploadRequest, \
@@ -65,10 +94,32 @@ from .tokenization_api_types import \
     AbiFunction
 
 
-def handle_response(response, page_mode=False):
+_STEP_SEND = "send"
+_STEP_SLEEP = "sleep"
+_STEP_READ = "read"
+
+
+@lru_cache(maxsize=None)
+def _user_agent(anonymous_platform):
+    """Built once per process, reading the package metadata and the platform details is slow"""
+    import platform
+    from importlib.metadata import version
+
+    user_agent = f"fireblocks-sdk-py/{version('fireblocks_sdk')}"
+    if not anonymous_platform:
+        user_agent += (
+            f" ({platform.system()} {platform.release()}; "
+            f"{platform.python_implementation()} {platform.python_version()}; "
+            f"{platform.machine()})"
+        )
+    return user_agent
+
+
+def handle_response(response, page_mode=False, json_codec: JsonCodec = None):
+    content = getattr(response, "content", None) if json_codec else None
     try:
-        response_data = response.json()
-    except:
+        response_data = json_codec.loads(content) if content is not None else response.json()
+    except ValueError:
         response_data = None
     if response.status_code >= 300:
         if type(response_data) is dict:
@@ -101,27 +152,57 @@ class FireblocksSDK:
             timeout=None,
             anonymous_platform=False,
             seconds_jwt_exp=55,
+            transport: Transport = None,
+            rate_limiter: RateLimiter = None,
+            retry_policy: RetryPolicy = None,
+            response_cache: ResponseCache = None,
+            json_codec: JsonCodec = None,
+            token_pool: PresignedTokenPool = None,
+            signing_pool: ProcessPoolSigner = None,
+            instrumentation: List[Instrumentation] = None,
     ):
         """Creates a new Fireblocks API Client.
 
         Args:
-            private_key (str): A string representation of your private key (in PEM format)
+            private_key (str): A string representation of your private key (in PEM format). RSA, EC (P-256, P-384,
+                P-521) and Ed25519 keys sign with RS256, ES256/ES384/ES512 and EdDSA respectively. A CallbackSigner
+                can be given instead, to sign with an external key store
             api_key (str): Your api key. This is a uuid you received from Fireblocks
             api_base_url (str): The fireblocks server URL. Leave empty to use the default server
             timeout (number): Timeout for http requests in seconds
+            transport (Transport, optional): HTTP transport used to send requests. Defaults to a RequestsTransport,
+                pass one with a larger pool_maxsize when sharing the client across many threads
+            rate_limiter (RateLimiter, optional): Throttles outgoing requests and retries the ones rejected with HTTP 429
+            retry_policy (RetryPolicy, optional): Resends requests failing with transient errors when it is safe to
+            response_cache (ResponseCache, optional): Caches reference data such as supported assets and blockchains
+            json_codec (JsonCodec, optional): Encodes request bodies and decodes responses. Defaults to orjson when it
+                is installed, the standard json module otherwise
+            token_pool (PresignedTokenPool, optional): Signs the JWTs of polled GET requests ahead of time
+            signing_pool (ProcessPoolSigner, optional): Signs JWTs on worker processes, to use every core for signing
+            instrumentation (list of Instrumentation, optional): Hooks called around each phase of every request,
+                e.g. a MetricsCollector
         """
         self.private_key = private_key
         self.api_key = api_key
         self.base_url = api_base_url
-        self.token_provider = SdkTokenProvider(private_key, api_key, seconds_jwt_exp)
+        self.token_provider = SdkTokenProvider(private_key, api_key, seconds_jwt_exp, token_pool, signing_pool)
         self.timeout = timeout
-        self.http_session = requests.Session()
-        self.http_session.headers.update(
-            {
-                "X-API-Key": self.api_key,
-                "User-Agent": self._get_user_agent(anonymous_platform),
-            }
-        )
+        self.transport = transport or self._create_transport()
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy
+        self.response_cache = response_cache
+        self.json_codec = json_codec or default_json_codec()
+        self.instrumentation = list(instrumentation or [])
+        self.http_session = getattr(self.transport, "session", None)
+        self.default_headers = {
+            "X-API-Key": self.api_key,
+            "User-Agent": self._get_user_agent(anonymous_platform),
+        }
+
+    def close(self):
+        """Releases the connections held by the transport, and stops the token presigning threads and signing pool"""
+        self.transport.close()
+        self.token_provider.close()
 
     def get_staking_chains(self):
         """Get all staking chains."""
@@ -308,6 +389,21 @@ class FireblocksSDK:
 
         return self._get_request(url, query_params=params)
 
+    def iter_owned_nfts(self, max_items: int = None, max_pages: int = None, prefetch: bool = False, **filters):
+        """Lazily iterates over all owned NFTs matching the filters, across pages
+
+        Args:
+            max_items (int, optional): Stop after yielding this many items
+            max_pages (int, optional): Stop after fetching this many pages
+            prefetch (bool, optional): Fetch the next page while the current one is consumed
+            filters: Keyword arguments of get_owned_nfts, except page_cursor
+        """
+        initial_cursor = filters.pop("page_cursor", "")
+        return self._iterate_pages(
+            lambda cursor: self.get_owned_nfts(page_cursor=cursor or initial_cursor, **filters),
+            "data", cursor_from_next, max_items, max_pages, prefetch,
+        )
+
     def list_owned_collections(self, search: str = None, status: NFTOwnershipStatusValues = None,
                                ncw_id: str = None, wallet_type: NFTsWalletTypeValues = None,
                                sort: List[GetOwnedCollectionsSortValue] = None,
@@ -437,12 +533,14 @@ class FireblocksSDK:
         return self._post_request(f"/v1/assets/prices/${id}", body)
 
     def get_vault_accounts_with_page_info(
-            self, paged_vault_accounts_request_filters: PagedVaultAccountsRequestFilters
+            self, paged_vault_accounts_request_filters: PagedVaultAccountsRequestFilters, stream: bool = False
     ):
         """Gets a page of vault accounts for your tenant according to filters given
 
         Args:
             paged_vault_accounts_request_filters (object, optional): Possible filters to apply for request
+            stream (bool, optional): Return a StreamedResponse yielding the accounts as they are decoded, its
+                "paging" member is available once it has been iterated
         """
 
         url = f"/v1/vault/accounts_paged"
@@ -497,9 +595,35 @@ class FireblocksSDK:
         if params:
             url = url + "?" + urllib.parse.urlencode(params)
 
-        return self._get_request(url)
+        return self._get_request(url, stream=stream, items_key="accounts")
 
-    def get_asset_wallets(self, get_vault_wallets_filters: GetAssetWalletsFilters):
+    def iter_vault_accounts(
+            self,
+            paged_vault_accounts_request_filters: PagedVaultAccountsRequestFilters = None,
+            max_items: int = None,
+            max_pages: int = None,
+            prefetch: bool = False,
+            stream: bool = False,
+    ):
+        """Lazily iterates over all vault accounts matching the filters, following the "after" cursor
+
+        Args:
+            paged_vault_accounts_request_filters (object, optional): Possible filters to apply for request
+            max_items (int, optional): Stop after yielding this many items
+            max_pages (int, optional): Stop after fetching this many pages
+            prefetch (bool, optional): Fetch the next page while the current one is consumed
+            stream (bool, optional): Decode each page as it arrives instead of loading it whole, disables prefetch
+        """
+        filters = copy.copy(paged_vault_accounts_request_filters or PagedVaultAccountsRequestFilters())
+
+        def fetch_page(cursor):
+            if cursor:
+                filters.before, filters.after = None, cursor
+            return self.get_vault_accounts_with_page_info(filters, stream)
+
+        return self._iterate_pages(fetch_page, "accounts", cursor_from_paging_after, max_items, max_pages, prefetch)
+
+    def get_asset_wallets(self, get_vault_wallets_filters: GetAssetWalletsFilters, stream: bool = False):
         """Optional filters to apply for request
 
         Args
@@ -509,6 +633,8 @@ class FireblocksSDK:
             limit (number, optional): Results page size
             before (string, optional): cursor string received from previous request
             after (string, optional): cursor string received from previous request
+            stream (bool, optional): Return a StreamedResponse yielding the asset wallets as they are decoded, its
+                "paging" member is available once it has been iterated
 
         Constraints
             - You should only insert 'before' or 'after' (or none of them), but not both
@@ -547,7 +673,33 @@ class FireblocksSDK:
         if params:
             url = url + "?" + urllib.parse.urlencode(params)
 
-        return self._get_request(url)
+        return self._get_request(url, stream=stream, items_key="assetWallets")
+
+    def iter_asset_wallets(
+            self,
+            get_vault_wallets_filters: GetAssetWalletsFilters = None,
+            max_items: int = None,
+            max_pages: int = None,
+            prefetch: bool = False,
+            stream: bool = False,
+    ):
+        """Lazily iterates over all asset wallets matching the filters, following the "after" cursor
+
+        Args:
+            get_vault_wallets_filters (object, optional): Possible filters to apply for request
+            max_items (int, optional): Stop after yielding this many items
+            max_pages (int, optional): Stop after fetching this many pages
+            prefetch (bool, optional): Fetch the next page while the current one is consumed
+            stream (bool, optional): Decode each page as it arrives instead of loading it whole, disables prefetch
+        """
+        filters = copy.copy(get_vault_wallets_filters or GetAssetWalletsFilters())
+
+        def fetch_page(cursor):
+            if cursor:
+                filters.before, filters.after = None, cursor
+            return self.get_asset_wallets(filters, stream)
+
+        return self._iterate_pages(fetch_page, "assetWallets", cursor_from_paging_after, max_items, max_pages, prefetch)
 
     def get_vault_account(self, vault_account_id):
         """Deprecated - Replaced by get_vault_account_by_id
@@ -635,6 +787,32 @@ class FireblocksSDK:
             idempotency_key,
         )
 
+    def generate_new_addresses(
+            self,
+            specs: List[AddressSpec],
+            max_workers=8,
+            resume_from: BulkAddressResult = None,
+            on_item_done=None,
+            address_index: AddressIndex = None,
+    ):
+        """Generates many deposit addresses concurrently, reporting the outcome of each one.
+
+        Up to max_workers generate_new_address requests are in flight at once, each with an idempotency key derived
+        from the batch id, so resuming a batch never generates an address twice. Failures are recorded in the result.
+
+        Args:
+            specs (list of AddressSpec): The addresses to generate
+            max_workers (int, optional): Maximum number of concurrent requests
+            resume_from (BulkAddressResult, optional): Result of a previous run with the same specs, only the
+                addresses it didn't generate are requested
+            on_item_done (callable, optional): Called with each GeneratedAddress once it succeeded or failed
+            address_index (AddressIndex, optional): Index the generated addresses are added to
+
+        Returns:
+            BulkAddressResult
+        """
+        return self._generate_new_addresses(specs, max_workers, resume_from, on_item_done, address_index)
+
     def set_address_description(
             self, vault_account_id, asset_id, address, tag=None, description=None
     ):
@@ -1007,6 +1185,7 @@ class FireblocksSDK:
             source_id=None,
             dest_type=None,
             dest_id=None,
+            stream=False,
     ):
         """Gets a list of transactions matching the given filters
 
@@ -1029,6 +1208,7 @@ class FireblocksSDK:
                 VAULT_ACCOUNT, EXCHANGE_ACCOUNT, INTERNAL_WALLET, EXTERNAL_WALLET, UNKNOWN_PEER, FIAT_ACCOUNT,
                 NETWORK_CONNECTION, COMPOUND
             dest_id (str, optional): Only gets transactions with given dest_id
+            stream (bool, optional): Return a StreamedResponse yielding the transactions as they are decoded
         """
         return self._get_transactions(
             before,
@@ -1042,8 +1222,52 @@ class FireblocksSDK:
             source_id,
             dest_type,
             dest_id,
+            stream=stream,
         )
 
+    def export_transactions(
+            self,
+            after,
+            before=None,
+            status=None,
+            assets=None,
+            source_type=None,
+            source_id=None,
+            dest_type=None,
+            dest_id=None,
+            shards=8,
+            max_workers=4,
+            page_size=500,
+            max_buffered_pages=4,
+    ):
+        """Streams all transactions created in a time range, oldest first, fetching several sub-ranges concurrently.
+
+        The range is split into shards that are paged through in parallel on a bounded thread pool, while
+        transactions are yielded in createdAt order. Transactions on shard boundaries are deduplicated by id.
+
+        Args:
+            after (int): Only export transactions created after given timestamp (in milliseconds)
+            before (int, optional): Only export transactions created before given timestamp (in milliseconds), defaults to now
+            status, assets, source_type, source_id, dest_type, dest_id (str, optional): Filters, as in get_transactions
+            shards (int, optional): Number of sub-ranges the time range is split into
+            max_workers (int, optional): Maximum number of shards fetched concurrently
+            page_size (int, optional): Transactions per request
+            max_buffered_pages (int, optional): Pages buffered per shard ahead of the consumer, bounding memory usage
+        """
+        if status and status not in TRANSACTION_STATUS_TYPES:
+            raise FireblocksApiException("Got invalid transaction type: " + status)
+
+        boundaries = split_time_range(after, before, shards)
+        filters = {
+            "status": status,
+            "assets": assets,
+            "source_type": source_type,
+            "source_id": source_id,
+            "dest_type": dest_type,
+            "dest_id": dest_id,
+        }
+        return self._export_transactions(boundaries, page_size, max_workers, max_buffered_pages, filters)
+
     def _get_transactions(
             self,
             before,
@@ -1058,6 +1282,8 @@ class FireblocksSDK:
             dest_type,
             dest_id,
             page_mode=False,
+            sort=None,
+            stream=False,
     ):
         path = "/v1/transactions"
         params = {}
@@ -1075,6 +1301,8 @@ class FireblocksSDK:
             params["limit"] = limit
         if order_by:
             params["orderBy"] = order_by
+        if sort:
+            params["sort"] = sort
         if txhash:
             params["txHash"] = txhash
         if assets:
@@ -1090,7 +1318,7 @@ class FireblocksSDK:
         if params:
             path = path + "?" + urllib.parse.urlencode(params)
 
-        return self._get_request(path, page_mode)
+        return self._get_request(path, page_mode, stream=stream)
 
     def get_internal_wallets(self):
         """Gets all internal wallets for your tenant"""
@@ -1323,6 +1551,33 @@ class FireblocksSDK:
 
         return self._post_request("/v1/vault/accounts", body, idempotency_key)
 
+    def provision_vault_accounts(
+            self,
+            specs: List[VaultAccountSpec],
+            max_workers=8,
+            resume_from: BulkProvisioningResult = None,
+            on_item_done=None,
+    ):
+        """Creates many vault accounts and their assets concurrently, reporting the outcome of each one.
+
+        Each account is created with create_vault_account then create_vault_asset per asset. Up to max_workers
+        accounts are provisioned at once, and every request carries an idempotency key derived from the batch id,
+        so resuming a batch never creates an account or asset twice. A failure stops the provisioning of that
+        account only, and is recorded in the result.
+
+        Args:
+            specs (list of VaultAccountSpec): The vault accounts to create
+            max_workers (int, optional): Maximum number of accounts provisioned concurrently
+            resume_from (BulkProvisioningResult, optional): Result of a previous run with the same specs, only the
+                steps it didn't complete are sent
+            on_item_done (callable, optional): Called with each ProvisionedVaultAccount once it succeeded or failed,
+                e.g. to save the progress of long batches
+
+        Returns:
+            BulkProvisioningResult
+        """
+        return self._provision_vault_accounts(specs, max_workers, resume_from, on_item_done)
+
     def hide_vault_account(self, vault_account_id, idempotency_key=None):
         """Hides the vault account from being visible in the web console
 
@@ -1450,6 +1705,21 @@ class FireblocksSDK:
 
         return self._get_request(url)
 
+    def iter_assets(self, max_items: int = None, max_pages: int = None, prefetch: bool = False, **filters):
+        """Lazily iterates over all assets matching the filters, across pages
+
+        Args:
+            max_items (int, optional): Stop after yielding this many items
+            max_pages (int, optional): Stop after fetching this many pages
+            prefetch (bool, optional): Fetch the next page while the current one is consumed
+            filters: Keyword arguments of list_assets, except page_cursor
+        """
+        initial_cursor = filters.pop("page_cursor", None)
+        return self._iterate_pages(
+            lambda cursor: self.list_assets(page_cursor=cursor or initial_cursor, **filters),
+            "data", cursor_from_next, max_items, max_pages, prefetch,
+        )
+
     def get_asset_by_id(self, asset_id: str):
         """
         Get an asset
@@ -1503,6 +1773,21 @@ class FireblocksSDK:
 
         return self._get_request(url)
 
+    def iter_blockchains(self, max_items: int = None, max_pages: int = None, prefetch: bool = False, **filters):
+        """Lazily iterates over all blockchains matching the filters, across pages
+
+        Args:
+            max_items (int, optional): Stop after yielding this many items
+            max_pages (int, optional): Stop after fetching this many pages
+            prefetch (bool, optional): Fetch the next page while the current one is consumed
+            filters: Keyword arguments of list_blockchains, except page_cursor
+        """
+        initial_cursor = filters.pop("page_cursor", None)
+        return self._iterate_pages(
+            lambda cursor: self.list_blockchains(page_cursor=cursor or initial_cursor, **filters),
+            "data", cursor_from_next, max_items, max_pages, prefetch,
+        )
+
     def get_blockchain_by_id(self, blockchain_id: str):
         """
         Get an blockchain
@@ -2292,7 +2577,7 @@ class FireblocksSDK:
         request_data = [tx.to_dict() for tx in rescan_txs]
         return self._post_request(path, request_data)
 
-    def get_paginated_addresses(self, vault_account_id, asset_id, limit=500, before=None, after=None):
+    def get_paginated_addresses(self, vault_account_id, asset_id, limit=500, before=None, after=None, stream=False):
         """Gets a paginated response of the addresses for a given vault account and asset
         Args:
             vault_account_id (str): The vault account Id
@@ -2300,6 +2585,8 @@ class FireblocksSDK:
             limit(number, optional): limit of addresses per paging request
             before (str, optional): curser for the previous paging
             after (str, optional): curser for the next paging
+            stream (bool, optional): Return a StreamedResponse yielding the addresses as they are decoded, its
+                "paging" member is available once it has been iterated
         """
         path = f"/v1/vault/accounts/{vault_account_id}/{asset_id}/addresses_paginated"
         params = {}
@@ -2311,7 +2598,55 @@ class FireblocksSDK:
             params["after"] = after
         if params:
             path = path + "?" + urllib.parse.urlencode(params)
-        return self._get_request(path)
+        return self._get_request(path, stream=stream, items_key="addresses")
+
+    def iter_paginated_addresses(
+            self,
+            vault_account_id,
+            asset_id,
+            limit=500,
+            after=None,
+            max_items: int = None,
+            max_pages: int = None,
+            prefetch: bool = False,
+            stream: bool = False,
+    ):
+        """Lazily iterates over all the addresses of a vault account asset, following the "after" cursor
+
+        Args:
+            vault_account_id (str): The vault account Id
+            asset_id (str): the asset Id
+            limit(number, optional): limit of addresses per paging request
+            after (str, optional): cursor to start from
+            max_items (int, optional): Stop after yielding this many items
+            max_pages (int, optional): Stop after fetching this many pages
+            prefetch (bool, optional): Fetch the next page while the current one is consumed
+            stream (bool, optional): Decode each page as it arrives instead of loading it whole, disables prefetch
+        """
+        def fetch_page(cursor):
+            return self.get_paginated_addresses(vault_account_id, asset_id, limit, after=cursor or after, stream=stream)
+
+        return self._iterate_pages(fetch_page, "addresses", cursor_from_paging_after, max_items, max_pages, prefetch)
+
+    def update_address_index(
+            self, address_index: AddressIndex, vault_account_id, asset_id, page_size=500, full=False
+    ):
+        """Adds the addresses of a vault account asset to an AddressIndex, reading only what the last update didn't
+
+        The index keeps the cursor of the last page read per vault account asset, the next update starts from that
+        page, so that only the addresses generated since are fetched.
+
+        Args:
+            address_index (AddressIndex): The index to update
+            vault_account_id (str): The vault account Id
+            asset_id (str): the asset Id
+            page_size (number, optional): limit of addresses per paging request
+            full (bool, optional): Read all the addresses again, e.g. to pick up changed customer ref ids
+
+        Returns:
+            The number of addresses that weren't indexed yet
+        """
+        return self._update_address_index(address_index, vault_account_id, asset_id, page_size, full)
 
     def set_auto_fuel(self, vault_account_id, auto_fuel, idempotency_key=None):
         """Sets autoFuel to true/false for a vault account
@@ -2573,6 +2908,26 @@ class FireblocksSDK:
 
         return self._get_request(url, query_params=params)
 
+    def iter_audit_logs(
+            self,
+            time_period: TimePeriod = TimePeriod.DAY,
+            max_items: int = None,
+            max_pages: int = None,
+            prefetch: bool = False,
+    ):
+        """Lazily iterates over the audit logs of the last time period, across pages
+
+        Args:
+            time_period (TimePeriod): The last time period to fetch audit logs
+            max_items (int, optional): Stop after yielding this many items
+            max_pages (int, optional): Stop after fetching this many pages
+            prefetch (bool, optional): Fetch the next page while the current one is consumed
+        """
+        return self._iterate_pages(
+            lambda cursor: self.get_paginated_audit_logs(time_period, cursor),
+            "data", cursor_from_cursor, max_items, max_pages, prefetch,
+        )
+
     def get_off_exchange_by_id(self, off_exchange_id):
         """
         Get your connected off exchange by it's ID
@@ -3087,7 +3442,23 @@ class FireblocksSDK:
             request_filter["pageCursor"] = page_cursor
 
         return self._get_request("/v1/tokenization/tokens", query_params=request_filter)
-    
+
+    def iter_linked_tokens(self, status: Optional[TokenLinkStatus] = None, page_size: Optional[int] = None,
+                           max_items: int = None, max_pages: int = None, prefetch: bool = False):
+        """Lazily iterates over all linked tokens, across pages
+
+        Args:
+            status (TokenLinkStatus, optional): Only iterate over tokens with this link status
+            page_size (int, optional): Items per page
+            max_items (int, optional): Stop after yielding this many items
+            max_pages (int, optional): Stop after fetching this many pages
+            prefetch (bool, optional): Fetch the next page while the current one is consumed
+        """
+        return self._iterate_pages(
+            lambda cursor: self.get_linked_tokens(status, page_size, cursor),
+            "data", cursor_from_next, max_items, max_pages, prefetch,
+        )
+
     def get_pending_linked_tokens(self, page_size: Optional[int] = None, page_cursor: Optional[str] = None):
         return self.get_linked_tokens(TokenLinkStatus.PENDING, page_size, page_cursor)
 
@@ -3221,7 +3592,22 @@ class FireblocksSDK:
             request_filter["pageCursor"] = page_cursor
 
         return self._get_request("/v1/tokenization/contracts", query_params=request_filter)
-    
+
+    def iter_contracts_by_filter(self, max_items: int = None, max_pages: int = None, prefetch: bool = False, **filters):
+        """Lazily iterates over all deployed contracts matching the filters, across pages
+
+        Args:
+            max_items (int, optional): Stop after yielding this many items
+            max_pages (int, optional): Stop after fetching this many pages
+            prefetch (bool, optional): Fetch the next page while the current one is consumed
+            filters: Keyword arguments of get_contracts_by_filter, except page_cursor
+        """
+        initial_cursor = filters.pop("page_cursor", None)
+        return self._iterate_pages(
+            lambda cursor: self.get_contracts_by_filter(page_cursor=cursor or initial_cursor, **filters),
+            "data", cursor_from_next, max_items, max_pages, prefetch,
+        )
+
     def get_contract_address(self, base_asset_id: str, tx_hash: str):
         return self._get_request(f"/v1/contract_interactions/base_asset_id/{base_asset_id}/tx_hash/{tx_hash}")
 
@@ -3334,6 +3720,21 @@ class FireblocksSDK:
             
         return self._get_request("/v1/screening/travel_rule/vasp", query_params=params)
 
+    def iter_all_vasps(self, max_items: int = None, max_pages: int = None, prefetch: bool = False, **filters):
+        """Lazily iterates over all VASPs matching the filters, across pages
+
+        Args:
+            max_items (int, optional): Stop after yielding this many items
+            max_pages (int, optional): Stop after fetching this many pages
+            prefetch (bool, optional): Fetch the next page while the current one is consumed
+            filters: Keyword arguments of get_all_vasps, except page_cursor
+        """
+        initial_cursor = filters.pop("page_cursor", None)
+        return self._iterate_pages(
+            lambda cursor: self.get_all_vasps(page_cursor=cursor or initial_cursor, **filters),
+            "data", cursor_from_next, max_items, max_pages, prefetch,
+        )
+
     def get_vasp_by_did(self, did: str, fields: Optional[List[str]] = None):
         params = {}
         if fields:
@@ -3392,77 +3793,219 @@ class FireblocksSDK:
             
         return self._post_request("/v1/screening/travel_rule/transaction/validate/full", payload)
 
-    def _get_request(self, path, page_mode=False, query_params: Dict = None, ncw_wallet_id: str=None):
+    def _get_request(self, path, page_mode=False, query_params: Dict = None, ncw_wallet_id: str=None, stream=False,
+                     items_key=None):
         if query_params:
             path = path + "?" + urllib.parse.urlencode(query_params)
-        token = self.token_provider.sign_jwt(path)
-        headers = {"Authorization": f"Bearer {token}"}
-        if ncw_wallet_id is not None:
-            headers["X-End-User-Wallet-Id"] = ncw_wallet_id
-
-        response = self.http_session.get(
-            self.base_url + path, headers=headers, timeout=self.timeout
+        return self._send_request(
+            "GET", path, page_mode=page_mode, ncw_wallet_id=ncw_wallet_id, stream=stream, items_key=items_key
         )
-        return handle_response(response, page_mode)
 
     def _delete_request(self, path):
-        token = self.token_provider.sign_jwt(path)
-        headers = {"Authorization": f"Bearer {token}"}
-        response = self.http_session.delete(
-            self.base_url + path, headers=headers, timeout=self.timeout
-        )
-        return handle_response(response)
+        return self._send_request("DELETE", path)
 
     def _post_request(self, path, body=None, idempotency_key=None, ncw_wallet_id=None):
-        body = body or {}
+        return self._send_request(
+            "POST", path, body or {}, idempotency_key=idempotency_key, ncw_wallet_id=ncw_wallet_id
+        )
+
+    def _put_request(self, path, body=None, query_params=None):
+        if query_params:
+            path = path + "?" + urllib.parse.urlencode(query_params)
+        return self._send_request("PUT", path, body or {})
+
+    def _patch_request(self, path, body=None):
+        return self._send_request("PATCH", path, body or {})
+
+    def _encode_body(self, body):
+        """Serializes a request body, once per request, its bytes are both hashed into the JWT and sent"""
+        return None if body is None else self.json_codec.dumps(body)
 
-        token = self.token_provider.sign_jwt(path, body)
-        headers = {"Authorization": f"Bearer {token}"}
+    def _build_request(self, path, data=None, idempotency_key=None, ncw_wallet_id=None):
+        """Signs a request and returns the url and headers to send along the encoded body `data`.
+
+        Shared by the sync and async clients so both put the exact same request on the wire.
+        """
+        if data is None:
+            token = self.token_provider.sign_jwt(path)
+        else:
+            token = self.token_provider.sign_jwt(path, data)
+        headers = dict(self.default_headers)
+        headers["Authorization"] = f"Bearer {token}"
         if idempotency_key is not None:
             headers["Idempotency-Key"] = idempotency_key
         if ncw_wallet_id is not None:
             headers["X-End-User-Wallet-Id"] = ncw_wallet_id
+        if data is not None:
+            headers["Content-Type"] = "application/json"
+        return self.base_url + path, headers
 
-        response = self.http_session.post(
-            self.base_url + path, headers=headers, json=body, timeout=self.timeout
-        )
-        return handle_response(response)
+    def _send_request(
+            self, method, path, body=None, page_mode=False, idempotency_key=None, ncw_wallet_id=None, stream=False,
+            items_key=None,
+    ):
+        steps = self._request_steps(method, path, body, page_mode, idempotency_key, ncw_wallet_id, stream, items_key)
+        stream_kwargs = {"stream": True} if stream else {}
+        try:
+            step, argument = next(steps)
+            while True:
+                try:
+                    outcome = None
+                    if step == _STEP_SEND:
+                        url, headers, data = argument
+                        outcome = self.transport.request(
+                            method, url, headers=headers, data=data, timeout=self.timeout, **stream_kwargs
+                        )
+                    elif step == _STEP_SLEEP:
+                        time.sleep(argument)
+                    else:
+                        # requests reads the body of a streamed response on first access
+                        argument.content
+                        argument.close()
+                except BaseException as e:
+                    step, argument = steps.throw(e)
+                else:
+                    step, argument = steps.send(outcome)
+        except StopIteration as done:
+            return done.value
+
+    def _request_steps(self, method, path, body, page_mode, idempotency_key, ncw_wallet_id, stream, items_key):
+        """The decisions of _send_request, shared by the sync and async clients which only carry out the steps.
+
+        Yields (_STEP_SEND, (url, headers, data)), is sent back the response or thrown the error of the transport.
+        Yields (_STEP_SLEEP, seconds), and (_STEP_READ, response) to read the body of a streamed error response and
+        close it, which also releases the connection of streamed responses that are retried.
+        Returns the result of the request.
+        """
+        trace = start_trace(self.instrumentation, method, path)
+        trace.begin(PHASE_REQUEST)
+        try:
+            cacheable = not (page_mode or stream)
+            found, cached = self._get_cached_response(method, path, cacheable)
+            if found:
+                if trace.context:
+                    trace.context.cached = True
+                return cached
+            idempotency_key = self._resolve_idempotency_key(method, idempotency_key)
+            trace.begin(PHASE_SERIALIZE)
+            data = self._encode_body(body)
+            trace.end(PHASE_SERIALIZE)
+            attempts = {"rate_limited": 0, "failed": 0}
+            while True:
+                if self.rate_limiter:
+                    delay = self.rate_limiter.reserve(path)
+                    if delay > 0:
+                        yield _STEP_SLEEP, delay
+                trace.begin(PHASE_SIGN)
+                url, headers = self._build_request(path, data, idempotency_key, ncw_wallet_id)
+                trace.end(PHASE_SIGN)
+                trace.begin(PHASE_SEND)
+                try:
+                    response = yield _STEP_SEND, (url, headers, data)
+                except self.transport.retryable_errors as e:
+                    self._record_response(trace, data)
+                    trace.end(PHASE_SEND)
+                    delay = self._retry_delay(method, path, attempts, idempotency_key, error=e)
+                    if delay is None:
+                        raise
+                    yield _STEP_SLEEP, delay
+                    continue
+                if stream and response.status_code >= 300:
+                    yield _STEP_READ, response
+                self._record_response(trace, data, response, stream and response.status_code < 300)
+                trace.end(PHASE_SEND)
+                delay = self._retry_delay(method, path, attempts, idempotency_key, response=response)
+                if delay is not None:
+                    yield _STEP_SLEEP, delay
+                    continue
+                if self.rate_limiter and response.status_code < 300:
+                    self.rate_limiter.on_success(path)
+                if stream and response.status_code < 300:
+                    # the streamed response ends the request once its body was read
+                    trace.begin(PHASE_RECEIVE)
+                    streamed, trace = self._create_streamed_response(response, items_key, trace), NO_TRACE
+                    return streamed
+                trace.begin(PHASE_PARSE)
+                result = handle_response(response, page_mode, self.json_codec)
+                trace.end(PHASE_PARSE)
+                self._cache_response(method, path, cacheable, result)
+                return result
+        except Exception as e:
+            trace.fail(e)
+            raise
+        finally:
+            trace.end(PHASE_REQUEST)
 
-    def _put_request(self, path, body=None, query_params=None):
-        body = body or {}
-        if query_params:
-            path = path + "?" + urllib.parse.urlencode(query_params)
+    @staticmethod
+    def _record_response(trace, data, response=None, stream=False):
+        """Records an attempt on the request context, `response` is None when the request failed to be sent"""
+        context = trace.context
+        if context is None:
+            return
+        context.attempts += 1
+        context.request_size = len(data) if data is not None else 0
+        if response is not None:
+            context.status_code = response.status_code
+            content = None if stream else getattr(response, "content", None)
+            context.response_size = len(content) if content is not None else None
+
+    def _get_cached_response(self, method, path, cacheable):
+        if self.response_cache is None or not cacheable or method != "GET":
+            return False, None
+        return self.response_cache.get(path, (self.base_url, self.api_key))
+
+    def _cache_response(self, method, path, cacheable, result):
+        if self.response_cache is None or not cacheable:
+            return
+        if method == "GET":
+            self.response_cache.set(path, result, (self.base_url, self.api_key))
+        else:
+            self.response_cache.on_write(path)
+
+    def _resolve_idempotency_key(self, method, idempotency_key):
+        if idempotency_key is None and method == "POST" and self.retry_policy and self.retry_policy.auto_idempotency_keys:
+            return str(uuid.uuid4())
+        return idempotency_key
+
+    def _retry_delay(self, method, path, attempts, idempotency_key, response=None, error=None):
+        """Returns the seconds to wait before resending a request, or None if it must not be resent"""
+        if response is not None and response.status_code == 429 and self.rate_limiter \
+                and attempts["rate_limited"] < self.rate_limiter.max_retries_on_429:
+            attempts["rate_limited"] += 1
+            return self.rate_limiter.on_rate_limited(path, response.headers)
+
+        if self.retry_policy is None:
+            return None
+        status_code = response.status_code if response is not None else None
+        if not self.retry_policy.is_retryable(
+                method, attempts["failed"], idempotency_key is not None, status_code, error
+        ):
+            return None
+        delay = self.retry_policy.backoff(attempts["failed"], response.headers if response is not None else None)
+        attempts["failed"] += 1
+        return delay
 
-        token = self.token_provider.sign_jwt(path, body)
-        headers = {
-            "Authorization": f"Bearer {token}",
-            "Content-Type": "application/json",
-        }
-        response = self.http_session.put(
-            self.base_url + path,
-            headers=headers,
-            data=json.dumps(body),
-            timeout=self.timeout,
-        )
-        return handle_response(response)
+    def _create_transport(self):
+        return RequestsTransport()
 
-    def _patch_request(self, path, body=None):
-        body = body or {}
+    def _create_streamed_response(self, response, items_key, trace):
+        return StreamedResponse(response, items_key, trace=trace)
 
-        token = self.token_provider.sign_jwt(path, body)
-        headers = {"Authorization": f"Bearer {token}"}
-        response = self.http_session.patch(
-            self.base_url + path, headers=headers, json=body, timeout=self.timeout
-        )
-        return handle_response(response)
+    def _iterate_pages(self, fetch_page, items_key, next_cursor, max_items=None, max_pages=None, prefetch=False):
+        return iterate_pages(fetch_page, items_key, next_cursor, max_items, max_pages, prefetch)
+
+    def _export_transactions(self, boundaries, page_size, max_workers, max_buffered_pages, filters):
+        return export_transactions(self, boundaries, page_size, max_workers, max_buffered_pages, filters)
+
+    def _provision_vault_accounts(self, specs, max_workers, resume_from, on_item_done):
+        return provision_vault_accounts(self, specs, max_workers, resume_from, on_item_done)
+
+    def _generate_new_addresses(self, specs, max_workers, resume_from, on_item_done, address_index):
+        return generate_new_addresses(self, specs, max_workers, resume_from, on_item_done, address_index)
+
+    def _update_address_index(self, address_index, vault_account_id, asset_id, page_size, full):
+        return update_address_index(self, address_index, vault_account_id, asset_id, page_size, full)
 
     @staticmethod
     def _get_user_agent(anonymous_platform):
-        user_agent = f"fireblocks-sdk-py/{version('fireblocks_sdk')}"
-        if not anonymous_platform:
-            user_agent += (
-                f" ({platform.system()} {platform.release()}; "
-                f"{platform.python_implementation()} {platform.python_version()}; "
-                f"{platform.machine()})"
-            )
-        return user_agent
+        return _user_agent(anonymous_platform)
@@ -5,14 +5,68 @@ import math
 import secrets
 from hashlib import sha256
 
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519, rsa
+from cryptography.hazmat.primitives.serialization import load_pem_private_key
+
+from .signing import CallbackSigner, ProcessPoolSigner
+from .token_pool import PresignedTokenPool
+
+# requests without a body hash the JSON encoding of an empty string
+_EMPTY_BODY = json.dumps("").encode("utf-8")
+
+_EC_ALGORITHMS = {"secp256r1": "ES256", "secp384r1": "ES384", "secp521r1": "ES512"}
+
 
 class SdkTokenProvider:
-    def __init__(self, private_key, api_key, seconds_jwt_exp):
-        self.private_key = private_key
+    def __init__(
+            self,
+            private_key,
+            api_key,
+            seconds_jwt_exp,
+            token_pool: PresignedTokenPool = None,
+            signing_pool: ProcessPoolSigner = None,
+    ):
+        if isinstance(private_key, CallbackSigner):
+            if signing_pool is not None:
+                raise ValueError("A signing pool can't be used with a CallbackSigner")
+            self.callback_signer = private_key
+            self.private_key = None
+            self.algorithm = private_key.algorithm
+        else:
+            self.callback_signer = None
+            self.private_key = self._load_private_key(private_key)
+            self.algorithm = self._algorithm_for_key(self.private_key)
         self.api_key = api_key
         self.seconds_jwt_exp = seconds_jwt_exp
+        self.signing_pool = signing_pool
+        if signing_pool is not None:
+            signing_pool.start(self.private_key, self.algorithm)
+        self.token_pool = token_pool
+        if token_pool is not None:
+            token_pool.start(self._sign_without_body, seconds_jwt_exp)
 
     def sign_jwt(self, path, body_json=""):
+        """Signs a request JWT.
+
+        `body_json` should be the exact bytes sent as the request body, so the bodyHash claim matches them. A body
+        object is still accepted and hashed after encoding it with json.dumps, the default encoding of older versions.
+        """
+        if self.token_pool is not None and body_json == "":
+            token = self.token_pool.pop(path)
+            if token is not None:
+                return token
+        return self._sign(path, self._encode_body(body_json))
+
+    def close(self):
+        if self.token_pool is not None:
+            self.token_pool.close()
+        if self.signing_pool is not None:
+            self.signing_pool.close()
+
+    def _sign_without_body(self, path):
+        return self._sign(path, _EMPTY_BODY)
+
+    def _sign(self, path, body):
         timestamp = time.time()
         nonce = secrets.randbits(63)
         timestamp_secs = math.floor(timestamp)
@@ -22,9 +76,46 @@ class SdkTokenProvider:
             "uri": path,
             "nonce": nonce,
             "iat": timestamp_secs,
-            "exp": timestamp_secs + self.seconds_jwt_exp, 
+            "exp": timestamp_secs + self.seconds_jwt_exp,
             "sub": self.api_key,
-            "bodyHash": sha256(json.dumps(body_json).encode("utf-8")).hexdigest()
+            "bodyHash": sha256(body).hexdigest()
         }
 
-        return jwt.encode(token, key=self.private_key, algorithm="RS256")
+        if self.callback_signer is not None:
+            return self.callback_signer.encode(token)
+        if self.signing_pool is not None:
+            return self.signing_pool.sign(token)
+        return jwt.encode(token, key=self.private_key, algorithm=self.algorithm)
+
+    @staticmethod
+    def _encode_body(body_json):
+        if isinstance(body_json, (bytes, bytearray)):
+            return body_json
+        return json.dumps(body_json).encode("utf-8")
+
+    @staticmethod
+    def _load_private_key(private_key):
+        """Parses the PEM once so signing doesn't reload the key on every request"""
+        if isinstance(private_key, (rsa.RSAPrivateKey, ec.EllipticCurvePrivateKey, ed25519.Ed25519PrivateKey)):
+            return private_key
+        if isinstance(private_key, str):
+            private_key = private_key.encode("utf-8")
+        try:
+            key = load_pem_private_key(private_key, password=None)
+        except (ValueError, TypeError) as e:
+            raise ValueError(f"Invalid private key, expected an unencrypted PEM encoded private key: {e}") from e
+        if not isinstance(key, (rsa.RSAPrivateKey, ec.EllipticCurvePrivateKey, ed25519.Ed25519PrivateKey)):
+            raise ValueError("Invalid private key, expected an RSA, EC or Ed25519 key")
+        return key
+
+    @staticmethod
+    def _algorithm_for_key(key):
+        """JWS algorithm signing with the key: RS256, ES256/ES384/ES512 by curve, or EdDSA"""
+        if isinstance(key, rsa.RSAPrivateKey):
+            return "RS256"
+        if isinstance(key, ed25519.Ed25519PrivateKey):
+            return "EdDSA"
+        algorithm = _EC_ALGORITHMS.get(key.curve.name)
+        if algorithm is None:
+            raise ValueError(f"Unsupported EC curve {key.curve.name}, expected P-256, P-384 or P-521")
+        return algorithm
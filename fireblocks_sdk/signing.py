@@ -0,0 +1,106 @@
+import hashlib
+import json
+import os
+from concurrent.futures import Executor
+from typing import Callable
+
+import jwt
+from jwt.utils import base64url_encode
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.serialization import load_pem_private_key
+
+# keys loaded by the current worker process, by key id
+_worker_keys = {}
+
+
+def _load_worker_key(key_id, pem):
+    _worker_keys[key_id] = load_pem_private_key(pem, password=None)
+
+
+def _sign_in_worker(key_id, pem, claims, algorithm):
+    key = _worker_keys.get(key_id)
+    if key is None:
+        _load_worker_key(key_id, pem)
+        key = _worker_keys[key_id]
+    return jwt.encode(claims, key=key, algorithm=algorithm)
+
+
+class ProcessPoolSigner:
+    def __init__(self, max_workers: int = None, executor: Executor = None, mp_context=None):
+        """Signs request JWTs on a pool of worker processes, so signing isn't serialized by the GIL.
+
+        The calling thread waits for its token while other threads keep running, which lets a single client
+        shared by many threads use every core for signing. Each worker loads the private key once.
+
+        Args:
+            max_workers (int, optional): Worker processes of the pool, defaults to the number of CPUs
+            executor (Executor, optional): Executor to submit the signatures to instead of a pool owned by the signer,
+                it is not shut down by close(). The key is sent along with each signature and loaded once per worker
+            mp_context (optional): multiprocessing context of the owned pool, defaults to "spawn" as forking a
+                process running threads isn't safe
+        """
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.executor = executor
+        if mp_context is None:
+            import multiprocessing
+
+            mp_context = multiprocessing.get_context("spawn")
+        self.mp_context = mp_context
+        self._owns_executor = executor is None
+        self._key_id = None
+        self._pem = None
+        self._algorithm = None
+
+    def start(self, private_key, algorithm: str):
+        """Binds the signer to a loaded private key, called by SdkTokenProvider"""
+        if self._key_id is not None:
+            raise ValueError("ProcessPoolSigner is already used by another token provider")
+        pem = private_key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        )
+        self._pem = pem
+        self._key_id = hashlib.sha256(pem).hexdigest()
+        self._algorithm = algorithm
+        if self._owns_executor:
+            from concurrent.futures import ProcessPoolExecutor
+
+            self.executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=self.mp_context,
+                initializer=_load_worker_key,
+                initargs=(self._key_id, pem),
+            )
+
+    def sign(self, claims: dict) -> str:
+        # workers of the owned pool loaded the key in their initializer
+        pem = None if self._owns_executor else self._pem
+        return self.executor.submit(_sign_in_worker, self._key_id, pem, claims, self._algorithm).result()
+
+    def close(self):
+        if self._owns_executor and self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+
+
+class CallbackSigner:
+    def __init__(self, algorithm: str, sign: Callable[[bytes], bytes]):
+        """Signs request JWTs with a caller supplied function, e.g. backed by an HSM or a cloud KMS.
+
+        Pass it as the client's private_key. The function gets the JWS signing input (the encoded header and
+        claims) and returns the signature in JWS format: PKCS#1 v1.5 for RS256, raw r||s for ES256 (convert a DER
+        signature with jwt.utils.der_to_raw_signature), raw Ed25519 for EdDSA.
+
+        Args:
+            algorithm (str): JWS algorithm of the key, e.g. "RS256", "ES256" or "EdDSA"
+            sign (callable): Gets the bytes to sign and returns the signature
+        """
+        self.algorithm = algorithm
+        self._sign = sign
+        self._header = base64url_encode(json.dumps({"alg": algorithm, "typ": "JWT"}, separators=(",", ":")).encode())
+
+    def encode(self, claims: dict) -> str:
+        payload = base64url_encode(json.dumps(claims, separators=(",", ":")).encode("utf-8"))
+        signing_input = self._header + b"." + payload
+        return (signing_input + b"." + base64url_encode(self._sign(signing_input))).decode("ascii")
@@ -0,0 +1,210 @@
+import codecs
+import json
+
+from .instrumentation import NO_TRACE, PHASE_RECEIVE, PHASE_REQUEST
+
+_START, _KEY, _COLON, _VALUE, _AFTER_VALUE, _ARRAY_START, _ITEM, _AFTER_ITEM, _ARRAY_END, _DONE = range(10)
+_WHITESPACE = " \t\n\r"
+_NUMBER_CHARS = "0123456789.eE+-"
+_NEED_MORE = object()
+
+
+class JsonArrayStreamParser:
+    def __init__(self, items_key=None):
+        """Incrementally decodes a JSON array, either the whole document or the `items_key` array of a top-level object.
+
+        Text is pushed with feed(), which returns the array items completed so far. The other members of the
+        top-level object are collected in `envelope`.
+        """
+        self.items_key = items_key
+        self.envelope = {}
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+        self._state = _START
+        self._key = None
+
+    def feed(self, text, final=False):
+        self._buffer = self._buffer[self._pos:] + text
+        self._pos = 0
+        items = []
+        while self._state != _DONE and self._step(items, final):
+            pass
+        if final and self._state != _DONE:
+            raise ValueError("Incomplete JSON response")
+        return items
+
+    def _step(self, items, final):
+        char = self._next_char()
+        if char is None:
+            return False
+        state = self._state
+
+        if state == _START:
+            expected = "[" if self.items_key is None else "{"
+            if char != expected:
+                raise ValueError(f"Expected '{expected}' at the start of the JSON response, got '{char}'")
+            self._pos += 1
+            self._state = _ARRAY_START if self.items_key is None else _KEY
+        elif state == _KEY:
+            if char == "}":
+                self._pos += 1
+                self._state = _DONE
+                return True
+            decoded = self._decode(final)
+            if decoded is _NEED_MORE:
+                return False
+            self._key = decoded
+            self._state = _COLON
+        elif state == _COLON:
+            self._expect(char, ":")
+            self._state = _VALUE
+        elif state == _VALUE:
+            if self._key == self.items_key and char == "[":
+                self._pos += 1
+                self._state = _ARRAY_START
+                return True
+            decoded = self._decode(final)
+            if decoded is _NEED_MORE:
+                return False
+            self.envelope[self._key] = decoded
+            self._state = _AFTER_VALUE
+        elif state == _AFTER_VALUE:
+            self._expect(char, ",}")
+            self._state = _KEY if char == "," else _DONE
+        elif state == _ARRAY_START:
+            if char == "]":
+                self._pos += 1
+                self._state = _ARRAY_END
+            else:
+                self._state = _ITEM
+        elif state == _ITEM:
+            decoded = self._decode(final)
+            if decoded is _NEED_MORE:
+                return False
+            items.append(decoded)
+            self._state = _AFTER_ITEM
+        elif state == _AFTER_ITEM:
+            self._expect(char, ",]")
+            self._state = _ITEM if char == "," else _ARRAY_END
+        if self._state == _ARRAY_END:
+            self._state = _DONE if self.items_key is None else _AFTER_VALUE
+        return True
+
+    def _next_char(self):
+        buffer = self._buffer
+        while self._pos < len(buffer) and buffer[self._pos] in _WHITESPACE:
+            self._pos += 1
+        return buffer[self._pos] if self._pos < len(buffer) else None
+
+    def _expect(self, char, expected):
+        if char not in expected:
+            raise ValueError(f"Expected one of '{expected}' in the JSON response, got '{char}'")
+        self._pos += 1
+
+    def _decode(self, final):
+        """Decodes the value at the current position, or returns _NEED_MORE if it isn't complete yet"""
+        try:
+            value, end = self._decoder.raw_decode(self._buffer, self._pos)
+        except json.JSONDecodeError:
+            if final:
+                raise
+            return _NEED_MORE
+        if not final:
+            # a value touching the end of the buffer, or a number cut at "1." or "1e", may continue in the next chunk
+            if end == len(self._buffer):
+                return _NEED_MORE
+            if isinstance(value, (int, float)) and self._buffer[end] in _NUMBER_CHARS:
+                return _NEED_MORE
+        self._pos = end
+        return value
+
+
+class StreamedResponse:
+    def __init__(self, response, items_key=None, chunk_size=64 * 1024, trace=NO_TRACE):
+        """Iterates over the items of a JSON list response, decoding them as the body arrives.
+
+        Only one chunk and one partial item are held in memory. Once iterated, the other members of a paged
+        envelope (e.g. "paging") are available through get(), and the response headers through `headers`.
+
+        Args:
+            response: A response opened in stream mode, exposing iter_content(chunk_size) and close()
+            items_key (str, optional): Key of the items array in the top-level object, None for a top-level array
+            chunk_size (int, optional): Bytes read from the connection at a time
+            trace (optional): Trace of the request, its receive and request phases end once the body was read
+        """
+        self.response = response
+        self.headers = response.headers
+        self.items_key = items_key
+        self.chunk_size = chunk_size
+        self.envelope = {}
+        self._trace = trace
+
+    def __iter__(self):
+        parser = JsonArrayStreamParser(self.items_key)
+        text_decoder = codecs.getincrementaldecoder("utf-8")()
+        size = 0
+        try:
+            for chunk in self.response.iter_content(self.chunk_size):
+                size += len(chunk)
+                yield from parser.feed(text_decoder.decode(chunk))
+            yield from parser.feed(text_decoder.decode(b"", final=True), final=True)
+        except Exception as e:
+            self._trace.fail(e)
+            raise
+        finally:
+            self.envelope = parser.envelope
+            self._trace = _end_trace(self._trace, size)
+            self.close()
+
+    def get(self, key, default=None):
+        return self.envelope.get(key, default)
+
+    def close(self):
+        self._trace = _end_trace(self._trace, None)
+        self.response.close()
+
+
+class AsyncStreamedResponse:
+    def __init__(self, response, items_key=None, trace=NO_TRACE):
+        """Async counterpart of StreamedResponse, over a response exposing aiter_bytes() and aclose()"""
+        self.response = response
+        self.headers = response.headers
+        self.items_key = items_key
+        self.envelope = {}
+        self._trace = trace
+
+    async def __aiter__(self):
+        parser = JsonArrayStreamParser(self.items_key)
+        text_decoder = codecs.getincrementaldecoder("utf-8")()
+        size = 0
+        try:
+            async for chunk in self.response.aiter_bytes():
+                size += len(chunk)
+                for item in parser.feed(text_decoder.decode(chunk)):
+                    yield item
+            for item in parser.feed(text_decoder.decode(b"", final=True), final=True):
+                yield item
+        except Exception as e:
+            self._trace.fail(e)
+            raise
+        finally:
+            self.envelope = parser.envelope
+            self._trace = _end_trace(self._trace, size)
+            await self.close()
+
+    def get(self, key, default=None):
+        return self.envelope.get(key, default)
+
+    async def close(self):
+        self._trace = _end_trace(self._trace, None)
+        await self.response.aclose()
+
+
+def _end_trace(trace, response_size):
+    """Ends the request of a streamed response once its body was read or it was closed, returns NO_TRACE"""
+    if trace.context is not None and response_size is not None:
+        trace.context.response_size = response_size
+    trace.end(PHASE_RECEIVE)
+    trace.end(PHASE_REQUEST)
+    return NO_TRACE
@@ -0,0 +1,152 @@
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, Iterable, Optional
+
+
+class PresignedTokenPool:
+    def __init__(
+            self,
+            paths: Iterable[str] = (),
+            tokens_per_path: int = 2,
+            max_workers: int = 1,
+            min_validity: float = 10,
+    ):
+        """Signs the JWTs of GET requests to registered paths ahead of time, on background threads.
+
+        Meant for polling the same URIs over and over (e.g. /v1/transactions/{id}), the request thread then only
+        pops a ready token instead of computing a signature. Every token carries its own nonce and is handed out
+        once, tokens are dropped once less than `min_validity` seconds remain before they expire. Requests to paths
+        that aren't registered, or finding no ready token, are signed on the spot as usual.
+
+        Paths are matched exactly, including the query string, e.g. "/v1/vault/accounts/0/BTC".
+
+        Args:
+            paths (iterable of str, optional): Paths to presign tokens for, more can be added with register()
+            tokens_per_path (int, optional): Ready tokens kept per path
+            max_workers (int, optional): Background signing threads
+            min_validity (float, optional): Seconds a token must remain valid for to be handed out, must be lower
+                than the client's seconds_jwt_exp
+        """
+        self.tokens_per_path = tokens_per_path
+        self.max_workers = max_workers
+        self.min_validity = min_validity
+        self._tokens: Dict[str, deque] = {}
+        self._in_flight: Dict[str, int] = {}
+        self._hits = 0
+        self._misses = 0
+        self._sign: Optional[Callable[[str], str]] = None
+        self._lifetime = None
+        self._closed = False
+        self._condition = threading.Condition()
+        self._workers = []
+        for path in paths:
+            self.register(path)
+
+    def start(self, sign: Callable[[str], str], lifetime: float):
+        """Starts the signing threads, called by SdkTokenProvider with its signing function and token lifetime"""
+        if lifetime - 1 <= self.min_validity:
+            raise ValueError("min_validity must be lower than the token lifetime (seconds_jwt_exp)")
+        with self._condition:
+            if self._sign is not None:
+                raise ValueError("PresignedTokenPool is already used by another token provider")
+            self._sign = sign
+            self._lifetime = lifetime
+        for i in range(self.max_workers):
+            worker = threading.Thread(target=self._run, name=f"fireblocks-jwt-presigner-{i}", daemon=True)
+            worker.start()
+            self._workers.append(worker)
+
+    def close(self):
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        for worker in self._workers:
+            worker.join()
+        self._workers = []
+
+    def register(self, path: str):
+        with self._condition:
+            if path not in self._tokens:
+                self._tokens[path] = deque()
+                self._in_flight[path] = 0
+                self._condition.notify_all()
+
+    def unregister(self, path: str):
+        with self._condition:
+            self._tokens.pop(path, None)
+            self._in_flight.pop(path, None)
+
+    def pop(self, path: str) -> Optional[str]:
+        """Returns a ready token for `path`, or None if the path isn't registered or no token is ready"""
+        with self._condition:
+            tokens = self._tokens.get(path)
+            if tokens is None:
+                return None
+            self._drop_expired(tokens, time.monotonic())
+            if not tokens:
+                self._misses += 1
+                self._condition.notify()
+                return None
+            self._hits += 1
+            self._condition.notify()
+            return tokens.popleft()[1]
+
+    def stats(self):
+        """Tokens handed out from the pool (hits), requests to registered paths signed on the spot (misses)"""
+        with self._condition:
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "ready": sum(len(tokens) for tokens in self._tokens.values()),
+            }
+
+    def _run(self):
+        while True:
+            with self._condition:
+                path = self._next_path()
+                while path is None:
+                    if self._closed:
+                        return
+                    self._condition.wait(self._next_expiry_in())
+                    path = self._next_path()
+                self._in_flight[path] += 1
+            # the validity window starts before signing and the exp claim is rounded down to the second,
+            # so it never outlasts the token
+            usable_until = time.monotonic() + self._lifetime - 1 - self.min_validity
+            try:
+                token = self._sign(path)
+            except Exception:
+                token = None
+            with self._condition:
+                if self._in_flight.get(path, 0) > 0:
+                    self._in_flight[path] -= 1
+                    if token is not None:
+                        self._tokens[path].append((usable_until, token))
+                if token is None:
+                    # don't spin on a failing signer, requests fall back to signing on the spot
+                    self._condition.wait(1)
+
+    def _next_path(self):
+        """The registered path furthest below tokens_per_path, counting the tokens being signed"""
+        if self._closed:
+            return None
+        now = time.monotonic()
+        best, best_count = None, self.tokens_per_path
+        for path, tokens in self._tokens.items():
+            self._drop_expired(tokens, now)
+            count = len(tokens) + self._in_flight[path]
+            if count < best_count:
+                best, best_count = path, count
+        return best
+
+    def _next_expiry_in(self):
+        expiries = [tokens[0][0] for tokens in self._tokens.values() if tokens]
+        if not expiries:
+            return None
+        return max(0.0, min(expiries) - time.monotonic())
+
+    @staticmethod
+    def _drop_expired(tokens, now):
+        while tokens and tokens[0][0] <= now:
+            tokens.popleft()
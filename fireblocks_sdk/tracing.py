@@ -0,0 +1,159 @@
+import functools
+import inspect
+
+from .instrumentation import Instrumentation, PHASE_REQUEST, RequestContext
+
+try:
+    from opentelemetry import trace
+except ImportError:
+    trace = None
+
+_TRACER_NAME = "fireblocks_sdk"
+
+
+class TracingInstrumentation(Instrumentation):
+    def __init__(self, tracer=None):
+        """Records a client span per HTTP request, child of the span current when the request is sent.
+
+        Spans carry the endpoint template, HTTP status, retry count, payload sizes and the time spent serializing,
+        signing, sending, receiving streamed bodies and parsing. Spans of streamed responses end once they were
+        iterated. Requires opentelemetry-api, does nothing without it.
+
+        Args:
+            tracer (opentelemetry.trace.Tracer, optional): Defaults to the tracer of the global tracer provider
+        """
+        self.tracer = tracer or (trace.get_tracer(_TRACER_NAME) if trace else None)
+
+    def before(self, phase: str, context: RequestContext):
+        if phase == PHASE_REQUEST and self.tracer is not None:
+            context.attributes["span"] = self.tracer.start_span(
+                f"{context.method} {context.endpoint}",
+                kind=trace.SpanKind.CLIENT,
+                attributes={"http.request.method": context.method, "http.route": context.endpoint},
+            )
+
+    def after(self, phase: str, context: RequestContext):
+        span = context.attributes.get("span") if phase == PHASE_REQUEST else None
+        if span is None:
+            return
+        span.set_attribute("fireblocks.retry_count", max(0, context.attempts - 1))
+        span.set_attribute("fireblocks.cached", context.cached)
+        span.set_attribute("http.request.body.size", context.request_size)
+        if context.status_code is not None:
+            span.set_attribute("http.response.status_code", context.status_code)
+        if context.response_size is not None:
+            span.set_attribute("http.response.body.size", context.response_size)
+        for name, seconds in context.timings.items():
+            if name != PHASE_REQUEST:
+                span.set_attribute(f"fireblocks.{name}_ms", seconds * 1000)
+        if context.error is not None:
+            span.record_exception(context.error)
+            span.set_status(trace.Status(trace.StatusCode.ERROR, str(context.error)))
+        span.end()
+
+
+def instrument_tracing(client, tracer=None):
+    """Wraps every public method of a client in an OpenTelemetry span, and records a child span per HTTP request.
+
+    Works with FireblocksSDK, AsyncFireblocksSDK, FireblocksNCW and AsyncFireblocksNCW instances. Spans of
+    coroutine methods cover the awaited call, spans of the iter_* methods cover the whole iteration. Only the given
+    instance is affected, other clients and the classes are left untouched.
+
+    Does nothing when opentelemetry-api isn't installed.
+
+    Args:
+        client: The client to instrument
+        tracer (opentelemetry.trace.Tracer, optional): Defaults to the tracer of the global tracer provider
+
+    Returns:
+        The client
+    """
+    if trace is None:
+        return client
+    tracer = tracer or trace.get_tracer(_TRACER_NAME)
+    sdk = getattr(client, "sdk", client)
+    if not any(isinstance(hook, TracingInstrumentation) for hook in sdk.instrumentation):
+        sdk.instrumentation.append(TracingInstrumentation(tracer))
+
+    class_name = type(client).__name__
+    for name, member in inspect.getmembers(type(client), inspect.isfunction):
+        if not name.startswith("_"):
+            setattr(client, name, _traced(tracer, f"{class_name}.{name}", getattr(client, name)))
+    return client
+
+
+def _traced(tracer, span_name, method):
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        span = tracer.start_span(span_name)
+        try:
+            with trace.use_span(span, end_on_exit=False, record_exception=False, set_status_on_exception=False):
+                result = method(*args, **kwargs)
+        except BaseException as e:
+            _end(span, e)
+            raise
+        if inspect.isawaitable(result):
+            return _traced_awaitable(span, result)
+        if inspect.isgenerator(result):
+            return _traced_generator(span, result)
+        if inspect.isasyncgen(result):
+            return _traced_async_generator(span, result)
+        _end(span)
+        return result
+
+    return wrapper
+
+
+async def _traced_awaitable(span, awaitable):
+    try:
+        with trace.use_span(span, end_on_exit=False, record_exception=False, set_status_on_exception=False):
+            result = await awaitable
+    except BaseException as e:
+        _end(span, e)
+        raise
+    _end(span)
+    return result
+
+
+def _traced_generator(span, generator):
+    # the span is only current while the generator runs, not while the caller consumes the items
+    error = None
+    try:
+        while True:
+            with trace.use_span(span, end_on_exit=False, record_exception=False, set_status_on_exception=False):
+                try:
+                    item = next(generator)
+                except StopIteration:
+                    return
+            yield item
+    except BaseException as e:
+        error = e
+        raise
+    finally:
+        generator.close()
+        _end(span, error)
+
+
+async def _traced_async_generator(span, generator):
+    error = None
+    try:
+        while True:
+            with trace.use_span(span, end_on_exit=False, record_exception=False, set_status_on_exception=False):
+                try:
+                    item = await generator.__anext__()
+                except StopAsyncIteration:
+                    return
+            yield item
+    except BaseException as e:
+        error = e
+        raise
+    finally:
+        await generator.aclose()
+        _end(span, error)
+
+
+def _end(span, error=None):
+    if error is not None and not isinstance(error, GeneratorExit):
+        span.record_exception(error)
+        span.set_status(trace.Status(trace.StatusCode.ERROR, str(error)))
+    span.end()
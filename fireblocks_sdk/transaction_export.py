@@ -0,0 +1,158 @@
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+_SHARD_DONE = object()
+
+
+class _ShardFailed:
+    def __init__(self, error):
+        self.error = error
+
+
+def split_time_range(after, before, shards):
+    """Splits [after, before] (milliseconds) into at most `shards` contiguous ranges, returns their boundaries"""
+    if before is None:
+        before = int(time.time() * 1000)
+    if before <= after:
+        raise ValueError("'before' must be later than 'after'")
+    shards = max(1, min(shards, before - after))
+    boundaries = [after + (before - after) * i // shards for i in range(shards)]
+    boundaries.append(before)
+    return boundaries
+
+
+class _ShardMerger:
+    """Keeps each transaction in the single shard its createdAt falls in, and drops ids repeated across pages.
+
+    Shards are requested with a 1ms overlap so boundary transactions are never missed whatever the API's
+    inclusivity, then assigned to [lower, upper) here (the last shard includes its upper bound).
+    """
+
+    def __init__(self, boundaries):
+        self.boundaries = boundaries
+        self.last_created_at = None
+        self.last_ids = set()
+
+    def accept(self, shard, transaction):
+        created_at = transaction.get("createdAt")
+        if created_at is not None:
+            lower, upper = self.boundaries[shard], self.boundaries[shard + 1]
+            is_last_shard = shard == len(self.boundaries) - 2
+            if created_at < lower or created_at > upper or (created_at == upper and not is_last_shard):
+                return False
+
+        # results are ordered by createdAt, so a duplicate can only share the latest createdAt seen
+        tx_id = transaction.get("id")
+        if created_at == self.last_created_at:
+            if tx_id in self.last_ids:
+                return False
+            self.last_ids.add(tx_id)
+        else:
+            self.last_created_at = created_at
+            self.last_ids = {tx_id}
+        return True
+
+
+def _first_page(sdk, boundaries, shard, page_size, filters):
+    return sdk._get_transactions(
+        before=boundaries[shard + 1] + 1,
+        after=max(boundaries[shard] - 1, 0),
+        limit=page_size,
+        order_by="createdAt",
+        sort="ASC",
+        page_mode=True,
+        txhash=None,
+        **filters,
+    )
+
+
+def export_transactions(sdk, boundaries, page_size, max_workers, max_buffered_pages, filters):
+    """Sync generator behind FireblocksSDK.export_transactions, shards are fetched on a thread pool"""
+    shards = len(boundaries) - 1
+    queues = [queue.Queue(max_buffered_pages) for _ in range(shards)]
+    stop = threading.Event()
+
+    def put(shard_queue, item):
+        while not stop.is_set():
+            try:
+                shard_queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def fetch_shard(shard):
+        try:
+            page = _first_page(sdk, boundaries, shard, page_size, filters)
+            while True:
+                if not put(queues[shard], page["transactions"]):
+                    return
+                next_page = page["pageDetails"]["nextPage"]
+                if not next_page:
+                    break
+                page = sdk.get_transactions_with_page_info(next_or_previous_path=next_page)
+            put(queues[shard], _SHARD_DONE)
+        except Exception as e:
+            put(queues[shard], _ShardFailed(e))
+
+    # shards are submitted in order, so the one being consumed always has a worker
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    for shard in range(shards):
+        executor.submit(fetch_shard, shard)
+    try:
+        merger = _ShardMerger(boundaries)
+        for shard in range(shards):
+            while True:
+                transactions = queues[shard].get()
+                if transactions is _SHARD_DONE:
+                    break
+                if isinstance(transactions, _ShardFailed):
+                    raise transactions.error
+                for transaction in transactions:
+                    if merger.accept(shard, transaction):
+                        yield transaction
+    finally:
+        stop.set()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+async def aexport_transactions(sdk, boundaries, page_size, max_workers, max_buffered_pages, filters):
+    """Async generator behind AsyncFireblocksSDK.export_transactions, shards are fetched by concurrent tasks"""
+    import asyncio
+
+    shards = len(boundaries) - 1
+    queues = [asyncio.Queue(max_buffered_pages) for _ in range(shards)]
+    semaphore = asyncio.Semaphore(max_workers)
+
+    async def fetch_shard(shard):
+        async with semaphore:
+            try:
+                page = await _first_page(sdk, boundaries, shard, page_size, filters)
+                while True:
+                    await queues[shard].put(page["transactions"])
+                    next_page = page["pageDetails"]["nextPage"]
+                    if not next_page:
+                        break
+                    page = await sdk.get_transactions_with_page_info(next_or_previous_path=next_page)
+                await queues[shard].put(_SHARD_DONE)
+            except Exception as e:
+                await queues[shard].put(_ShardFailed(e))
+
+    tasks = [asyncio.ensure_future(fetch_shard(shard)) for shard in range(shards)]
+    try:
+        merger = _ShardMerger(boundaries)
+        for shard in range(shards):
+            while True:
+                transactions = await queues[shard].get()
+                if transactions is _SHARD_DONE:
+                    break
+                if isinstance(transactions, _ShardFailed):
+                    raise transactions.error
+                for transaction in transactions:
+                    if merger.accept(shard, transaction):
+                        yield transaction
+    finally:
+        for task in tasks:
+            task.cancel()
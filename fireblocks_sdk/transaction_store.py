@@ -0,0 +1,206 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from .api_types import TRANSACTION_FINAL_STATUS_TYPES
+from .transaction_watcher import fetch_updated_since
+from .webhooks import WebhookReceiver
+
+# webhook events carrying the transaction details as their data
+TRANSACTION_WEBHOOK_EVENTS = ("TRANSACTION_CREATED", "TRANSACTION_STATUS_UPDATED")
+
+# reconciliations overlap the previous one by this much, server and local clocks aren't in sync
+_CLOCK_SKEW_MS = 5000
+
+
+class _StoredTransaction:
+    __slots__ = ("transaction", "confirmed_at")
+
+    def __init__(self, transaction, confirmed_at):
+        self.transaction = transaction
+        self.confirmed_at = confirmed_at
+
+
+class TransactionStore:
+    def __init__(
+            self,
+            sdk,
+            max_staleness: float = 30,
+            reconcile_interval: float = 15,
+            max_reconcile_pages: int = 10,
+            max_transactions: int = 100000,
+    ):
+        """Local copy of the current state of transactions, fed by webhooks, answering reads without API calls.
+
+        Transactions are updated from TRANSACTION_CREATED and TRANSACTION_STATUS_UPDATED webhooks (see attach()),
+        from the reads that miss and from periodic reconciliations listing the transactions updated since the
+        previous one (get_transactions ordered by lastUpdated). An update only replaces the stored transaction when
+        its lastUpdated isn't older, so late or replayed webhooks never roll a transaction back.
+
+        A stored transaction is fresh when it was read from the API, a webhook or a reconciliation less than
+        max_staleness seconds ago. Transactions in a final status are always fresh.
+        Reads of missing or stale transactions fall back to the API.
+
+        Reconciliations run on a background thread with start()/stop() (or as a context manager), or when
+        reconcile() is called.
+
+        Args:
+            sdk (FireblocksSDK): The client used for the lookups
+            max_staleness (float, optional): Seconds a stored transaction is served without being confirmed
+            reconcile_interval (float, optional): Seconds between reconciliations, keep it under max_staleness
+            max_reconcile_pages (int, optional): Pages a reconciliation may read, the rest is read by the next one
+            max_transactions (int, optional): Transactions kept, the least recently updated are dropped first
+        """
+        self.sdk = sdk
+        self.max_staleness = max_staleness
+        self.reconcile_interval = reconcile_interval
+        self.max_reconcile_pages = max_reconcile_pages
+        self.max_transactions = max_transactions
+        self._transactions: "OrderedDict[str, _StoredTransaction]" = OrderedDict()
+        self._external_ids: Dict[str, str] = {}
+        self._updated_since_ms = int(time.time() * 1000) - _CLOCK_SKEW_MS
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.stats = {"hits": 0, "misses": 0, "stale": 0, "applied": 0, "outdated": 0}
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def __len__(self):
+        return len(self._transactions)
+
+    def attach(self, receiver: WebhookReceiver):
+        """Feeds the store with the transaction webhooks received by a WebhookReceiver"""
+        for event_type in TRANSACTION_WEBHOOK_EVENTS:
+            receiver.on(event_type, self.on_webhook_events)
+        return self
+
+    def on_webhook_events(self, events):
+        """WebhookReceiver handler applying the transactions carried by webhook events"""
+        for event in events:
+            if event.get("type") in TRANSACTION_WEBHOOK_EVENTS and isinstance(event.get("data"), dict):
+                self.apply(event["data"])
+
+    def apply(self, transaction: dict) -> bool:
+        """Stores a transaction unless the stored one was updated later, returns whether it was stored"""
+        tx_id = transaction.get("id")
+        if tx_id is None:
+            return False
+        now = time.monotonic()
+        with self._lock:
+            stored = self._transactions.get(tx_id)
+            if stored is not None and _last_updated(transaction) < _last_updated(stored.transaction):
+                self.stats["outdated"] += 1
+                return False
+            self._transactions[tx_id] = _StoredTransaction(transaction, now)
+            self._transactions.move_to_end(tx_id)
+            external_id = transaction.get("externalTxId")
+            if external_id:
+                self._external_ids[external_id] = tx_id
+            while len(self._transactions) > self.max_transactions:
+                _, evicted = self._transactions.popitem(last=False)
+                self._external_ids.pop(evicted.transaction.get("externalTxId"), None)
+            self.stats["applied"] += 1
+            return True
+
+    def get(self, tx_id: str, max_staleness: float = None) -> dict:
+        """Returns the current state of a transaction, from the store when fresh, from the API otherwise
+
+        Args:
+            tx_id (str): The transaction id
+            max_staleness (float, optional): Overrides the max_staleness of the store for this read
+        """
+        transaction = self._fresh(self._transactions.get(tx_id), max_staleness)
+        if transaction is not None:
+            return transaction
+        return self._fetched(self.sdk.get_transaction_by_id(tx_id))
+
+    def get_by_external_id(self, external_tx_id: str, max_staleness: float = None) -> dict:
+        """Returns the current state of a transaction by its external id, like get()"""
+        tx_id = self._external_ids.get(external_tx_id)
+        stored = self._transactions.get(tx_id) if tx_id is not None else None
+        transaction = self._fresh(stored, max_staleness)
+        if transaction is not None:
+            return transaction
+        return self._fetched(self.sdk.get_transaction_by_external_id(external_tx_id))
+
+    def peek(self, tx_id: str) -> Optional[dict]:
+        """Returns the stored transaction however stale it is, None when it isn't stored, never calls the API"""
+        stored = self._transactions.get(tx_id)
+        return stored.transaction if stored is not None else None
+
+    def reconcile(self):
+        """Applies the transactions updated since the previous reconciliation, returns how many were stored"""
+        started_at_ms = int(time.time() * 1000)
+        updates, complete = fetch_updated_since(self.sdk, self._updated_since_ms, self.max_reconcile_pages)
+        applied = 0
+        for transaction in updates.values():
+            if self.apply(transaction):
+                applied += 1
+            else:
+                # a webhook stored a later update, the reconciliation confirms it is still current
+                self._confirm(transaction["id"])
+        if complete:
+            self._updated_since_ms = started_at_ms - _CLOCK_SKEW_MS
+        # otherwise the next reconciliation reads the updates since the same time again, most recent first
+        return applied
+
+    def start(self):
+        if self._thread is None:
+            self._stopped.clear()
+            self._thread = threading.Thread(target=self._run, name="fireblocks-transaction-store", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _fetched(self, transaction):
+        """Stores a transaction read from the API, returns the latest state, a webhook may have been applied since"""
+        if self.apply(transaction):
+            return transaction
+        return self.peek(transaction["id"]) or transaction
+
+    def _fresh(self, stored, max_staleness):
+        """The stored transaction if it can be served, None otherwise"""
+        if stored is None:
+            self._count("misses")
+            return None
+        transaction = stored.transaction
+        if transaction.get("status") not in TRANSACTION_FINAL_STATUS_TYPES:
+            max_staleness = self.max_staleness if max_staleness is None else max_staleness
+            if time.monotonic() - stored.confirmed_at > max_staleness:
+                self._count("stale")
+                return None
+        self._count("hits")
+        return transaction
+
+    def _confirm(self, tx_id):
+        with self._lock:
+            stored = self._transactions.get(tx_id)
+            if stored is not None:
+                stored.confirmed_at = time.monotonic()
+
+    def _count(self, name):
+        with self._lock:
+            self.stats[name] += 1
+
+    def _run(self):
+        while not self._stopped.is_set():
+            try:
+                self.reconcile()
+            except Exception:
+                pass
+            self._stopped.wait(self.reconcile_interval)
+
+
+def _last_updated(transaction):
+    return transaction.get("lastUpdated") or 0
@@ -0,0 +1,268 @@
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, Dict, Optional
+
+from .api_types import (
+    TRANSACTION_FINAL_STATUS_TYPES,
+    TRANSACTION_STATUS_SUBMITTED,
+    TRANSACTION_STATUS_QUEUED,
+    TRANSACTION_STATUS_PENDING_SIGNATURE,
+    TRANSACTION_STATUS_PENDING_AUTHORIZATION,
+    TRANSACTION_STATUS_PENDING_3RD_PARTY_MANUAL_APPROVAL,
+    TRANSACTION_STATUS_PENDING_3RD_PARTY,
+    TRANSACTION_STATUS_PENDING_AML_SCREENING,
+    TRANSACTION_STATUS_BROADCASTING,
+    TRANSACTION_STATUS_CONFIRMING,
+    TRANSACTION_STATUS_CANCELLING,
+)
+
+DEFAULT_POLL_INTERVALS = {
+    TRANSACTION_STATUS_SUBMITTED: 2,
+    TRANSACTION_STATUS_QUEUED: 5,
+    TRANSACTION_STATUS_PENDING_SIGNATURE: 10,
+    TRANSACTION_STATUS_PENDING_AUTHORIZATION: 30,
+    TRANSACTION_STATUS_PENDING_3RD_PARTY_MANUAL_APPROVAL: 30,
+    TRANSACTION_STATUS_PENDING_3RD_PARTY: 10,
+    TRANSACTION_STATUS_PENDING_AML_SCREENING: 10,
+    TRANSACTION_STATUS_BROADCASTING: 2,
+    TRANSACTION_STATUS_CONFIRMING: 5,
+    TRANSACTION_STATUS_CANCELLING: 2,
+}
+
+# batched lookups overlap the previous one by this much, server and local clocks aren't in sync
+_CLOCK_SKEW_MS = 5000
+
+
+def fetch_updated_since(sdk, since_ms, max_pages):
+    """Reads the transactions updated since a time.
+
+    The before/after filters of get_transactions apply to createdAt, so none is passed: the transactions are listed
+    by lastUpdated, most recent first, until one updated before since_ms.
+
+    Returns:
+        The transactions by id, and whether all of them were read within max_pages
+    """
+    updates = {}
+    page = sdk._get_transactions(
+        before=None,
+        after=None,
+        status=None,
+        limit=500,
+        order_by="lastUpdated",
+        txhash=None,
+        assets=None,
+        source_type=None,
+        source_id=None,
+        dest_type=None,
+        dest_id=None,
+        page_mode=True,
+        sort="DESC",
+    )
+    pages = 1
+    while True:
+        for transaction in page["transactions"]:
+            if (transaction.get("lastUpdated") or 0) < since_ms:
+                return updates, True
+            updates[transaction["id"]] = transaction
+        next_page = page["pageDetails"]["nextPage"]
+        if not next_page:
+            return updates, True
+        if pages >= max_pages:
+            return updates, False
+        page = sdk.get_transactions_with_page_info(next_or_previous_path=next_page)
+        pages += 1
+
+
+class _WatchedTransaction:
+    def __init__(self, tx_id, on_status_change):
+        self.tx_id = tx_id
+        self.future = Future()
+        self.on_status_change = on_status_change
+        self.status = None
+        self.next_poll_at = 0.0
+        self.needs_lookup = True
+        self.errors = 0
+
+
+class TransactionWatcher:
+    def __init__(
+            self,
+            sdk,
+            poll_intervals: Dict[str, float] = None,
+            default_interval: float = 5,
+            batch_threshold: int = 5,
+            max_batch_pages: int = 5,
+            max_errors: int = 3,
+            on_status_change: Callable[[dict], None] = None,
+    ):
+        """Waits for many transactions to reach a final status, with as few API calls as possible.
+
+        Each transaction is polled at an interval depending on its current status. When at least `batch_threshold`
+        transactions are due, a single get_transactions query (ordered by lastUpdated, most recent first) fetching every
+        transaction updated since the previous query replaces the per-transaction lookups.
+
+        Drive it either with start()/stop() (or as a context manager), which polls on a background thread,
+        or by calling poll() from your own loop.
+
+        Args:
+            sdk (FireblocksSDK): The client used for the lookups
+            poll_intervals (dict, optional): Seconds between polls by transaction status, merged over DEFAULT_POLL_INTERVALS
+            default_interval (float, optional): Seconds between polls for statuses missing from poll_intervals
+            batch_threshold (int, optional): Minimum number of due transactions for a batched lookup
+            max_batch_pages (int, optional): Pages a batched lookup may read before falling back to single lookups
+            max_errors (int, optional): Consecutive failed lookups of a transaction before its future fails
+            on_status_change (callable, optional): Called with the transaction whenever a watched status changes
+        """
+        self.sdk = sdk
+        self.poll_intervals = dict(DEFAULT_POLL_INTERVALS, **(poll_intervals or {}))
+        self.default_interval = default_interval
+        self.batch_threshold = batch_threshold
+        self.max_batch_pages = max_batch_pages
+        self.max_errors = max_errors
+        self.on_status_change = on_status_change
+        self._watched: Dict[str, _WatchedTransaction] = {}
+        self._updated_since_ms = None
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def watch(self, tx_id: str, on_status_change: Callable[[dict], None] = None) -> Future:
+        """Starts watching a transaction.
+
+        Returns:
+            Future: Resolved with the transaction once it reaches one of TRANSACTION_FINAL_STATUS_TYPES
+        """
+        with self._lock:
+            watched = self._watched.get(tx_id)
+            if watched is None:
+                watched = self._watched[tx_id] = _WatchedTransaction(tx_id, on_status_change)
+                if self._updated_since_ms is None:
+                    self._updated_since_ms = self._now_ms()
+        self._wakeup.set()
+        return watched.future
+
+    def unwatch(self, tx_id: str):
+        with self._lock:
+            watched = self._watched.pop(tx_id, None)
+        if watched:
+            watched.future.cancel()
+
+    def start(self):
+        if self._thread is None:
+            self._stopped.clear()
+            self._thread = threading.Thread(target=self._run, name="fireblocks-transaction-watcher", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def poll(self):
+        """Polls the transactions that are due, returns the seconds until the next one is"""
+        now = time.monotonic()
+        started_at_ms = self._now_ms()
+        with self._lock:
+            # futures cancelled by their caller stop being watched
+            for tx_id in [tx_id for tx_id, watched in self._watched.items() if watched.future.cancelled()]:
+                del self._watched[tx_id]
+            due = [watched for watched in self._watched.values() if watched.next_poll_at <= now]
+            watched_count = len(self._watched)
+        if not due:
+            return self._next_poll_in()
+
+        lookups = [watched for watched in due if watched.needs_lookup]
+        batchable = [watched for watched in due if not watched.needs_lookup]
+        if len(batchable) >= self.batch_threshold:
+            lookups += self._poll_batch(batchable, started_at_ms)
+        else:
+            lookups += batchable
+
+        for watched in lookups:
+            self._poll_one(watched)
+        if len(lookups) == watched_count:
+            # every watched transaction was just read, nothing older needs to be scanned again
+            self._updated_since_ms = started_at_ms - _CLOCK_SKEW_MS
+
+        now = time.monotonic()
+        for watched in due:
+            watched.next_poll_at = now + self.poll_intervals.get(watched.status, self.default_interval)
+        return self._next_poll_in()
+
+    def _poll_batch(self, batchable, started_at_ms):
+        """Applies every update since the previous batch, returns the due transactions it couldn't cover"""
+        try:
+            updates, complete = fetch_updated_since(self.sdk, self._updated_since_ms, self.max_batch_pages)
+        except Exception:
+            return batchable
+
+        with self._lock:
+            watched_updates = [(self._watched[tx_id], tx) for tx_id, tx in updates.items() if tx_id in self._watched]
+        for watched, transaction in watched_updates:
+            self._apply(watched, transaction)
+
+        if complete:
+            # whatever the batch didn't return wasn't updated since it was last read
+            self._updated_since_ms = started_at_ms - _CLOCK_SKEW_MS
+            return []
+        return [watched for watched in batchable if watched.tx_id not in updates]
+
+    def _poll_one(self, watched):
+        try:
+            transaction = self.sdk.get_transaction_by_id(watched.tx_id)
+        except Exception as e:
+            watched.errors += 1
+            if watched.errors >= self.max_errors:
+                self._finish(watched)
+                if not watched.future.done():
+                    watched.future.set_exception(e)
+            return
+        watched.errors = 0
+        watched.needs_lookup = False
+        self._apply(watched, transaction)
+
+    def _apply(self, watched, transaction):
+        status = transaction.get("status")
+        if status != watched.status:
+            watched.status = status
+            for callback in (watched.on_status_change, self.on_status_change):
+                if callback:
+                    callback(transaction)
+        if status in TRANSACTION_FINAL_STATUS_TYPES:
+            self._finish(watched)
+            if not watched.future.done():
+                watched.future.set_result(transaction)
+
+    def _finish(self, watched):
+        with self._lock:
+            self._watched.pop(watched.tx_id, None)
+
+    def _next_poll_in(self):
+        with self._lock:
+            if not self._watched:
+                return None
+            return max(0.0, min(watched.next_poll_at for watched in self._watched.values()) - time.monotonic())
+
+    def _run(self):
+        while not self._stopped.is_set():
+            self._wakeup.clear()
+            try:
+                wait = self.poll()
+            except Exception:
+                wait = self.default_interval
+            self._wakeup.wait(wait)
+
+    @staticmethod
+    def _now_ms():
+        return int(time.time() * 1000)
@@ -0,0 +1,117 @@
+import requests
+from requests.adapters import HTTPAdapter
+
+
+class Transport:
+    """Sends signed requests for FireblocksSDK.
+
+    Implement `request` to plug in a custom HTTP stack. It receives the full url, the headers and the already
+    serialized body, and must return a response object exposing `status_code`, `headers`, `text` and `content`,
+    the body bytes decoded with the client's JsonCodec. Responses without `content` are decoded with their `json()`.
+    Connection failures a RetryPolicy may retry are listed in `retryable_errors`.
+
+    Streaming calls pass `stream=True`, the response body must then be left unread and exposed through
+    `iter_content(chunk_size)` and `close()`, as requests does.
+    """
+
+    retryable_errors = ()
+
+    def request(self, method, url, headers=None, data=None, timeout=None, stream=False):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class AsyncTransport:
+    """Sends signed requests for AsyncFireblocksSDK, same contract as Transport with an awaitable `request`.
+
+    Streamed responses must expose `aiter_bytes()`, `aread()` and `aclose()`, as httpx does.
+    """
+
+    retryable_errors = ()
+
+    async def request(self, method, url, headers=None, data=None, timeout=None, stream=False):
+        raise NotImplementedError
+
+    async def close(self):
+        pass
+
+
+class RequestsTransport(Transport):
+    retryable_errors = (requests.ConnectionError, requests.Timeout)
+
+    def __init__(
+            self,
+            pool_connections=10,
+            pool_maxsize=10,
+            pool_block=False,
+            keep_alive=True,
+            session=None,
+    ):
+        """Default transport, backed by a requests.Session with a tunable connection pool.
+
+        Args:
+            pool_connections (int): Number of per-host connection pools to cache
+            pool_maxsize (int): Maximum number of connections kept per host. Set it to at least the number of
+                threads sharing the SDK instance to avoid "connection pool is full" churn
+            pool_block (bool): Whether to block waiting for a free connection when the pool of a host is exhausted,
+                instead of opening a throwaway connection
+            keep_alive (bool): Whether to reuse connections between requests
+            session (requests.Session, optional): Session to use instead of creating a new one
+        """
+        self.session = session or requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        if not keep_alive:
+            self.session.headers["Connection"] = "close"
+
+    def request(self, method, url, headers=None, data=None, timeout=None, stream=False):
+        return self.session.request(method, url, headers=headers, data=data, timeout=timeout, stream=stream)
+
+    def close(self):
+        self.session.close()
+
+
+class HttpxAsyncTransport(AsyncTransport):
+    def __init__(
+            self,
+            max_connections=100,
+            max_keepalive_connections=20,
+            keep_alive=True,
+            client=None,
+    ):
+        """Default asyncio transport, backed by a pooled httpx.AsyncClient.
+
+        Args:
+            max_connections (int): Maximum number of concurrent connections in the pool
+            max_keepalive_connections (int): Maximum number of idle connections kept alive in the pool
+            keep_alive (bool): Whether to reuse connections between requests
+            client (httpx.AsyncClient, optional): Client to use instead of creating a new one
+        """
+        try:
+            import httpx
+        except ImportError:
+            raise ImportError("HttpxAsyncTransport requires httpx, install it with: pip install httpx")
+
+        self.retryable_errors = (httpx.TransportError,)
+        if client is None:
+            client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=max_connections,
+                    max_keepalive_connections=max_keepalive_connections if keep_alive else 0,
+                ),
+            )
+        self.client = client
+
+    async def request(self, method, url, headers=None, data=None, timeout=None, stream=False):
+        request = self.client.build_request(method, url, headers=headers, content=data, timeout=timeout)
+        return await self.client.send(request, stream=stream)
+
+    async def close(self):
+        await self.client.aclose()
@@ -0,0 +1,320 @@
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Sequence
+
+
+class VaultAccountSpec:
+    def __init__(self, name, customer_ref_id=None, assets: Sequence[str] = (), hidden_on_ui=False, auto_fuel=False):
+        """A vault account to create in bulk with FireblocksSDK.provision_vault_accounts
+
+        Args:
+            name (str): A name for the new vault account
+            customer_ref_id (str, optional): The ID for AML providers to associate the owner of funds with transactions
+            assets (list of str, optional): The assets to add to the account (e.g BTC, ETH)
+            hidden_on_ui (bool, optional): Hide the vault account from the web console
+            auto_fuel (bool, optional): Enable auto fueling of the account
+        """
+        self.name = name
+        self.customer_ref_id = customer_ref_id
+        self.assets = list(assets)
+        self.hidden_on_ui = hidden_on_ui
+        self.auto_fuel = auto_fuel
+
+
+class AddressSpec:
+    def __init__(self, vault_account_id, asset_id, description=None, customer_ref_id=None):
+        """A deposit address to generate in bulk with FireblocksSDK.generate_new_addresses
+
+        Args:
+            vault_account_id (str): The vault account ID
+            asset_id (str): The ID of the asset for which to generate the deposit address
+            description (str, optional): A description for the new address
+            customer_ref_id (str, optional): The ID for AML providers to associate the owner of funds with transactions
+        """
+        self.vault_account_id = vault_account_id
+        self.asset_id = asset_id
+        self.description = description
+        self.customer_ref_id = customer_ref_id
+
+
+class ProvisionedVaultAccount:
+    def __init__(self, index: int, name: str):
+        """Outcome of provisioning one VaultAccountSpec.
+
+        Attributes:
+            index: Position of the spec in the provisioned list
+            name: The vault account name
+            vault_account_id: Id of the created vault account, None until it is created
+            assets: Responses of create_vault_asset (addresses etc.) by asset id, for the assets created so far
+            error: Message of the error that stopped the provisioning of this account, None when it succeeded
+            error_code: Fireblocks error code of that error, if any
+        """
+        self.index = index
+        self.name = name
+        self.vault_account_id: Optional[str] = None
+        self.assets: Dict[str, dict] = {}
+        self.error: Optional[str] = None
+        self.error_code = None
+
+    @property
+    def succeeded(self):
+        return self.error is None and self.vault_account_id is not None
+
+    def to_dict(self):
+        return {
+            "index": self.index,
+            "name": self.name,
+            "vaultAccountId": self.vault_account_id,
+            "assets": dict(self.assets),
+            "error": self.error,
+            "errorCode": self.error_code,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        item = cls(data["index"], data["name"])
+        item.vault_account_id = data.get("vaultAccountId")
+        item.assets = dict(data.get("assets") or {})
+        item.error = data.get("error")
+        item.error_code = data.get("errorCode")
+        return item
+
+
+class GeneratedAddress:
+    def __init__(self, index: int, vault_account_id, asset_id, customer_ref_id=None):
+        """Outcome of generating one AddressSpec.
+
+        Attributes:
+            index: Position of the spec in the generated list
+            vault_account_id, asset_id, customer_ref_id: As in the spec
+            address: Response of generate_new_address (address, tag, bip44AddressIndex...), None until it is generated
+            error: Message of the error that failed the generation, None when it succeeded
+            error_code: Fireblocks error code of that error, if any
+        """
+        self.index = index
+        self.vault_account_id = vault_account_id
+        self.asset_id = asset_id
+        self.customer_ref_id = customer_ref_id
+        self.address: Optional[dict] = None
+        self.error: Optional[str] = None
+        self.error_code = None
+
+    @property
+    def succeeded(self):
+        return self.error is None and self.address is not None
+
+    def to_dict(self):
+        return {
+            "index": self.index,
+            "vaultAccountId": self.vault_account_id,
+            "assetId": self.asset_id,
+            "customerRefId": self.customer_ref_id,
+            "address": self.address,
+            "error": self.error,
+            "errorCode": self.error_code,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        item = cls(data["index"], data["vaultAccountId"], data["assetId"], data.get("customerRefId"))
+        item.address = data.get("address")
+        item.error = data.get("error")
+        item.error_code = data.get("errorCode")
+        return item
+
+
+class _BulkResult:
+    _item_type = None
+
+    def __init__(self, batch_id: str, items: list):
+        self.batch_id = batch_id
+        self.items = items
+
+    @property
+    def succeeded(self) -> list:
+        return [item for item in self.items if item.succeeded]
+
+    @property
+    def failed(self) -> list:
+        return [item for item in self.items if not item.succeeded]
+
+    @property
+    def complete(self):
+        return all(item.succeeded for item in self.items)
+
+    def to_state(self):
+        return {"batchId": self.batch_id, "items": [item.to_dict() for item in self.items]}
+
+    @classmethod
+    def from_state(cls, state):
+        return cls(state["batchId"], [cls._item_type.from_dict(item) for item in state["items"]])
+
+
+class BulkProvisioningResult(_BulkResult):
+    """Per account outcome of FireblocksSDK.provision_vault_accounts, in the order of the specs.
+
+    Pass it back as `resume_from`, with the same specs, to finish a batch that partially failed or was
+    interrupted: the steps already done are skipped, the others are sent again with the same idempotency keys.
+    to_state() and from_state() convert it to and from JSON serializable data, to resume from another process.
+    """
+
+    _item_type = ProvisionedVaultAccount
+    items: List[ProvisionedVaultAccount]
+
+
+class BulkAddressResult(_BulkResult):
+    """Per address outcome of FireblocksSDK.generate_new_addresses, in the order of the specs.
+
+    Resumed like a BulkProvisioningResult, only the addresses not generated yet are requested again.
+    """
+
+    _item_type = GeneratedAddress
+    items: List[GeneratedAddress]
+
+
+def idempotency_key(batch_id, index, step):
+    """Idempotency key of one step ("account" or an asset id) of a batch, the same each time the batch is resumed"""
+    return str(uuid.uuid5(uuid.UUID(batch_id), f"{index}/{step}"))
+
+
+def _start(result_type, specs, resume_from, new_item):
+    if resume_from is None:
+        return result_type(str(uuid.uuid4()), [new_item(i, spec) for i, spec in enumerate(specs)])
+    if len(resume_from.items) != len(specs):
+        raise ValueError(f"Resuming a batch of {len(resume_from.items)} items with {len(specs)} specs")
+    for item in resume_from.items:
+        item.error = item.error_code = None
+    return resume_from
+
+
+def _fail(item, error):
+    item.error = str(error)
+    item.error_code = getattr(error, "error_code", None)
+
+
+def _run_in_threads(work, pending, max_workers, on_item_done):
+    callback_lock = threading.Lock()
+
+    def run(spec, item):
+        try:
+            work(spec, item)
+        except Exception as e:
+            _fail(item, e)
+        if on_item_done:
+            with callback_lock:
+                on_item_done(item)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for future in [executor.submit(run, spec, item) for spec, item in pending]:
+            future.result()
+
+
+async def _run_in_tasks(work, pending, max_workers, on_item_done):
+    import asyncio
+
+    semaphore = asyncio.Semaphore(max_workers)
+
+    async def run(spec, item):
+        async with semaphore:
+            try:
+                await work(spec, item)
+            except Exception as e:
+                _fail(item, e)
+            if on_item_done:
+                on_item_done(item)
+
+    await asyncio.gather(*[run(spec, item) for spec, item in pending])
+
+
+def _pending_steps(spec, item):
+    steps = [] if item.vault_account_id is not None else ["account"]
+    return steps + [asset_id for asset_id in spec.assets if asset_id not in item.assets]
+
+
+def _start_provisioning(specs, resume_from):
+    result = _start(BulkProvisioningResult, specs, resume_from, lambda i, spec: ProvisionedVaultAccount(i, spec.name))
+    pending = [(spec, item) for spec, item in zip(specs, result.items) if _pending_steps(spec, item)]
+    return result, pending
+
+
+def provision_vault_accounts(sdk, specs, max_workers, resume_from, on_item_done):
+    """Runs FireblocksSDK.provision_vault_accounts, each account and its assets are created on a pool thread"""
+    result, pending = _start_provisioning(specs, resume_from)
+
+    def provision(spec, item):
+        for step in _pending_steps(spec, item):
+            key = idempotency_key(result.batch_id, item.index, step)
+            if step == "account":
+                account = sdk.create_vault_account(
+                    spec.name, spec.hidden_on_ui, spec.customer_ref_id, spec.auto_fuel, idempotency_key=key
+                )
+                item.vault_account_id = account["id"]
+            else:
+                item.assets[step] = sdk.create_vault_asset(item.vault_account_id, step, idempotency_key=key)
+
+    _run_in_threads(provision, pending, max_workers, on_item_done)
+    return result
+
+
+async def aprovision_vault_accounts(sdk, specs, max_workers, resume_from, on_item_done):
+    """Runs AsyncFireblocksSDK.provision_vault_accounts, up to max_workers accounts are provisioned concurrently"""
+    result, pending = _start_provisioning(specs, resume_from)
+
+    async def provision(spec, item):
+        for step in _pending_steps(spec, item):
+            key = idempotency_key(result.batch_id, item.index, step)
+            if step == "account":
+                account = await sdk.create_vault_account(
+                    spec.name, spec.hidden_on_ui, spec.customer_ref_id, spec.auto_fuel, idempotency_key=key
+                )
+                item.vault_account_id = account["id"]
+            else:
+                item.assets[step] = await sdk.create_vault_asset(item.vault_account_id, step, idempotency_key=key)
+
+    await _run_in_tasks(provision, pending, max_workers, on_item_done)
+    return result
+
+
+def _start_generating(specs, resume_from):
+    def new_item(i, spec):
+        return GeneratedAddress(i, spec.vault_account_id, spec.asset_id, spec.customer_ref_id)
+
+    result = _start(BulkAddressResult, specs, resume_from, new_item)
+    pending = [(spec, item) for spec, item in zip(specs, result.items) if item.address is None]
+    return result, pending
+
+
+def _index_generated(address_index, item):
+    if address_index is not None:
+        address_index.add_generated(item.vault_account_id, item.asset_id, item.address, item.customer_ref_id)
+
+
+def generate_new_addresses(sdk, specs, max_workers, resume_from, on_item_done, address_index):
+    """Runs FireblocksSDK.generate_new_addresses, each address is generated on a pool thread"""
+    result, pending = _start_generating(specs, resume_from)
+
+    def generate(spec, item):
+        item.address = sdk.generate_new_address(
+            spec.vault_account_id, spec.asset_id, spec.description, spec.customer_ref_id,
+            idempotency_key(result.batch_id, item.index, "address"),
+        )
+        _index_generated(address_index, item)
+
+    _run_in_threads(generate, pending, max_workers, on_item_done)
+    return result
+
+
+async def agenerate_new_addresses(sdk, specs, max_workers, resume_from, on_item_done, address_index):
+    """Runs AsyncFireblocksSDK.generate_new_addresses, up to max_workers addresses are generated concurrently"""
+    result, pending = _start_generating(specs, resume_from)
+
+    async def generate(spec, item):
+        item.address = await sdk.generate_new_address(
+            spec.vault_account_id, spec.asset_id, spec.description, spec.customer_ref_id,
+            idempotency_key(result.batch_id, item.index, "address"),
+        )
+        _index_generated(address_index, item)
+
+    await _run_in_tasks(generate, pending, max_workers, on_item_done)
+    return result
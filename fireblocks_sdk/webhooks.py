@@ -0,0 +1,330 @@
+import base64
+import binascii
+import hashlib
+import queue
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional
+
+from cryptography.exceptions import InvalidSignature
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.asymmetric import padding
+from cryptography.hazmat.primitives.serialization import load_pem_public_key
+
+from .json_codec import JsonCodec, default_json_codec
+
+SIGNATURE_HEADER = "Fireblocks-Signature"
+
+# handlers registered for this event type receive every event
+ALL_EVENTS = "*"
+
+_STATUS_LINES = {
+    200: "200 OK",
+    400: "400 Bad Request",
+    401: "401 Unauthorized",
+    404: "404 Not Found",
+    405: "405 Method Not Allowed",
+    413: "413 Payload Too Large",
+    503: "503 Service Unavailable",
+}
+
+
+@lru_cache(maxsize=8)
+def _load_public_key(pem):
+    return load_pem_public_key(pem)
+
+
+class WebhookVerifier:
+    def __init__(self, public_key):
+        """Verifies the Fireblocks-Signature header of webhook requests: a base64 RSA SHA-512 signature of the body
+
+        Args:
+            public_key (str): The Fireblocks webhook public key of your workspace environment, in PEM format
+        """
+        if isinstance(public_key, str):
+            public_key = public_key.encode("utf-8")
+        self.public_key = _load_public_key(public_key)
+
+    def verify(self, body: bytes, signature: str) -> bool:
+        if not signature:
+            return False
+        try:
+            self.public_key.verify(base64.b64decode(signature), body, padding.PKCS1v15(), hashes.SHA512())
+            return True
+        except (InvalidSignature, binascii.Error, ValueError):
+            return False
+
+
+def body_digest(body: bytes, event: dict):
+    """Default deduplication key: webhooks delivered again after a failed delivery have the same body"""
+    return hashlib.sha256(body).digest()
+
+
+class WebhookReceiver:
+    def __init__(
+            self,
+            public_key,
+            max_workers: int = 4,
+            batch_size: int = 100,
+            batch_interval: float = 0.05,
+            max_pending: int = 10000,
+            dedup_size: int = 100000,
+            max_body_size: int = 1024 * 1024,
+            event_key: Callable[[bytes, dict], object] = body_digest,
+            json_codec: JsonCodec = None,
+            on_error: Callable[[Exception, List[dict]], None] = None,
+    ):
+        """Receives Fireblocks webhooks: verifies their signature, drops duplicates and passes batches to handlers.
+
+        Requests are acknowledged as soon as the event is queued, handlers then run on a thread pool with lists of
+        events of the type they were registered for, of up to batch_size events gathered for at most
+        batch_interval seconds. Events of a batch keep their arrival order, batches may run concurrently unless
+        max_workers is 1. At most max_workers handler calls are in flight, the events behind them wait in the
+        queue. When max_pending events are waiting, requests are answered 503 so that Fireblocks delivers them
+        again later.
+
+        Mount it with wsgi_app or asgi_app, serve it standalone with serve(), or pass requests to handle().
+
+        Args:
+            public_key (str): The Fireblocks webhook public key of your workspace environment, in PEM format
+            max_workers (int, optional): Threads running the handlers
+            batch_size (int, optional): Maximum number of events per handler call
+            batch_interval (float, optional): Seconds to wait for a batch to fill up
+            max_pending (int, optional): Events queued for the handlers before requests are rejected
+            dedup_size (int, optional): Number of recent event keys remembered to drop duplicates
+            max_body_size (int, optional): Larger requests are rejected
+            event_key (callable, optional): Returns the deduplication key of an event from the body and the event
+            json_codec (JsonCodec, optional): Decodes the bodies, orjson when installed
+            on_error (callable, optional): Called with the exception and the batch when a handler fails
+        """
+        self.verifier = WebhookVerifier(public_key)
+        self.max_workers = max_workers
+        self.batch_size = batch_size
+        self.batch_interval = batch_interval
+        self.dedup_size = dedup_size
+        self.max_body_size = max_body_size
+        self.event_key = event_key
+        self.json_codec = json_codec or default_json_codec()
+        self.on_error = on_error
+        self._handlers: Dict[str, List[Callable[[List[dict]], None]]] = {}
+        self._queue = queue.Queue(max_pending)
+        self._seen = OrderedDict()
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        # handler calls in flight, the dispatcher waits for a free worker so that the queue fills up and pushes back
+        self._slots = threading.BoundedSemaphore(max_workers)
+        self.stats = {"received": 0, "invalid_signature": 0, "duplicates": 0, "rejected": 0, "dispatched": 0}
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def on(self, event_type: str, handler: Callable[[List[dict]], None] = None):
+        """Registers a handler called with lists of events of a type (e.g. TRANSACTION_STATUS_UPDATED), or of all
+        types with ALL_EVENTS. Can be used as a decorator.
+        """
+        if handler is None:
+            return lambda handler: self.on(event_type, handler)
+        with self._lock:
+            self._handlers.setdefault(event_type, []).append(handler)
+        return handler
+
+    def start(self):
+        with self._lock:
+            if self._thread is None:
+                self._stopped.clear()
+                self._executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix="fireblocks-webhooks")
+                self._thread = threading.Thread(target=self._run, name="fireblocks-webhook-dispatcher", daemon=True)
+                self._thread.start()
+
+    def stop(self):
+        """Dispatches the queued events, waits for the handlers to finish and stops the threads"""
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._executor.shutdown(wait=True)
+            self._thread = self._executor = None
+
+    def handle(self, body: bytes, signature: Optional[str]) -> int:
+        """Processes a webhook request, returns the HTTP status code to answer with
+
+        Args:
+            body (bytes): The raw request body
+            signature (str): The value of the Fireblocks-Signature header
+        """
+        if self._thread is None:
+            self.start()
+        self._count("received")
+        if len(body) > self.max_body_size:
+            return 413
+        if not self.verifier.verify(body, signature):
+            self._count("invalid_signature")
+            return 401
+        try:
+            event = self.json_codec.loads(body)
+        except ValueError:
+            return 400
+        if not isinstance(event, dict):
+            return 400
+        key = self.event_key(body, event)
+        with self._lock:
+            if key in self._seen:
+                self.stats["duplicates"] += 1
+                return 200
+            try:
+                self._queue.put_nowait(event)
+            except queue.Full:
+                self.stats["rejected"] += 1
+                return 503
+            self._seen[key] = None
+            if len(self._seen) > self.dedup_size:
+                self._seen.popitem(last=False)
+        return 200
+
+    def wsgi_app(self, environ, start_response):
+        """WSGI application receiving the webhooks, at any path"""
+        status = self._http_status(environ.get("REQUEST_METHOD"), environ.get("CONTENT_LENGTH"))
+        if status is None:
+            body = environ["wsgi.input"].read(int(environ.get("CONTENT_LENGTH") or 0))
+            status = self.handle(body, environ.get("HTTP_FIREBLOCKS_SIGNATURE"))
+        start_response(_STATUS_LINES[status], [("Content-Type", "text/plain"), ("Content-Length", "0")])
+        return [b""]
+
+    async def asgi_app(self, scope, receive, send):
+        """ASGI application receiving the webhooks, at any path"""
+        if scope["type"] != "http":
+            return
+        headers = {name.decode("latin-1").lower(): value.decode("latin-1") for name, value in scope["headers"]}
+        status = self._http_status(scope["method"], headers.get("content-length"))
+        if status is None:
+            chunks = []
+            size = 0
+            while True:
+                message = await receive()
+                chunk = message.get("body", b"")
+                size += len(chunk)
+                if size > self.max_body_size:
+                    status = 413
+                    break
+                chunks.append(chunk)
+                if not message.get("more_body"):
+                    break
+            if status is None:
+                status = self.handle(b"".join(chunks), headers.get(SIGNATURE_HEADER.lower()))
+        await send({"type": "http.response.start", "status": status, "headers": [(b"content-length", b"0")]})
+        await send({"type": "http.response.body", "body": b""})
+
+    async def serve(self, host: str = "0.0.0.0", port: int = 8000, path: str = None):
+        """Serves the webhooks over HTTP/1.1 with asyncio until cancelled, without a web framework
+
+        Args:
+            host (str, optional): The interface to listen on
+            port (int, optional): The port to listen on
+            path (str, optional): Only accept requests to this path, any path by default
+        """
+        import asyncio
+
+        async def on_connection(reader, writer):
+            try:
+                while True:
+                    status, keep_alive = await self._serve_request(reader, path)
+                    if status is None:
+                        break
+                    connection = b"keep-alive" if keep_alive else b"close"
+                    writer.write(
+                        b"HTTP/1.1 " + _STATUS_LINES[status].encode() + b"\r\nContent-Length: 0\r\nConnection: "
+                        + connection + b"\r\n\r\n"
+                    )
+                    await writer.drain()
+                    if not keep_alive:
+                        break
+            except (ConnectionError, asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+                pass
+            finally:
+                writer.close()
+
+        self.start()
+        server = await asyncio.start_server(on_connection, host, port)
+        async with server:
+            await server.serve_forever()
+
+    async def _serve_request(self, reader, path):
+        """Reads a request and processes it, returns the status code (None on EOF) and whether to keep alive"""
+        head = await reader.readuntil(b"\r\n\r\n")
+        if not head.strip():
+            return None, False
+        request_line, *header_lines = head.decode("latin-1").split("\r\n")
+        method, target, version = (request_line.split(" ") + ["", ""])[:3]
+        headers = {}
+        for line in header_lines:
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+        keep_alive = headers.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+        status = self._http_status(method, headers.get("content-length"))
+        if status is None and path is not None and target.split("?", 1)[0] != path:
+            status = 404
+        if status is not None:
+            return status, False
+        body = await reader.readexactly(int(headers.get("content-length") or 0))
+        return self.handle(body, headers.get(SIGNATURE_HEADER.lower())), keep_alive
+
+    def _http_status(self, method, content_length):
+        """Status code rejecting a request before its body is read, None when it is acceptable"""
+        if method != "POST":
+            return 405
+        try:
+            length = int(content_length or 0)
+        except ValueError:
+            return 400
+        if length > self.max_body_size:
+            return 413
+        return None
+
+    def _count(self, name, count=1):
+        with self._lock:
+            self.stats[name] += count
+
+    def _run(self):
+        while not (self._stopped.is_set() and self._queue.empty()):
+            try:
+                batch = [self._queue.get(timeout=0.1)]
+            except queue.Empty:
+                continue
+            deadline = time.monotonic() + self.batch_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                try:
+                    batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            self._dispatch(batch)
+
+    def _dispatch(self, batch):
+        by_type = {}
+        for event in batch:
+            by_type.setdefault(event.get("type"), []).append(event)
+        with self._lock:
+            calls = [(handler, events) for event_type, events in by_type.items()
+                     for handler in self._handlers.get(event_type, [])]
+            calls += [(handler, batch) for handler in self._handlers.get(ALL_EVENTS, [])]
+        for handler, events in calls:
+            self._slots.acquire()
+            self._executor.submit(self._call, handler, events)
+        self._count("dispatched", len(batch))
+
+    def _call(self, handler, events):
+        try:
+            handler(events)
+        except Exception as e:
+            if self.on_error:
+                self.on_error(e, events)
+        finally:
+            self._slots.release()
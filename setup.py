@@ -1,4 +1,4 @@
-from distutils.core import setup
+from setuptools import setup
 setup(
   name = 'fireblocks_sdk',
   packages = ['fireblocks_sdk'],
@@ -15,6 +15,12 @@ setup(
           'cryptography>=2.7',
           'requests>=2.22.0',
       ],
+  extras_require={
+          'async': ['httpx>=0.23.0'],
+          'fast': ['orjson>=3.6.0'],
+          'numpy': ['numpy>=1.21'],
+          'otel': ['opentelemetry-api>=1.15.0'],
+      },
   classifiers=[
     'Development Status :: 5 - Production/Stable',
     'Intended Audience :: Developers',
@@ -0,0 +1,101 @@
+import asyncio
+
+from fireblocks_sdk.address_index import AddressIndex, aupdate_address_index, update_address_index
+from fireblocks_sdk.vault_provisioning import AddressSpec, BulkAddressResult, generate_new_addresses, idempotency_key
+
+
+class _StubSdk:
+    """Serves the addresses of one vault account asset in pages, the cursor being the offset of the next page"""
+
+    def __init__(self, addresses, fail_for=()):
+        self.addresses = list(addresses)
+        self.fail_for = set(fail_for)
+        self.cursors = []
+        self.generated = []
+
+    def get_paginated_addresses(self, vault_account_id, asset_id, limit=500, before=None, after=None):
+        self.cursors.append(after)
+        offset = int(after or 0)
+        end = offset + limit
+        paging = {"after": str(end)} if end < len(self.addresses) else {}
+        return {"addresses": self.addresses[offset:end], "paging": paging}
+
+    def generate_new_address(self, vault_account_id, asset_id, description=None, customer_ref_id=None,
+                             idempotency_key=None):
+        self.generated.append((vault_account_id, asset_id, idempotency_key))
+        if customer_ref_id in self.fail_for:
+            raise ConnectionError("unreachable")
+        return {"address": f"addr-{vault_account_id}-{customer_ref_id}", "bip44AddressIndex": len(self.generated)}
+
+
+class _AsyncStubSdk(_StubSdk):
+    async def get_paginated_addresses(self, *args, **kwargs):
+        return super().get_paginated_addresses(*args, **kwargs)
+
+
+def _address(i):
+    return {"address": f"0xAbC{i}", "bip44AddressIndex": i, "customerRefId": f"c{i}"}
+
+
+def test_lookup_matches_every_format_of_an_address():
+    index = AddressIndex()
+    assert index.add_generated("0", "BCH", {"address": "qz1", "legacyAddress": "1Ab", "tag": None}, "cust")
+    assert not index.add_generated("0", "BCH", {"address": "qz1"})
+    assert index.lookup("1Ab").customer_ref_id == "cust"
+    assert index.add_generated("1", "XRP", {"address": "r1", "tag": "42"})
+    assert index.lookup("r1") is None
+    assert index.lookup("r1", "42").vault_account_id == "1"
+    assert len(index) == 2
+    restored = AddressIndex.from_state(index.to_state())
+    assert restored.lookup("1Ab").address == "qz1"
+
+
+def test_update_resumes_from_the_stored_cursor():
+    sdk = _StubSdk([_address(i) for i in range(5)])
+    index = AddressIndex()
+    assert update_address_index(sdk, index, "0", "ETH", 2, False) == 5
+    assert sdk.cursors == [None, "2", "4"]
+    assert index.scan_cursor("0", "ETH") == "4"
+    # EVM addresses are matched whatever their case
+    assert index.lookup("0xabc3").bip44_address_index == 3
+
+    sdk.addresses += [_address(5), _address(6)]
+    sdk.cursors.clear()
+    assert update_address_index(sdk, index, "0", "ETH", 2, False) == 2
+    assert sdk.cursors == ["4", "6"]
+    assert len(index) == 7
+
+    # the cursor survives a restart through to_state()
+    sdk.cursors.clear()
+    restored = AddressIndex.from_state(index.to_state())
+    assert update_address_index(sdk, restored, "0", "ETH", 2, False) == 0
+    assert sdk.cursors == ["6"]
+
+    sdk.cursors.clear()
+    assert update_address_index(sdk, index, "0", "ETH", 2, True) == 0
+    assert sdk.cursors == [None, "2", "4", "6"]
+
+
+def test_async_update_resumes_from_the_stored_cursor():
+    sdk = _AsyncStubSdk([_address(i) for i in range(3)])
+    index = AddressIndex()
+    assert asyncio.run(aupdate_address_index(sdk, index, "0", "ETH", 2, False)) == 3
+    sdk.addresses.append(_address(3))
+    assert asyncio.run(aupdate_address_index(sdk, index, "0", "ETH", 2, False)) == 1
+    assert sdk.cursors == [None, "2", "2"]
+
+
+def test_generated_addresses_are_indexed_and_resumed_with_the_same_keys():
+    specs = [AddressSpec("0", "BTC", customer_ref_id=f"c{i}") for i in range(3)]
+    index = AddressIndex()
+    first = generate_new_addresses(_StubSdk([], fail_for={"c1"}), specs, 2, None, None, index)
+    assert [item.succeeded for item in first.items] == [True, False, True]
+    assert index.lookup("addr-0-c0").customer_ref_id == "c0"
+    assert "addr-0-c1" not in index
+
+    sdk = _StubSdk([])
+    resumed = generate_new_addresses(sdk, specs, 2, BulkAddressResult.from_state(first.to_state()), None, index)
+    assert resumed.complete
+    assert sdk.generated == [("0", "BTC", idempotency_key(first.batch_id, 1, "address"))]
+    assert index.lookup("addr-0-c1").customer_ref_id == "c1"
+    assert len(index) == 3
@@ -0,0 +1,125 @@
+import asyncio
+import hashlib
+import json
+
+import jwt
+import pytest
+from cryptography.hazmat.primitives.asymmetric import ec
+
+from fireblocks_sdk import AsyncFireblocksSDK, FireblocksApiException, ProcessPoolSigner, RetryPolicy
+from fireblocks_sdk.transport import HttpxAsyncTransport
+
+httpx = pytest.importorskip("httpx")
+
+_KEY = ec.generate_private_key(ec.SECP256R1())
+
+
+class _Server:
+    """Answers with the queued (status, body) pairs in order, the last one for every following request"""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.requests = []
+
+    def __call__(self, request):
+        self.requests.append(request)
+        status_code, body = self.responses.pop(0) if len(self.responses) > 1 else self.responses[0]
+        return httpx.Response(status_code, content=json.dumps(body).encode("utf-8"))
+
+
+def _run(server, call, **kwargs):
+    async def main():
+        transport = HttpxAsyncTransport(client=httpx.AsyncClient(transport=httpx.MockTransport(server)))
+        async with AsyncFireblocksSDK(_KEY, "api-key", transport=transport, **kwargs) as sdk:
+            result = call(sdk)
+            return await result if asyncio.iscoroutine(result) else result
+
+    return asyncio.run(main())
+
+
+def _claims(request):
+    token = request.headers["Authorization"][len("Bearer "):]
+    return jwt.decode(token, _KEY.public_key(), algorithms=["ES256"])
+
+
+def test_signing_pool_is_rejected():
+    with pytest.raises(ValueError, match="signing_pool"):
+        AsyncFireblocksSDK("private key", "api key", signing_pool=ProcessPoolSigner(max_workers=1))
+
+
+def test_get():
+    server = _Server((200, {"id": "0"}))
+    assert _run(server, lambda sdk: sdk.get_vault_account_by_id("0")) == {"id": "0"}
+    request, = server.requests
+    assert request.method == "GET"
+    assert request.url == "https://api.fireblocks.io/v1/vault/accounts/0"
+    assert request.headers["X-API-Key"] == "api-key"
+    claims = _claims(request)
+    assert claims["uri"] == "/v1/vault/accounts/0"
+    # requests without a body sign the JSON encoding of an empty string, like previous versions
+    assert claims["bodyHash"] == hashlib.sha256(b'""').hexdigest()
+
+
+def test_post_signs_the_body_it_sends():
+    server = _Server((200, {"id": "1"}))
+    assert _run(server, lambda sdk: sdk.create_vault_account("treasury")) == {"id": "1"}
+    request, = server.requests
+    assert request.method == "POST"
+    assert json.loads(request.content)["name"] == "treasury"
+    assert _claims(request)["bodyHash"] == hashlib.sha256(request.content).hexdigest()
+
+
+def test_errors_raise_fireblocks_api_exception():
+    server = _Server((400, {"code": 1234, "message": "bad"}))
+    with pytest.raises(FireblocksApiException) as raised:
+        _run(server, lambda sdk: sdk.get_vault_account_by_id("0"))
+    assert raised.value.error_code == 1234
+
+
+def test_streamed_transactions():
+    transactions = [{"id": str(i), "status": "COMPLETED"} for i in range(50)]
+
+    async def collect(sdk):
+        return [tx async for tx in await sdk.get_transactions(stream=True)]
+
+    assert _run(_Server((200, transactions)), collect) == transactions
+
+
+def test_streamed_errors_are_read_before_raising():
+    server = _Server((404, {"code": 1, "message": "not found"}))
+
+    async def collect(sdk):
+        return [tx async for tx in await sdk.get_transactions(stream=True)]
+
+    with pytest.raises(FireblocksApiException, match="not found"):
+        _run(server, collect)
+
+
+def test_transient_failures_are_retried():
+    server = _Server((503, {}), (502, {}), (200, {"id": "0"}))
+    retry_policy = RetryPolicy(backoff_factor=0, jitter=False)
+    assert _run(server, lambda sdk: sdk.get_vault_account_by_id("0"), retry_policy=retry_policy) == {"id": "0"}
+    assert len(server.requests) == 3
+    # every attempt is signed again
+    assert len({request.headers["Authorization"] for request in server.requests}) == 3
+
+
+def test_connection_errors_are_retried():
+    server = _Server((200, {"id": "0"}))
+    failures = [httpx.ConnectError("refused")]
+
+    def flaky(request):
+        if failures:
+            raise failures.pop()
+        return server(request)
+
+    retry_policy = RetryPolicy(backoff_factor=0, jitter=False)
+    assert _run(flaky, lambda sdk: sdk.get_vault_account_by_id("0"), retry_policy=retry_policy) == {"id": "0"}
+
+
+def test_connection_errors_are_raised_without_a_retry_policy():
+    def unreachable(request):
+        raise httpx.ConnectError("refused")
+
+    with pytest.raises(httpx.ConnectError):
+        _run(unreachable, lambda sdk: sdk.get_vault_account_by_id("0"))
@@ -0,0 +1,78 @@
+import random
+from decimal import Decimal
+
+import pytest
+
+from fireblocks_sdk.balance_matrix import BalanceMatrix, numpy
+
+BOTH_PATHS = [False, pytest.param(True, marks=pytest.mark.skipif(numpy is None, reason="numpy is not installed"))]
+
+
+def _accounts(count, seed=1):
+    rng = random.Random(seed)
+    accounts = []
+    for i in range(count):
+        assets = [
+            {"id": asset_id, "total": f"{rng.randint(0, 10 ** 6)}.{rng.randint(0, 10 ** 8):08d}", "available": "1.5"}
+            for asset_id in rng.sample(["BTC", "ETH", "USDC", "SOL"], rng.randint(0, 4))
+        ]
+        accounts.append({"id": str(i), "customerRefId": rng.choice([None, "a", "b"]), "assets": assets})
+    return accounts
+
+
+def _matrix(use_numpy, accounts):
+    matrix = BalanceMatrix(use_numpy=use_numpy)
+    matrix.add_vault_accounts(accounts)
+    return matrix
+
+
+@pytest.mark.skipif(numpy is None, reason="numpy is not installed")
+def test_numpy_and_python_aggregations_agree():
+    accounts = _accounts(300)
+    with_numpy, without_numpy = _matrix(True, accounts), _matrix(False, accounts)
+    assert with_numpy.sum_by_asset() == without_numpy.sum_by_asset()
+    assert with_numpy.sum_by_asset("available") == without_numpy.sum_by_asset("available")
+    for asset_id in ("BTC", "ETH", "USDC", "SOL"):
+        assert with_numpy.top(asset_id, 5) == without_numpy.top(asset_id, 5)
+        assert with_numpy.filter(asset_id, 1000, 500000) == without_numpy.filter(asset_id, 1000, 500000)
+        assert with_numpy.sum_by_customer_ref(asset_id) == without_numpy.sum_by_customer_ref(asset_id)
+
+
+@pytest.mark.parametrize("use_numpy", BOTH_PATHS)
+def test_sums_match_decimal_arithmetic(use_numpy):
+    accounts = _accounts(50)
+    expected = {}
+    for account in accounts:
+        for asset in account["assets"]:
+            expected[asset["id"]] = expected.get(asset["id"], 0) + Decimal(asset["total"])
+    sums = _matrix(use_numpy, accounts).sum_by_asset()
+    assert {asset_id: total for asset_id, total in sums.items() if total} == expected
+
+
+@pytest.mark.parametrize("use_numpy", BOTH_PATHS)
+def test_sums_beyond_64_bits_do_not_wrap(use_numpy):
+    large = "90000000000"
+    accounts = [{"id": str(i), "customerRefId": "ref", "assets": [{"id": "BTC", "total": large}]} for i in range(3)]
+    matrix = _matrix(use_numpy, accounts)
+    assert matrix.sum_by_asset() == {"BTC": Decimal(large) * 3}
+    assert matrix.sum_by_customer_ref("BTC") == {"ref": Decimal(large) * 3}
+
+
+@pytest.mark.parametrize("use_numpy", BOTH_PATHS)
+def test_amount_out_of_range_leaves_the_columns_aligned(use_numpy):
+    matrix = _matrix(use_numpy, [{"id": "0", "assets": [{"id": "BTC", "total": "1"}]}])
+    with pytest.raises(OverflowError):
+        matrix.add_vault_accounts([
+            {"id": "1", "assets": [{"id": "ETH", "total": "2"}]},
+            {"id": "2", "assets": [{"id": "BTC", "total": "1"}, {"id": "ETH", "total": "1" + "0" * 20}]},
+        ])
+    assert len(matrix._vaults) == len(matrix._assets) == len(matrix._amounts["total"]) == 2
+    assert matrix.sum_by_asset() == {"BTC": Decimal(1), "ETH": Decimal(2)}
+
+
+@pytest.mark.parametrize("use_numpy", BOTH_PATHS)
+def test_reloaded_accounts_replace_their_balances(use_numpy):
+    matrix = _matrix(use_numpy, [{"id": "0", "assets": [{"id": "BTC", "total": "1"}, {"id": "ETH", "total": "3"}]}])
+    matrix.add_vault_accounts([{"id": "0", "assets": [{"id": "BTC", "total": "2"}]}])
+    assert len(matrix) == 1
+    assert matrix.sum_by_asset() == {"BTC": Decimal(2), "ETH": Decimal(0)}
@@ -0,0 +1,111 @@
+from fireblocks_sdk.balance_snapshot import DELTA_ADDED, DELTA_CHANGED, DELTA_REMOVED, BalanceSnapshotter
+
+
+class _StubSdk:
+    """Serves vault accounts like the API: the asset and threshold filters keep accounts holding a matching asset"""
+
+    def __init__(self, balances):
+        # {vault account id: {asset id: total}}
+        self.balances = balances
+        self.asset_lookups = []
+
+    def iter_vault_accounts(self, filters, prefetch=False):
+        for vault_account_id, assets in self.balances.items():
+            matching = [
+                asset_id for asset_id, total in assets.items()
+                if (filters.asset_id is None or asset_id == filters.asset_id)
+                and (filters.min_amount_threshold is None or float(total) >= float(filters.min_amount_threshold))
+            ]
+            if matching:
+                yield {"id": vault_account_id, "assets": [self._asset(asset_id, total) for asset_id, total in assets.items()]}
+
+    def get_vault_account_asset(self, vault_account_id, asset_id):
+        self.asset_lookups.append((vault_account_id, asset_id))
+        return self._asset(asset_id, self.balances[vault_account_id].get(asset_id, "0"))
+
+    @staticmethod
+    def _asset(asset_id, total):
+        return {"id": asset_id, "total": total, "available": total}
+
+
+def _snapshotter(sdk, **kwargs):
+    return BalanceSnapshotter(sdk, fields=("total", "available"), **kwargs)
+
+
+def _kinds(deltas):
+    return sorted((delta.kind, delta.vault_account_id, delta.asset_id) for delta in deltas)
+
+
+def test_full_scans_report_added_changed_and_removed():
+    sdk = _StubSdk({"0": {"BTC": "1", "ETH": "2"}, "1": {"BTC": "3"}})
+    snapshotter = _snapshotter(sdk)
+    assert _kinds(snapshotter.full_scan()) == [
+        (DELTA_ADDED, "0", "BTC"), (DELTA_ADDED, "0", "ETH"), (DELTA_ADDED, "1", "BTC"),
+    ]
+    assert snapshotter.full_scan() == []
+
+    sdk.balances = {"0": {"BTC": "1.5", "ETH": "2"}, "2": {"SOL": "4"}}
+    deltas = snapshotter.full_scan()
+    assert _kinds(deltas) == [(DELTA_ADDED, "2", "SOL"), (DELTA_CHANGED, "0", "BTC"), (DELTA_REMOVED, "1", "BTC")]
+    changed = next(delta for delta in deltas if delta.kind == DELTA_CHANGED)
+    assert changed.previous == {"total": "1", "available": "1"}
+    assert changed.balance == {"total": "1.5", "available": "1.5"}
+    assert snapshotter.balance("0", "BTC") == {"total": "1.5", "available": "1.5"}
+    assert snapshotter.balance("1", "BTC") is None
+
+
+def test_initial_scan_can_be_silent():
+    snapshotter = _snapshotter(_StubSdk({"0": {"BTC": "1"}}), emit_initial=False)
+    assert snapshotter.full_scan() == []
+    assert snapshotter.snapshot() == {("0", "BTC"): {"total": "1", "available": "1"}}
+
+
+def test_full_scans_apply_the_asset_and_threshold_filters():
+    sdk = _StubSdk({"0": {"BTC": "5", "ETH": "0.1"}, "1": {"BTC": "0.5"}, "2": {"ETH": "9"}})
+    snapshotter = _snapshotter(sdk, asset_ids=["BTC", "ETH"], min_amount_threshold=1)
+    assert _kinds(snapshotter.full_scan()) == [(DELTA_ADDED, "0", "BTC"), (DELTA_ADDED, "2", "ETH")]
+
+
+def test_hot_accounts_refresh_between_full_scans():
+    sdk = _StubSdk({"0": {"BTC": "1"}, "1": {"BTC": "2"}})
+    snapshotter = _snapshotter(sdk, hot_accounts=[("0", "BTC")])
+    snapshotter.full_scan()
+    sdk.balances["0"]["BTC"] = "1.25"
+    sdk.balances["1"]["BTC"] = "7"
+    assert _kinds(snapshotter.refresh_hot_accounts()) == [(DELTA_CHANGED, "0", "BTC")]
+    assert sdk.asset_lookups == [("0", "BTC")]
+    assert snapshotter.refresh_hot_accounts() == []
+
+
+def test_hot_accounts_below_the_threshold_are_not_tracked():
+    sdk = _StubSdk({"0": {"BTC": "0.1"}, "1": {"BTC": "5"}})
+    snapshotter = _snapshotter(sdk, min_amount_threshold=1, hot_accounts=[("0", "BTC"), ("1", "BTC")])
+    assert _kinds(snapshotter.full_scan()) == [(DELTA_ADDED, "1", "BTC")]
+    for _ in range(3):
+        assert snapshotter.refresh_hot_accounts() == []
+        assert snapshotter.full_scan() == []
+
+    # falling under the threshold is reported once by the hot refresh, not again by the next full scan
+    sdk.balances["1"]["BTC"] = "0.5"
+    assert _kinds(snapshotter.refresh_hot_accounts()) == [(DELTA_REMOVED, "1", "BTC")]
+    assert snapshotter.full_scan() == []
+
+    sdk.balances["0"]["BTC"] = "2"
+    assert _kinds(snapshotter.refresh_hot_accounts()) == [(DELTA_ADDED, "0", "BTC")]
+    assert snapshotter.full_scan() == []
+
+
+def test_hot_accounts_of_untracked_assets_are_ignored():
+    sdk = _StubSdk({"0": {"BTC": "1", "ETH": "1"}})
+    snapshotter = _snapshotter(sdk, asset_ids=["BTC"], hot_accounts=[("0", "ETH")])
+    snapshotter.full_scan()
+    assert snapshotter.refresh_hot_accounts() == []
+    assert snapshotter.balance("0", "ETH") is None
+
+
+def test_poll_passes_deltas_to_on_delta():
+    received = []
+    snapshotter = _snapshotter(_StubSdk({"0": {"BTC": "1"}}), on_delta=received.append)
+    assert snapshotter.poll() == received
+    assert _kinds(received) == [(DELTA_ADDED, "0", "BTC")]
+    assert snapshotter.poll() == []
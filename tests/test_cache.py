@@ -0,0 +1,46 @@
+import time
+
+from fireblocks_sdk.cache import ResponseCache
+
+
+def test_hits_return_copies():
+    cache = ResponseCache()
+    response = [{"id": "BTC", "nativeAsset": "BTC", "tags": ["a"]}]
+    cache.set("/v1/supported_assets", response)
+    response[0]["id"] = "changed after caching"
+
+    found, first = cache.get("/v1/supported_assets")
+    assert found and first == [{"id": "BTC", "nativeAsset": "BTC", "tags": ["a"]}]
+    first[0]["tags"].append("b")
+    first.clear()
+    assert cache.get("/v1/supported_assets") == (True, [{"id": "BTC", "nativeAsset": "BTC", "tags": ["a"]}])
+
+
+def test_responses_are_scoped_per_client():
+    cache = ResponseCache()
+    cache.set("/v1/supported_assets", ["workspace a"], ("https://api.fireblocks.io", "key a"))
+    assert cache.get("/v1/supported_assets", ("https://api.fireblocks.io", "key b")) == (False, None)
+    assert cache.get("/v1/supported_assets", ("https://sandbox-api.fireblocks.io", "key a")) == (False, None)
+    assert cache.get("/v1/supported_assets", ("https://api.fireblocks.io", "key a")) == (True, ["workspace a"])
+
+
+def test_writes_invalidate_their_prefix_for_every_client():
+    cache = ResponseCache()
+    cache.set("/v1/assets/BTC", {"id": "BTC"}, "a")
+    cache.set("/v1/assets/ETH", {"id": "ETH"}, "b")
+    cache.set("/v1/blockchains", [], "a")
+    cache.on_write("/v1/assets")
+    assert cache.get("/v1/assets/BTC", "a") == (False, None)
+    assert cache.get("/v1/assets/ETH", "b") == (False, None)
+    assert cache.get("/v1/blockchains", "a") == (True, [])
+
+
+def test_entries_expire_and_uncached_paths_are_ignored():
+    cache = ResponseCache(ttls={"/v1/estimate_network_fee": 0.05})
+    cache.set("/v1/estimate_network_fee?assetId=BTC", {"low": 1})
+    cache.set("/v1/vault/accounts", {"id": "0"})
+    assert cache.get("/v1/estimate_network_fee?assetId=BTC") == (True, {"low": 1})
+    assert cache.get("/v1/vault/accounts") == (False, None)
+    time.sleep(0.06)
+    assert cache.get("/v1/estimate_network_fee?assetId=BTC") == (False, None)
+    assert cache.stats()["hits"] == 1
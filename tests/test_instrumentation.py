@@ -0,0 +1,105 @@
+import json
+
+import pytest
+from cryptography.hazmat.primitives.asymmetric import ec
+
+from fireblocks_sdk import FireblocksSDK, Instrumentation, MetricsCollector
+from fireblocks_sdk.instrumentation import PHASE_RECEIVE, PHASE_REQUEST, PHASE_SEND, endpoint_template
+from fireblocks_sdk.transport import Transport
+
+
+class _Response:
+    def __init__(self, body, status_code=200):
+        self.content = json.dumps(body).encode("utf-8")
+        self.text = self.content.decode("utf-8")
+        self.status_code = status_code
+        self.headers = {}
+        self.closed = False
+
+    def json(self):
+        return json.loads(self.content)
+
+    def iter_content(self, chunk_size):
+        for start in range(0, len(self.content), 7):
+            yield self.content[start:start + 7]
+
+    def close(self):
+        self.closed = True
+
+
+class _StubTransport(Transport):
+    def __init__(self, body):
+        self.body = body
+
+    def request(self, method, url, headers=None, data=None, timeout=None, stream=False):
+        return _Response(self.body)
+
+
+class _PhaseRecorder(Instrumentation):
+    def __init__(self):
+        self.events = []
+
+    def before(self, phase, context):
+        self.events.append(("before", phase))
+
+    def after(self, phase, context):
+        self.events.append(("after", phase))
+
+
+def _client(body, *hooks):
+    return FireblocksSDK(ec.generate_private_key(ec.SECP256R1()), "api-key", transport=_StubTransport(body),
+                         instrumentation=list(hooks))
+
+
+def test_endpoint_template_replaces_ids():
+    assert endpoint_template("/v1/vault/accounts/12/BTC?x=1") == "/v1/vault/accounts/{id}/BTC"
+    assert endpoint_template("/v1/transactions/0f0e4b4e-2a3c-4f61-9d5b-6a4b9c0e1a2b") == "/v1/transactions/{id}"
+
+
+def test_phases_of_a_request():
+    recorder = _PhaseRecorder()
+    metrics = MetricsCollector()
+    assert _client({"id": "0"}, recorder, metrics).get_vault_account_by_id("0") == {"id": "0"}
+    assert [phase for event, phase in recorder.events if event == "after"] == [
+        "serialize", "sign", "send", "parse", "request",
+    ]
+    phases = metrics.snapshot()["endpoints"]["GET /v1/vault/accounts/{id}"]["phases"]
+    assert set(phases) == {"serialize", "sign", "send", "parse", "request"}
+
+
+def test_streamed_body_is_timed_in_the_receive_phase():
+    transactions = [{"id": str(i), "status": "COMPLETED"} for i in range(20)]
+    recorder = _PhaseRecorder()
+    metrics = MetricsCollector()
+    streamed = _client(transactions, recorder, metrics).get_transactions(stream=True)
+
+    # the request is still running while the body is read
+    assert ("after", PHASE_SEND) in recorder.events
+    assert ("before", PHASE_RECEIVE) in recorder.events
+    assert ("after", PHASE_REQUEST) not in recorder.events
+    assert metrics.snapshot()["endpoints"] == {}
+
+    assert list(streamed) == transactions
+    assert recorder.events[-2:] == [("after", PHASE_RECEIVE), ("after", PHASE_REQUEST)]
+    endpoint = metrics.snapshot()["endpoints"]["GET /v1/transactions"]
+    assert endpoint["phases"][PHASE_RECEIVE]["count"] == 1
+    assert endpoint["errors"] == 0
+
+
+def test_closing_an_unread_stream_ends_the_request():
+    recorder = _PhaseRecorder()
+    streamed = _client([{"id": "0"}], recorder).get_transactions(stream=True)
+    streamed.close()
+    streamed.close()
+    assert recorder.events.count(("after", PHASE_REQUEST)) == 1
+    assert streamed.response.closed
+
+
+def test_malformed_stream_is_recorded_as_an_error():
+    metrics = MetricsCollector()
+    client = _client({"not": "a list"}, metrics)
+    with pytest.raises(ValueError):
+        list(client.get_transactions(stream=True))
+    endpoint = metrics.snapshot()["endpoints"]["GET /v1/transactions"]
+    assert endpoint["errors"] == 1
+    assert endpoint["phases"][PHASE_RECEIVE]["count"] == 1
@@ -0,0 +1,87 @@
+import hashlib
+import json
+
+import jwt
+import pytest
+from cryptography.hazmat.primitives.asymmetric import ec
+
+from fireblocks_sdk import FireblocksSDK, FireblocksApiException
+from fireblocks_sdk.json_codec import OrjsonCodec, StdlibJsonCodec
+from fireblocks_sdk.sdk import handle_response
+from fireblocks_sdk.transport import Transport
+
+
+class _JsonOnlyResponse:
+    """Follows the older transport contract: no content, only text and json()"""
+
+    def __init__(self, body, status_code=200):
+        self.text = json.dumps(body)
+        self.status_code = status_code
+        self.headers = {}
+
+    def json(self):
+        return json.loads(self.text)
+
+
+class _JsonOnlyTransport(Transport):
+    def request(self, method, url, headers=None, data=None, timeout=None, stream=False):
+        return _JsonOnlyResponse([{"id": "BTC"}])
+
+
+class _Response:
+    def __init__(self, content, status_code=200):
+        self.content = content
+        self.text = content.decode("utf-8")
+        self.status_code = status_code
+        self.headers = {}
+
+
+class _RecordingTransport(Transport):
+    def __init__(self):
+        self.sent = []
+
+    def request(self, method, url, headers=None, data=None, timeout=None, stream=False):
+        self.sent.append((headers, data))
+        return _Response(b'{"id": "1"}')
+
+
+def _orjson_codec():
+    pytest.importorskip("orjson")
+    return OrjsonCodec()
+
+
+@pytest.mark.parametrize("codec", [StdlibJsonCodec, _orjson_codec])
+def test_body_hash_matches_the_bytes_sent(codec):
+    key = ec.generate_private_key(ec.SECP256R1())
+    transport = _RecordingTransport()
+    sdk = FireblocksSDK(key, "api-key", transport=transport, json_codec=codec())
+    sdk.create_vault_account("trésor \u2603", customer_ref_id="ref-1")
+    (headers, data), = transport.sent
+    assert json.loads(data)["name"] == "trésor \u2603"
+    claims = jwt.decode(headers["Authorization"][len("Bearer "):], key.public_key(), algorithms=["ES256"])
+    assert claims["bodyHash"] == hashlib.sha256(data).hexdigest()
+
+
+def test_responses_without_content_are_decoded_with_json():
+    sdk = FireblocksSDK(ec.generate_private_key(ec.SECP256R1()), "api-key", transport=_JsonOnlyTransport())
+    assert sdk.get_supported_assets() == [{"id": "BTC"}]
+
+
+def test_empty_and_invalid_bodies_decode_to_none():
+    assert handle_response(_Response(b""), json_codec=StdlibJsonCodec()) is None
+    assert handle_response(_Response(b"<html>"), json_codec=StdlibJsonCodec()) is None
+
+
+def test_error_responses_carry_the_error_code():
+    with pytest.raises(FireblocksApiException) as raised:
+        handle_response(_Response(b'{"message": "Not found", "code": 1404}', 404), json_codec=StdlibJsonCodec())
+    assert raised.value.error_code == 1404
+
+
+def test_broken_responses_raise():
+    class Broken(_JsonOnlyResponse):
+        def json(self):
+            raise AttributeError("no body")
+
+    with pytest.raises(AttributeError):
+        handle_response(Broken([]), json_codec=StdlibJsonCodec())
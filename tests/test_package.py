@@ -0,0 +1,32 @@
+import subprocess
+import sys
+
+
+def _run(code):
+    return subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True).stdout.split()
+
+
+def test_importing_the_package_loads_no_submodule():
+    loaded = _run("import sys, fireblocks_sdk; print(sorted(m for m in sys.modules if m.startswith('fireblocks_sdk.')))")
+    assert loaded == ["[]"]
+
+
+def test_submodules_are_package_attributes():
+    code = "import fireblocks_sdk; print(fireblocks_sdk.sdk.__name__, fireblocks_sdk.ncw_sdk.__name__, " \
+           "fireblocks_sdk.sdk_token_provider.__name__, fireblocks_sdk.api_types.__name__)"
+    assert _run(code) == [
+        "fireblocks_sdk.sdk", "fireblocks_sdk.ncw_sdk", "fireblocks_sdk.sdk_token_provider", "fireblocks_sdk.api_types",
+    ]
+
+
+def test_public_names_resolve():
+    import fireblocks_sdk
+
+    assert fireblocks_sdk.FireblocksSDK.__module__ == "fireblocks_sdk.sdk"
+    assert fireblocks_sdk.TRANSACTION_STATUS_COMPLETED == "COMPLETED"
+    assert "FireblocksSDK" in dir(fireblocks_sdk)
+    assert not hasattr(fireblocks_sdk, "no_such_name")
+
+
+def test_sync_client_does_not_load_asyncio():
+    assert _run("import sys; from fireblocks_sdk import FireblocksSDK; print('asyncio' in sys.modules)") == ["False"]
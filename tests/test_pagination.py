@@ -0,0 +1,81 @@
+import asyncio
+
+import pytest
+
+from fireblocks_sdk.pagination import (
+    aiterate_pages,
+    cursor_from_cursor,
+    cursor_from_next,
+    cursor_from_paging_after,
+    iterate_pages,
+)
+
+
+def test_cursor_helpers():
+    assert cursor_from_paging_after({"accounts": [], "paging": {"after": "a1"}}) == "a1"
+    assert cursor_from_paging_after({"accounts": [], "paging": {}}) is None
+    assert cursor_from_paging_after({"accounts": []}) is None
+    assert cursor_from_next({"data": [], "next": "n1"}) == "n1"
+    assert cursor_from_next({"data": [], "paging": {"next": "n2"}}) == "n2"
+    assert not cursor_from_next({"data": [], "next": ""})
+    assert cursor_from_cursor({"data": [], "cursor": "c1"}) == "c1"
+    assert cursor_from_cursor({"data": []}) is None
+
+
+class _Pages:
+    """Serves `total` items in pages of `size`, the cursor being the offset of the next page"""
+
+    def __init__(self, total, size):
+        self.total = total
+        self.size = size
+        self.requested = []
+
+    def __call__(self, cursor):
+        self.requested.append(cursor)
+        offset = int(cursor or 0)
+        end = min(offset + self.size, self.total)
+        return {"data": list(range(offset, end)), "next": str(end) if end < self.total else ""}
+
+
+@pytest.mark.parametrize("prefetch", [False, True])
+def test_iterate_pages_yields_every_item_once(prefetch):
+    fetch = _Pages(10, 3)
+    assert list(iterate_pages(fetch, "data", cursor_from_next, prefetch=prefetch)) == list(range(10))
+    assert fetch.requested == [None, "3", "6", "9"]
+
+
+@pytest.mark.parametrize("prefetch", [False, True])
+def test_iterate_pages_stops_at_max_items_and_max_pages(prefetch):
+    fetch = _Pages(10, 3)
+    assert list(iterate_pages(fetch, "data", cursor_from_next, max_items=4, prefetch=prefetch)) == [0, 1, 2, 3]
+    assert fetch.requested == [None, "3"]
+    fetch = _Pages(10, 3)
+    assert list(iterate_pages(fetch, "data", cursor_from_next, max_pages=2, prefetch=prefetch)) == list(range(6))
+    assert fetch.requested == [None, "3"]
+
+
+def test_iterate_pages_is_lazy():
+    fetch = _Pages(10, 3)
+    items = iterate_pages(fetch, "data", cursor_from_next)
+    assert fetch.requested == []
+    assert next(items) == 0
+    assert fetch.requested == [None]
+
+
+def test_iterate_pages_handles_missing_items():
+    assert list(iterate_pages(lambda cursor: {"paging": {}}, "accounts", cursor_from_paging_after)) == []
+
+
+@pytest.mark.parametrize("prefetch", [False, True])
+def test_aiterate_pages_matches_iterate_pages(prefetch):
+    fetch = _Pages(10, 3)
+
+    async def fetch_page(cursor):
+        return fetch(cursor)
+
+    async def collect(**kwargs):
+        return [item async for item in aiterate_pages(fetch_page, "data", cursor_from_next, prefetch=prefetch, **kwargs)]
+
+    assert asyncio.run(collect()) == list(range(10))
+    assert asyncio.run(collect(max_items=5)) == list(range(5))
+    assert asyncio.run(collect(max_pages=1)) == list(range(3))
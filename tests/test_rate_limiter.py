@@ -0,0 +1,62 @@
+import time
+from email.utils import formatdate
+
+import pytest
+
+from fireblocks_sdk.rate_limiter import RateLimiter, TokenBucket, parse_retry_after
+
+
+def test_token_bucket_allows_a_burst_then_spaces_requests():
+    bucket = TokenBucket(rate=10, burst=2)
+    now = bucket.updated_at
+    assert bucket.reserve(now) == 0
+    assert bucket.reserve(now) == 0
+    assert bucket.reserve(now) == pytest.approx(0.1)
+    assert bucket.reserve(now) == pytest.approx(0.2)
+    # refilled while idle, up to the burst
+    later = now + 10
+    assert bucket.reserve(later) == 0
+    assert bucket.reserve(later) == 0
+    assert bucket.reserve(later) == pytest.approx(0.1)
+
+
+def test_blocked_bucket_waits_and_slows_down():
+    bucket = TokenBucket(rate=10, burst=10)
+    now = bucket.updated_at
+    bucket.block(now, 2, adaptive=True)
+    assert bucket.rate == 5
+    assert bucket.reserve(now) == pytest.approx(2)
+    for _ in range(20):
+        bucket.recover()
+    assert bucket.rate == 10
+
+
+def test_endpoint_limits_apply_by_longest_prefix():
+    limiter = RateLimiter(endpoint_limits={"/v1/vault": 1, "/v1/vault/accounts": 100})
+    assert limiter.reserve("/v1/vault/accounts/1?x=1") == 0
+    assert limiter.reserve("/v1/vault/accounts/2") == 0
+    assert limiter.reserve("/v1/vault/assets") == 0
+    assert limiter.reserve("/v1/vault/assets") > 0.5
+    # unlimited family
+    assert limiter.reserve("/v1/transactions") == 0
+
+
+def test_rate_limited_family_is_paused_for_retry_after():
+    limiter = RateLimiter(endpoint_limits={"/v1/transactions": 100}, adaptive=False)
+    assert limiter.on_rate_limited("/v1/transactions", {"Retry-After": "2"}) == 2
+    assert limiter.reserve("/v1/transactions") == pytest.approx(2, abs=0.1)
+    assert limiter.reserve("/v1/vault/accounts") == 0
+
+
+def test_rate_limited_without_limits_pauses_every_request():
+    limiter = RateLimiter(default_retry_after=1.5)
+    assert limiter.on_rate_limited("/v1/transactions", {}) == 1.5
+    assert limiter.reserve("/v1/vault/accounts") == pytest.approx(1.5, abs=0.1)
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("3") == 3
+    assert parse_retry_after("-1") == 0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after(formatdate(time.time() + 30, usegmt=True)) == pytest.approx(30, abs=2)
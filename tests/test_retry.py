@@ -0,0 +1,42 @@
+from fireblocks_sdk.retry import RetryPolicy
+
+
+def test_get_requests_are_retried_on_transient_statuses_and_errors():
+    policy = RetryPolicy(max_retries=2)
+    assert policy.is_retryable("GET", 0, False, status_code=503)
+    assert policy.is_retryable("GET", 1, False, error=ConnectionError())
+    assert not policy.is_retryable("GET", 2, False, status_code=503)
+    assert not policy.is_retryable("GET", 0, False, status_code=400)
+    assert not policy.is_retryable("GET", 0, False, status_code=429)
+
+
+def test_posts_are_retried_only_with_an_idempotency_key():
+    policy = RetryPolicy()
+    assert not policy.is_retryable("POST", 0, False, status_code=502)
+    assert not policy.is_retryable("POST", 0, False, error=TimeoutError())
+    assert policy.is_retryable("POST", 0, True, status_code=502)
+    assert policy.is_retryable("POST", 0, True, error=TimeoutError())
+
+
+def test_connection_errors_can_be_excluded():
+    policy = RetryPolicy(retry_on_connection_errors=False)
+    assert not policy.is_retryable("GET", 0, False, error=ConnectionError())
+    assert policy.is_retryable("GET", 0, False, status_code=500)
+
+
+def test_backoff_grows_exponentially_up_to_the_limit():
+    policy = RetryPolicy(backoff_factor=0.5, max_backoff=3, jitter=False)
+    assert [policy.backoff(retries) for retries in range(5)] == [0.5, 1, 2, 3, 3]
+
+
+def test_jittered_backoff_stays_within_bounds():
+    policy = RetryPolicy(backoff_factor=1, max_backoff=10)
+    for retries in range(6):
+        for _ in range(50):
+            assert 0 <= policy.backoff(retries) <= min(10, 2 ** retries)
+
+
+def test_backoff_honors_retry_after_up_to_the_limit():
+    policy = RetryPolicy(max_backoff=5)
+    assert policy.backoff(0, {"Retry-After": "2"}) == 2
+    assert policy.backoff(0, {"Retry-After": "60"}) == 5
@@ -0,0 +1,90 @@
+import hashlib
+
+import jwt
+import pytest
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import dsa, ec, ed25519, padding, rsa
+from jwt.utils import der_to_raw_signature
+
+from fireblocks_sdk import sdk_token_provider
+from fireblocks_sdk.sdk_token_provider import SdkTokenProvider
+from fireblocks_sdk.signing import CallbackSigner
+
+_KEYS = {
+    "RS256": lambda: rsa.generate_private_key(public_exponent=65537, key_size=2048),
+    "ES256": lambda: ec.generate_private_key(ec.SECP256R1()),
+    "ES384": lambda: ec.generate_private_key(ec.SECP384R1()),
+    "ES512": lambda: ec.generate_private_key(ec.SECP521R1()),
+    "EdDSA": ed25519.Ed25519PrivateKey.generate,
+}
+
+
+def _pem(key):
+    return key.private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+    ).decode()
+
+
+def test_the_key_is_loaded_once_per_provider(monkeypatch):
+    key = ec.generate_private_key(ec.SECP256R1())
+    loads = []
+    load = sdk_token_provider.load_pem_private_key
+
+    def counting_load(*args, **kwargs):
+        loads.append(1)
+        return load(*args, **kwargs)
+
+    monkeypatch.setattr(sdk_token_provider, "load_pem_private_key", counting_load)
+
+    provider = SdkTokenProvider(_pem(key), "api-key", 55)
+    for path in ("/v1/a", "/v1/b", "/v1/c"):
+        jwt.decode(provider.sign_jwt(path), key.public_key(), algorithms=["ES256"])
+    assert len(loads) == 1
+    # nothing is kept at module level, a second client loads its key again
+    SdkTokenProvider(_pem(key), "api-key", 55)
+    assert len(loads) == 2
+
+
+def test_invalid_keys_are_rejected():
+    with pytest.raises(ValueError, match="Invalid private key"):
+        SdkTokenProvider("not a key", "api-key", 55)
+
+
+@pytest.mark.parametrize("algorithm", sorted(_KEYS))
+@pytest.mark.parametrize("as_pem", [True, False])
+def test_the_algorithm_follows_the_key_type(algorithm, as_pem):
+    key = _KEYS[algorithm]()
+    provider = SdkTokenProvider(_pem(key) if as_pem else key, "api-key", 55)
+    assert provider.algorithm == algorithm
+    claims = jwt.decode(provider.sign_jwt("/v1/a", b'{"x": 1}'), key.public_key(), algorithms=[algorithm])
+    assert claims["uri"] == "/v1/a"
+    assert claims["sub"] == "api-key"
+    assert claims["exp"] - claims["iat"] == 55
+    assert claims["bodyHash"] == hashlib.sha256(b'{"x": 1}').hexdigest()
+
+
+def test_unsupported_keys_are_rejected():
+    with pytest.raises(ValueError, match="Unsupported EC curve secp256k1"):
+        SdkTokenProvider(_pem(ec.generate_private_key(ec.SECP256K1())), "api-key", 55)
+    with pytest.raises(ValueError, match="expected an RSA, EC or Ed25519 key"):
+        SdkTokenProvider(_pem(dsa.generate_private_key(2048)), "api-key", 55)
+
+
+@pytest.mark.parametrize("algorithm", ["RS256", "ES256", "EdDSA"])
+def test_callback_signer_tokens_verify(algorithm):
+    key = _KEYS[algorithm]()
+    calls = []
+
+    def sign(signing_input):
+        calls.append(signing_input)
+        if algorithm == "RS256":
+            return key.sign(signing_input, padding.PKCS1v15(), hashes.SHA256())
+        if algorithm == "ES256":
+            return der_to_raw_signature(key.sign(signing_input, ec.ECDSA(hashes.SHA256())), key.curve)
+        return key.sign(signing_input)
+
+    provider = SdkTokenProvider(CallbackSigner(algorithm, sign), "api-key", 55)
+    token = provider.sign_jwt("/v1/b")
+    assert jwt.get_unverified_header(token) == {"alg": algorithm, "typ": "JWT"}
+    assert jwt.decode(token, key.public_key(), algorithms=[algorithm])["uri"] == "/v1/b"
+    assert calls == [token.rsplit(".", 1)[0].encode("ascii")]
@@ -0,0 +1,45 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import jwt
+import pytest
+from cryptography.hazmat.primitives.asymmetric import ec, rsa
+
+from fireblocks_sdk import ProcessPoolSigner
+from fireblocks_sdk.sdk_token_provider import SdkTokenProvider
+
+
+@pytest.mark.parametrize("algorithm, key", [
+    ("ES256", ec.generate_private_key(ec.SECP256R1())),
+    ("RS256", rsa.generate_private_key(public_exponent=65537, key_size=2048)),
+])
+def test_owned_worker_pool_tokens_verify(algorithm, key):
+    signer = ProcessPoolSigner(max_workers=1)
+    provider = SdkTokenProvider(key, "api-key", 55, signing_pool=signer)
+    try:
+        for path in ("/v1/a", "/v1/b"):
+            claims = jwt.decode(provider.sign_jwt(path, b"{}"), key.public_key(), algorithms=[algorithm])
+            assert claims["uri"] == path
+    finally:
+        provider.close()
+    assert signer.executor is None
+
+
+def test_external_executor_gets_the_key_and_is_not_shut_down():
+    key = ec.generate_private_key(ec.SECP256R1())
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        provider = SdkTokenProvider(key, "api-key", 55, signing_pool=ProcessPoolSigner(executor=executor))
+        tokens = [provider.sign_jwt(f"/v1/{i}") for i in range(4)]
+        provider.close()
+        assert executor.submit(lambda: "still running").result() == "still running"
+    assert [jwt.decode(token, key.public_key(), algorithms=["ES256"])["uri"] for token in tokens] == [
+        "/v1/0", "/v1/1", "/v1/2", "/v1/3",
+    ]
+
+
+def test_a_signer_serves_a_single_provider():
+    key = ec.generate_private_key(ec.SECP256R1())
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        signer = ProcessPoolSigner(executor=executor)
+        SdkTokenProvider(key, "api-key", 55, signing_pool=signer)
+        with pytest.raises(ValueError, match="already used"):
+            SdkTokenProvider(key, "api-key", 55, signing_pool=signer)
@@ -0,0 +1,92 @@
+import json
+import random
+
+import pytest
+
+from fireblocks_sdk.streaming import JsonArrayStreamParser, StreamedResponse
+
+ITEMS = [
+    {"id": "1", "amount": 1.5, "note": "café ✓", "tags": ["a", "b"], "nested": {"x": [1, 2, {"y": None}]}},
+    {"id": "2", "amount": -12e-3, "flag": True, "empty": [], "text": "brackets ] } [ { and \"quotes\""},
+    123456789,
+    "plain string",
+    None,
+    [1, [2, [3]]],
+]
+
+
+def _parse(document, items_key, chunk_sizes):
+    parser = JsonArrayStreamParser(items_key)
+    items = []
+    position = 0
+    for size in chunk_sizes:
+        items += parser.feed(document[position:position + size])
+        position += size
+    items += parser.feed(document[position:], final=True)
+    return items, parser.envelope
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_any_chunking_decodes_the_same_items(seed):
+    rng = random.Random(seed)
+    document = json.dumps({"paging": {"after": "abc"}, "accounts": ITEMS, "count": 6}, indent=rng.choice([None, 2]))
+    chunk_sizes = [rng.randint(1, 8) for _ in range(len(document))]
+    items, envelope = _parse(document, "accounts", chunk_sizes)
+    assert items == ITEMS
+    assert envelope == {"paging": {"after": "abc"}, "count": 6}
+
+
+def test_every_split_point_of_a_top_level_array():
+    document = json.dumps([1, 22, 333.5, -4e10, {"a": "b"}, "c"])
+    for split in range(len(document) + 1):
+        items, _ = _parse(document, None, [split])
+        assert items == [1, 22, 333.5, -4e10, {"a": "b"}, "c"], split
+
+
+def test_numbers_cut_at_the_end_of_a_chunk_wait_for_the_next_one():
+    parser = JsonArrayStreamParser()
+    assert parser.feed("[1") == []
+    assert parser.feed("2.") == []
+    assert parser.feed("5e") == []
+    assert parser.feed("2,") == [12.5e2]
+    assert parser.feed("7]", final=True) == [7]
+
+
+def test_empty_array_and_missing_items_key():
+    assert _parse('{"accounts": [], "paging": {}}', "accounts", [3]) == ([], {"paging": {}})
+    assert _parse('{"paging": {"after": null}}', "accounts", [5]) == ([], {"paging": {"after": None}})
+
+
+@pytest.mark.parametrize("document, items_key", [
+    ("[1, 2", None),
+    ('{"accounts": [1,', "accounts"),
+    ("{}", None),
+    ("[1 2]", None),
+])
+def test_malformed_documents_raise(document, items_key):
+    with pytest.raises(ValueError):
+        _parse(document, items_key, [])
+
+
+class _StreamingResponse:
+    def __init__(self, body, chunk_size):
+        self.body = body
+        self.chunk_size = chunk_size
+        self.headers = {}
+        self.closed = False
+
+    def iter_content(self, chunk_size):
+        for start in range(0, len(self.body), self.chunk_size):
+            yield self.body[start:start + self.chunk_size]
+
+    def close(self):
+        self.closed = True
+
+
+def test_streamed_response_decodes_utf8_split_across_chunks():
+    body = json.dumps({"data": ITEMS, "next": "cursor"}, ensure_ascii=False).encode("utf-8")
+    response = _StreamingResponse(body, chunk_size=3)
+    streamed = StreamedResponse(response, "data")
+    assert list(streamed) == ITEMS
+    assert streamed.get("next") == "cursor"
+    assert response.closed
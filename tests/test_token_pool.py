@@ -0,0 +1,103 @@
+import itertools
+import time
+import types
+
+import jwt
+import pytest
+from cryptography.hazmat.primitives.asymmetric import ec
+
+from fireblocks_sdk import PresignedTokenPool, token_pool
+from fireblocks_sdk.sdk_token_provider import SdkTokenProvider
+
+
+def _wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.005)
+
+
+class _Signer:
+    def __init__(self):
+        self.counter = itertools.count()
+        self.signed = []
+
+    def __call__(self, path):
+        token = f"{path}#{next(self.counter)}"
+        self.signed.append(token)
+        return token
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Replaces the pool's monotonic clock with one the test moves forward"""
+    now = [1000.0]
+    monkeypatch.setattr(token_pool, "time", types.SimpleNamespace(monotonic=lambda: now[0]))
+    return now
+
+
+def test_tokens_are_handed_out_once(clock):
+    signer = _Signer()
+    pool = PresignedTokenPool(["/v1/a"], tokens_per_path=2)
+    pool.start(signer, 100)
+    try:
+        assert pool.pop("/v1/unregistered") is None
+        popped = []
+        for _ in range(5):
+            _wait_for(lambda: pool.stats()["ready"] == 2)
+            popped.append(pool.pop("/v1/a"))
+        assert len(set(popped)) == 5
+        assert set(popped) <= set(signer.signed)
+        assert pool.stats()["hits"] == 5
+    finally:
+        pool.close()
+
+
+def test_expired_tokens_are_dropped(clock):
+    signer = _Signer()
+    pool = PresignedTokenPool(["/v1/a"], tokens_per_path=2, min_validity=10)
+    pool.start(signer, 100)
+    try:
+        _wait_for(lambda: pool.stats()["ready"] == 2)
+        stale = list(signer.signed)
+        # tokens are usable until lifetime - 1 - min_validity seconds after signing
+        clock[0] += 89
+        assert pool.pop("/v1/a") is None
+        assert pool.stats()["misses"] == 1
+        _wait_for(lambda: pool.stats()["ready"] == 2)
+        assert pool.pop("/v1/a") not in stale
+    finally:
+        pool.close()
+
+
+def test_unregistered_paths_stop_being_presigned(clock):
+    pool = PresignedTokenPool(["/v1/a"], tokens_per_path=1)
+    pool.start(_Signer(), 100)
+    try:
+        _wait_for(lambda: pool.stats()["ready"] == 1)
+        pool.unregister("/v1/a")
+        assert pool.pop("/v1/a") is None
+        assert pool.stats() == {"hits": 0, "misses": 0, "ready": 0}
+    finally:
+        pool.close()
+
+
+def test_min_validity_must_fit_in_the_token_lifetime():
+    with pytest.raises(ValueError, match="min_validity"):
+        PresignedTokenPool(min_validity=60).start(_Signer(), 55)
+
+
+def test_provider_uses_presigned_tokens_for_requests_without_a_body():
+    key = ec.generate_private_key(ec.SECP256R1())
+    pool = PresignedTokenPool(["/v1/transactions/1"], tokens_per_path=1)
+    provider = SdkTokenProvider(key, "api-key", 55, token_pool=pool)
+    try:
+        _wait_for(lambda: pool.stats()["ready"] == 1)
+        token = provider.sign_jwt("/v1/transactions/1")
+        assert pool.stats()["hits"] == 1
+        assert jwt.decode(token, key.public_key(), algorithms=["ES256"])["uri"] == "/v1/transactions/1"
+        # a body has to be hashed into the token, it is signed on the spot
+        provider.sign_jwt("/v1/transactions/1", b"{}")
+        assert pool.stats()["hits"] == 1
+    finally:
+        provider.close()
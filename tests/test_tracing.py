@@ -0,0 +1,118 @@
+import json
+import urllib.parse
+
+import pytest
+from cryptography.hazmat.primitives.asymmetric import ec
+
+from fireblocks_sdk import FireblocksApiException, FireblocksSDK, RetryPolicy, tracing
+from fireblocks_sdk.tracing import TracingInstrumentation, instrument_tracing
+from fireblocks_sdk.transport import Transport
+
+pytest.importorskip("opentelemetry.sdk")
+from opentelemetry.sdk.trace import TracerProvider  # noqa: E402
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor  # noqa: E402
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter  # noqa: E402
+from opentelemetry.trace import StatusCode  # noqa: E402
+
+
+class _Response:
+    def __init__(self, body, status_code=200):
+        self.content = json.dumps(body).encode("utf-8")
+        self.text = self.content.decode("utf-8")
+        self.status_code = status_code
+        self.headers = {}
+
+    def json(self):
+        return json.loads(self.content)
+
+
+class _StubTransport(Transport):
+    """Answers with the queued (status, body) pairs in order, pages addresses by the `after` offset"""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+
+    def request(self, method, url, headers=None, data=None, timeout=None, stream=False):
+        if "addresses_paginated" in url:
+            offset = int(urllib.parse.parse_qs(urllib.parse.urlparse(url).query).get("after", ["0"])[0])
+            paging = {"after": str(offset + 2)} if offset + 2 < 5 else {}
+            addresses = [{"address": f"a{i}"} for i in range(offset, min(offset + 2, 5))]
+            return _Response({"addresses": addresses, "paging": paging})
+        status_code, body = self.responses.pop(0)
+        return _Response(body, status_code)
+
+
+@pytest.fixture
+def exporter():
+    return InMemorySpanExporter()
+
+
+@pytest.fixture
+def tracer(exporter):
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    return provider.get_tracer("test")
+
+
+def _client(*responses, **kwargs):
+    return FireblocksSDK(ec.generate_private_key(ec.SECP256R1()), "api-key", transport=_StubTransport(*responses),
+                         **kwargs)
+
+
+def _by_name(exporter):
+    return {span.name: span for span in exporter.get_finished_spans()}
+
+
+def test_the_method_span_is_the_parent_of_the_request_span(tracer, exporter):
+    client = instrument_tracing(_client((200, {"id": "0"})), tracer)
+    assert client.get_vault_account_by_id("0") == {"id": "0"}
+    spans = _by_name(exporter)
+    method = spans["FireblocksSDK.get_vault_account_by_id"]
+    request = spans["GET /v1/vault/accounts/{id}"]
+    assert request.parent.span_id == method.context.span_id
+    assert request.attributes["http.route"] == "/v1/vault/accounts/{id}"
+    assert request.attributes["http.response.status_code"] == 200
+    assert request.attributes["http.response.body.size"] == len(b'{"id": "0"}')
+    assert request.attributes["fireblocks.retry_count"] == 0
+    assert "fireblocks.sign_ms" in request.attributes
+    # instrumenting twice doesn't add a second request span per call
+    instrument_tracing(client, tracer)
+    assert sum(isinstance(hook, TracingInstrumentation) for hook in client.instrumentation) == 1
+
+
+def test_retries_and_errors_are_recorded(tracer, exporter):
+    client = _client((503, {}), (400, {"code": 7}), retry_policy=RetryPolicy(backoff_factor=0, jitter=False))
+    instrument_tracing(client, tracer)
+    with pytest.raises(FireblocksApiException):
+        client.get_vault_account_by_id("0")
+    spans = _by_name(exporter)
+    request = spans["GET /v1/vault/accounts/{id}"]
+    assert request.attributes["fireblocks.retry_count"] == 1
+    assert request.attributes["http.response.status_code"] == 400
+    assert request.status.status_code == StatusCode.ERROR
+    assert spans["FireblocksSDK.get_vault_account_by_id"].status.status_code == StatusCode.ERROR
+
+
+def test_generator_spans_cover_the_whole_iteration(tracer, exporter):
+    client = instrument_tracing(_client(), tracer)
+    addresses = client.iter_paginated_addresses("0", "BTC", limit=2)
+    assert next(addresses) == {"address": "a0"}
+    assert "FireblocksSDK.iter_paginated_addresses" not in _by_name(exporter)
+    assert [address["address"] for address in addresses] == ["a1", "a2", "a3", "a4"]
+
+    spans = exporter.get_finished_spans()
+    iteration = next(span for span in spans if span.name == "FireblocksSDK.iter_paginated_addresses")
+    pages = [span for span in spans if span.name == "FireblocksSDK.get_paginated_addresses"]
+    assert len(pages) == 3
+    assert all(page.parent.span_id == iteration.context.span_id for page in pages)
+    assert iteration.end_time >= max(page.end_time for page in pages)
+
+
+def test_nothing_is_traced_without_opentelemetry(monkeypatch):
+    monkeypatch.setattr(tracing, "trace", None)
+    client = _client((200, {"id": "0"}))
+    method = client.get_vault_account_by_id
+    assert instrument_tracing(client) is client
+    assert client.get_vault_account_by_id == method
+    assert client.instrumentation == []
+    assert TracingInstrumentation().tracer is None
@@ -0,0 +1,60 @@
+import threading
+import time
+
+from fireblocks_sdk.transaction_export import _ShardMerger, export_transactions, split_time_range
+
+
+def test_split_time_range_covers_the_range():
+    assert split_time_range(0, 100, 4) == [0, 25, 50, 75, 100]
+    assert split_time_range(0, 3, 8) == [0, 1, 2, 3]
+
+
+def test_merger_keeps_boundary_transactions_in_one_shard():
+    merger = _ShardMerger([0, 10, 20])
+    # shard 0 is requested with a 1ms overlap, so it may return the transaction created at 10
+    assert not merger.accept(0, {"id": "a", "createdAt": 10})
+    assert merger.accept(1, {"id": "a", "createdAt": 10})
+    # the last shard includes its upper bound
+    assert merger.accept(1, {"id": "b", "createdAt": 20})
+    assert not merger.accept(1, {"id": "c", "createdAt": 21})
+
+
+def test_merger_drops_ids_repeated_across_pages():
+    merger = _ShardMerger([0, 100])
+    assert merger.accept(0, {"id": "a", "createdAt": 5})
+    assert merger.accept(0, {"id": "b", "createdAt": 5})
+    assert not merger.accept(0, {"id": "a", "createdAt": 5})
+    assert merger.accept(0, {"id": "c", "createdAt": 6})
+
+
+class _StubSdk:
+    """Serves one page of one transaction per shard, recording the first page requests"""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.first_pages = []
+        self._lock = threading.Lock()
+
+    def _get_transactions(self, before, after, **kwargs):
+        with self._lock:
+            self.first_pages.append(after)
+        time.sleep(self.delay)
+        return {"transactions": [{"id": f"tx{after + 1}", "createdAt": after + 1}], "pageDetails": {"nextPage": ""}}
+
+
+def test_export_yields_all_shards_in_order():
+    sdk = _StubSdk()
+    boundaries = split_time_range(0, 40, 4)
+    transactions = list(export_transactions(sdk, boundaries, 500, 2, 4, {}))
+    assert [tx["createdAt"] for tx in transactions] == [1, 10, 20, 30]
+
+
+def test_export_stopped_early_cancels_queued_shards():
+    sdk = _StubSdk(delay=0.05)
+    boundaries = split_time_range(0, 1000, 50)
+    exported = export_transactions(sdk, boundaries, 500, 2, 4, {})
+    next(exported)
+    exported.close()
+    time.sleep(0.3)
+    # only the shards already running when the consumer stopped were requested
+    assert len(sdk.first_pages) <= 4
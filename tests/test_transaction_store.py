@@ -0,0 +1,65 @@
+import time
+
+from fireblocks_sdk.transaction_store import TransactionStore
+
+
+class _StubSdk:
+    """Serves transactions like the API: after filters createdAt, a single page"""
+
+    def __init__(self, transactions):
+        self.transactions = {tx["id"]: dict(tx) for tx in transactions}
+        self.lookups = []
+
+    def get_transaction_by_id(self, tx_id):
+        self.lookups.append(tx_id)
+        return dict(self.transactions[tx_id])
+
+    def _get_transactions(self, before, after, order_by, sort, **kwargs):
+        listed = [tx for tx in self.transactions.values() if not after or tx["createdAt"] > after]
+        listed.sort(key=lambda tx: tx[order_by], reverse=sort == "DESC")
+        return {"transactions": [dict(tx) for tx in listed], "pageDetails": {"nextPage": ""}}
+
+
+def _now_ms():
+    return int(time.time() * 1000)
+
+
+def test_reconcile_applies_updates_of_transactions_created_earlier():
+    now = _now_ms()
+    sdk = _StubSdk([{"id": "a", "createdAt": now - 3600000, "lastUpdated": now - 3600000, "status": "SUBMITTED"}])
+    store = TransactionStore(sdk)
+    store.get("a")
+    sdk.transactions["a"].update(status="CONFIRMING", lastUpdated=_now_ms())
+    assert store.reconcile() == 1
+    assert store.peek("a")["status"] == "CONFIRMING"
+
+
+def test_reconcile_only_confirms_the_transactions_it_returned():
+    now = _now_ms()
+    sdk = _StubSdk([
+        {"id": "updated", "createdAt": now - 100000, "lastUpdated": now - 100000, "status": "SUBMITTED"},
+        {"id": "quiet", "createdAt": now - 100000, "lastUpdated": now - 100000, "status": "SUBMITTED"},
+    ])
+    store = TransactionStore(sdk, max_staleness=0.05)
+    store.get("updated")
+    store.get("quiet")
+    time.sleep(0.1)
+    sdk.transactions["updated"].update(status="QUEUED", lastUpdated=_now_ms())
+    store.reconcile()
+    sdk.lookups.clear()
+
+    assert store.get("updated")["status"] == "QUEUED"
+    assert store.get("quiet")["status"] == "SUBMITTED"
+    # the stale transaction missing from the reconciliation is read again
+    assert sdk.lookups == ["quiet"]
+
+
+def test_reconcile_confirms_later_webhook_updates():
+    now = _now_ms()
+    sdk = _StubSdk([{"id": "a", "createdAt": now, "lastUpdated": now, "status": "SUBMITTED"}])
+    store = TransactionStore(sdk, max_staleness=0.05)
+    store.apply({"id": "a", "createdAt": now, "lastUpdated": now + 1, "status": "QUEUED"})
+    time.sleep(0.1)
+    assert store.reconcile() == 0
+    assert store.get("a")["status"] == "QUEUED"
+    assert sdk.lookups == []
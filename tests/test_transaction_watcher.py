@@ -0,0 +1,155 @@
+from fireblocks_sdk.transaction_watcher import TransactionWatcher, fetch_updated_since
+
+
+class _StubSdk:
+    """Serves transactions like the API: before/after filter createdAt, pages of `limit` transactions"""
+
+    def __init__(self, transactions, page_size=500):
+        self.transactions = {tx["id"]: dict(tx) for tx in transactions}
+        self.page_size = page_size
+        self.lookups = []
+        self.queries = []
+
+    def update(self, tx_id, status, last_updated):
+        self.transactions[tx_id].update(status=status, lastUpdated=last_updated)
+
+    def get_transaction_by_id(self, tx_id):
+        self.lookups.append(tx_id)
+        return dict(self.transactions[tx_id])
+
+    def _get_transactions(self, before, after, limit, order_by, sort, **kwargs):
+        self.queries.append({"before": before, "after": after, "order_by": order_by, "sort": sort})
+        listed = [
+            tx for tx in self.transactions.values()
+            if (not after or tx["createdAt"] > after) and (not before or tx["createdAt"] < before)
+        ]
+        listed.sort(key=lambda tx: tx[order_by], reverse=sort == "DESC")
+        return self._page([dict(tx) for tx in listed], 0)
+
+    def get_transactions_with_page_info(self, next_or_previous_path):
+        listed, offset = self._pending_pages[next_or_previous_path]
+        return self._page(listed, offset)
+
+    def _page(self, listed, offset):
+        if not hasattr(self, "_pending_pages"):
+            self._pending_pages = {}
+        end = offset + self.page_size
+        next_page = ""
+        if end < len(listed):
+            next_page = f"/v1/transactions?page={len(self._pending_pages)}"
+            self._pending_pages[next_page] = (listed, end)
+        return {"transactions": listed[offset:end], "pageDetails": {"nextPage": next_page}}
+
+
+def _transaction(tx_id, created_at, last_updated, status="SUBMITTED"):
+    return {"id": tx_id, "createdAt": created_at, "lastUpdated": last_updated, "status": status}
+
+
+def test_fetch_updated_since_does_not_filter_on_creation_time():
+    sdk = _StubSdk([
+        _transaction("old", 1000, 9000),
+        _transaction("new", 8000, 8500),
+        _transaction("unchanged", 2000, 3000),
+    ])
+    updates, complete = fetch_updated_since(sdk, 5000, 10)
+    assert complete
+    assert set(updates) == {"old", "new"}
+    assert not sdk.queries[0]["after"]
+
+
+def test_fetch_updated_since_reports_incomplete_reads():
+    sdk = _StubSdk([_transaction(f"tx{i}", i, 5000 + i) for i in range(10)], page_size=3)
+    updates, complete = fetch_updated_since(sdk, 5000, 2)
+    assert not complete
+    # most recently updated first
+    assert set(updates) == {"tx9", "tx8", "tx7", "tx6", "tx5", "tx4"}
+
+
+def test_batch_covers_transactions_created_before_watch():
+    transactions = [_transaction(f"tx{i}", 1000 + i, 1000 + i) for i in range(6)]
+    sdk = _StubSdk(transactions)
+    watcher = TransactionWatcher(sdk, batch_threshold=2, poll_intervals={"SUBMITTED": 0})
+    watcher._now_ms = lambda: 100000
+    futures = {tx["id"]: watcher.watch(tx["id"]) for tx in transactions}
+
+    # the first poll looks every transaction up, the next ones are batched
+    watcher.poll()
+    assert sorted(sdk.lookups) == sorted(futures)
+    sdk.lookups.clear()
+
+    sdk.update("tx0", "COMPLETED", 100001)
+    sdk.update("tx3", "BROADCASTING", 100002)
+    watcher._now_ms = lambda: 100010
+    watcher.poll()
+    assert sdk.lookups == []
+    assert futures["tx0"].result(timeout=0)["status"] == "COMPLETED"
+    assert watcher._watched["tx3"].status == "BROADCASTING"
+
+    sdk.update("tx5", "FAILED", 100020)
+    watcher.poll()
+    assert futures["tx5"].result(timeout=0)["status"] == "FAILED"
+    assert sdk.lookups == []
+
+
+def test_incomplete_batch_looks_up_the_transactions_it_missed():
+    transactions = [_transaction(f"tx{i}", i, 1000 + i) for i in range(6)]
+    sdk = _StubSdk(transactions, page_size=2)
+    watcher = TransactionWatcher(sdk, batch_threshold=2, max_batch_pages=1, poll_intervals={"SUBMITTED": 0})
+    watcher._now_ms = lambda: 100000
+    for tx in transactions:
+        watcher.watch(tx["id"])
+    watcher.poll()
+    sdk.lookups.clear()
+
+    for i, tx in enumerate(transactions):
+        sdk.update(tx["id"], "QUEUED", 100001 + i)
+    watcher.poll()
+    # the single page returned tx5 and tx4
+    assert sorted(sdk.lookups) == ["tx0", "tx1", "tx2", "tx3"]
+
+
+class _FailingSdk(_StubSdk):
+    def get_transaction_by_id(self, tx_id):
+        self.lookups.append(tx_id)
+        raise ConnectionError("unreachable")
+
+
+def test_lookup_errors_fail_the_future_after_max_errors():
+    sdk = _FailingSdk([_transaction("a", 1, 1)])
+    watcher = TransactionWatcher(sdk, max_errors=2, default_interval=0)
+    future = watcher.watch("a")
+    watcher.poll()
+    assert not future.done()
+    watcher._watched["a"].next_poll_at = 0
+    watcher.poll()
+    assert isinstance(future.exception(timeout=0), ConnectionError)
+    assert "a" not in watcher._watched
+
+
+def test_cancelled_watches_are_dropped():
+    sdk = _FailingSdk([_transaction("a", 1, 1), _transaction("b", 1, 1)])
+    watcher = TransactionWatcher(sdk, max_errors=1)
+    cancelled = watcher.watch("a")
+    other = watcher.watch("b")
+    cancelled.cancel()
+    watcher.poll()
+    assert sdk.lookups == ["b"]
+    assert "a" not in watcher._watched
+    assert isinstance(other.exception(timeout=0), ConnectionError)
+
+
+def test_watch_cancelled_during_a_lookup_does_not_break_the_poll():
+    sdk = _FailingSdk([_transaction("a", 1, 1), _transaction("b", 1, 1)])
+    watcher = TransactionWatcher(sdk, max_errors=1)
+    futures = {"a": watcher.watch("a"), "b": watcher.watch("b")}
+    original = sdk.get_transaction_by_id
+
+    def cancel_then_fail(tx_id):
+        futures[tx_id].cancel()
+        return original(tx_id)
+
+    sdk.get_transaction_by_id = cancel_then_fail
+    watcher.poll()
+    assert sdk.lookups == ["a", "b"]
+    assert all(future.cancelled() for future in futures.values())
+    assert watcher._watched == {}
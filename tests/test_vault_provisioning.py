@@ -0,0 +1,112 @@
+import asyncio
+
+import pytest
+
+from fireblocks_sdk import FireblocksApiException
+from fireblocks_sdk.vault_provisioning import (
+    BulkProvisioningResult,
+    VaultAccountSpec,
+    aprovision_vault_accounts,
+    idempotency_key,
+    provision_vault_accounts,
+)
+
+
+class _StubSdk:
+    """Creates accounts and assets like the API, failing the (name or vault account id, step) pairs in `failing`"""
+
+    def __init__(self, failing=()):
+        self.failing = set(failing)
+        self.calls = []
+
+    def create_vault_account(self, name, hidden_on_ui, customer_ref_id, auto_fuel, idempotency_key=None):
+        self.calls.append(("account", name, idempotency_key))
+        if (name, "account") in self.failing:
+            raise FireblocksApiException("rejected", 1000)
+        return {"id": f"id-{name}", "name": name}
+
+    def create_vault_asset(self, vault_account_id, asset_id, idempotency_key=None):
+        self.calls.append((asset_id, vault_account_id, idempotency_key))
+        if (vault_account_id, asset_id) in self.failing:
+            raise ConnectionError("unreachable")
+        return {"id": asset_id, "address": f"{asset_id}-{vault_account_id}"}
+
+
+class _AsyncStubSdk(_StubSdk):
+    async def create_vault_account(self, *args, **kwargs):
+        return super().create_vault_account(*args, **kwargs)
+
+    async def create_vault_asset(self, *args, **kwargs):
+        return super().create_vault_asset(*args, **kwargs)
+
+
+_SPECS = [
+    VaultAccountSpec("alice", assets=["BTC", "ETH"]),
+    VaultAccountSpec("bob", assets=["BTC"]),
+    VaultAccountSpec("carol"),
+]
+
+
+def _provision(sdk, resume_from=None, done=None):
+    return provision_vault_accounts(sdk, _SPECS, 2, resume_from, done.append if done is not None else None)
+
+
+def test_provisioning_creates_accounts_then_their_assets():
+    sdk = _StubSdk()
+    done = []
+    result = _provision(sdk, done=done)
+    assert result.complete
+    assert sorted(item.index for item in done) == [0, 1, 2]
+    assert [item.name for item in result.items] == ["alice", "bob", "carol"]
+    assert result.items[0].assets == {
+        "BTC": {"id": "BTC", "address": "BTC-id-alice"}, "ETH": {"id": "ETH", "address": "ETH-id-alice"},
+    }
+    assert [call[0] for call in sdk.calls if call[1] in ("alice", "id-alice")] == ["account", "BTC", "ETH"]
+
+
+def test_every_step_has_its_own_stable_idempotency_key():
+    sdk = _StubSdk()
+    result = _provision(sdk)
+    keys = [key for _, _, key in sdk.calls]
+    assert len(set(keys)) == len(keys) == 6
+    assert ("BTC", "id-bob", idempotency_key(result.batch_id, 1, "BTC")) in sdk.calls
+    assert idempotency_key(result.batch_id, 1, "BTC") != idempotency_key(result.batch_id, 0, "BTC")
+
+
+def test_resuming_only_resends_the_missing_steps_with_the_same_keys():
+    first = _provision(_StubSdk(failing={("bob", "account"), ("id-alice", "ETH")}))
+    assert [item.succeeded for item in first.items] == [False, False, True]
+    assert first.items[1].error == "rejected" and first.items[1].error_code == 1000
+    assert first.items[0].error == "unreachable" and set(first.items[0].assets) == {"BTC"}
+
+    state = first.to_state()
+    sdk = _StubSdk()
+    resumed = _provision(sdk, BulkProvisioningResult.from_state(state))
+    assert resumed.complete
+    assert resumed.batch_id == first.batch_id
+    assert sorted(sdk.calls) == sorted([
+        ("ETH", "id-alice", idempotency_key(first.batch_id, 0, "ETH")),
+        ("account", "bob", idempotency_key(first.batch_id, 1, "account")),
+        ("BTC", "id-bob", idempotency_key(first.batch_id, 1, "BTC")),
+    ])
+    # a complete batch has nothing left to send
+    sdk.calls.clear()
+    assert _provision(sdk, resumed).complete
+    assert sdk.calls == []
+
+
+def test_resuming_needs_the_same_number_of_specs():
+    result = _provision(_StubSdk())
+    with pytest.raises(ValueError, match="Resuming a batch of 3 items with 2 specs"):
+        provision_vault_accounts(_StubSdk(), _SPECS[:2], 2, result, None)
+
+
+def test_async_provisioning_matches_the_threaded_one():
+    sdk = _AsyncStubSdk(failing={("carol", "account")})
+    first = asyncio.run(aprovision_vault_accounts(sdk, _SPECS, 2, None, None))
+    assert [item.succeeded for item in first.items] == [True, True, False]
+
+    sdk = _AsyncStubSdk()
+    resumed = asyncio.run(aprovision_vault_accounts(sdk, _SPECS, 2, first, None))
+    assert resumed.complete
+    assert sdk.calls == [("account", "carol", idempotency_key(first.batch_id, 2, "account"))]
@@ -0,0 +1,145 @@
+import asyncio
+import base64
+import io
+import json
+import threading
+import time
+
+import pytest
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import padding, rsa
+
+from fireblocks_sdk.webhooks import ALL_EVENTS, WebhookReceiver, WebhookVerifier
+
+_KEY = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+_PUBLIC_KEY = _KEY.public_key().public_bytes(
+    serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+).decode()
+
+
+def _signed(event):
+    body = json.dumps(event).encode()
+    return body, base64.b64encode(_KEY.sign(body, padding.PKCS1v15(), hashes.SHA512())).decode()
+
+
+def _event(i, event_type="TRANSACTION_STATUS_UPDATED"):
+    return {"type": event_type, "data": {"id": f"tx{i}"}}
+
+
+@pytest.fixture
+def receiver():
+    receiver = WebhookReceiver(_PUBLIC_KEY, batch_interval=0.01)
+    yield receiver
+    receiver.stop()
+
+
+def test_verifier_accepts_only_valid_signatures():
+    verifier = WebhookVerifier(_PUBLIC_KEY)
+    body, signature = _signed(_event(1))
+    assert verifier.verify(body, signature)
+    assert not verifier.verify(body + b" ", signature)
+    assert not verifier.verify(body, "")
+    assert not verifier.verify(body, None)
+    assert not verifier.verify(body, "not base64!")
+    assert not verifier.verify(body, base64.b64encode(b"x" * 256).decode())
+
+
+def test_handle_statuses(receiver):
+    body, signature = _signed(_event(1))
+    assert receiver.handle(body, signature) == 200
+    assert receiver.handle(body, None) == 401
+    assert receiver.handle(body, _signed(_event(2))[1]) == 401
+    assert receiver.handle(*_signed([1, 2])) == 400
+    not_json = b"not json"
+    assert receiver.handle(not_json, base64.b64encode(_KEY.sign(not_json, padding.PKCS1v15(), hashes.SHA512()))) == 400
+    receiver.max_body_size = 10
+    assert receiver.handle(body, signature) == 413
+    assert receiver.stats["invalid_signature"] == 2
+
+
+def test_handlers_get_each_event_once_in_batches_by_type(receiver):
+    received = []
+    everything = []
+    receiver.on("TRANSACTION_STATUS_UPDATED", received.extend)
+    receiver.on(ALL_EVENTS)(everything.extend)
+    requests = [_signed(_event(i)) for i in range(5)] + [_signed(_event(9, "TRANSACTION_CREATED"))]
+    for body, signature in requests + requests[:2]:
+        assert receiver.handle(body, signature) == 200
+    receiver.stop()
+    assert [event["data"]["id"] for event in received] == ["tx0", "tx1", "tx2", "tx3", "tx4"]
+    assert len(everything) == 6
+    assert receiver.stats["duplicates"] == 2
+
+
+def test_handler_errors_go_to_on_error():
+    errors = []
+    receiver = WebhookReceiver(_PUBLIC_KEY, batch_interval=0.01, on_error=lambda e, events: errors.append(events))
+    receiver.on(ALL_EVENTS, lambda events: 1 / 0)
+    receiver.handle(*_signed(_event(1)))
+    receiver.stop()
+    assert errors == [[_event(1)]]
+
+
+def test_slow_handlers_push_back_with_503():
+    release = threading.Event()
+    receiver = WebhookReceiver(_PUBLIC_KEY, max_workers=1, batch_size=1, batch_interval=0, max_pending=3)
+    receiver.on(ALL_EVENTS, lambda events: release.wait(5))
+    try:
+        statuses = []
+        for i in range(20):
+            statuses.append(receiver.handle(*_signed(_event(i))))
+            time.sleep(0.005)
+        assert statuses.count(503) > 0
+        # one batch running, one waiting for a worker in the dispatcher, max_pending in the queue
+        assert statuses.count(200) <= 3 + 2
+        assert receiver._executor._work_queue.qsize() == 0
+    finally:
+        release.set()
+        receiver.stop()
+
+
+def _wsgi(receiver, method, body=b"", signature=None):
+    environ = {"REQUEST_METHOD": method, "CONTENT_LENGTH": str(len(body)), "wsgi.input": io.BytesIO(body)}
+    if signature is not None:
+        environ["HTTP_FIREBLOCKS_SIGNATURE"] = signature
+    statuses = []
+    result = receiver.wsgi_app(environ, lambda status, headers: statuses.append(status))
+    assert result == [b""]
+    return statuses[0]
+
+
+def test_wsgi_app(receiver):
+    body, signature = _signed(_event(1))
+    assert _wsgi(receiver, "POST", body, signature) == "200 OK"
+    assert _wsgi(receiver, "POST", body) == "401 Unauthorized"
+    assert _wsgi(receiver, "GET") == "405 Method Not Allowed"
+    receiver.max_body_size = 10
+    assert _wsgi(receiver, "POST", body, signature) == "413 Payload Too Large"
+
+
+def _asgi(receiver, method, body=b"", signature=None, chunk_size=16):
+    headers = [(b"content-length", str(len(body)).encode())]
+    if signature is not None:
+        headers.append((b"fireblocks-signature", signature.encode()))
+    chunks = [body[i:i + chunk_size] for i in range(0, len(body), chunk_size)] or [b""]
+    messages = [{"type": "http.request", "body": chunk, "more_body": i < len(chunks) - 1} for i, chunk in enumerate(chunks)]
+    sent = []
+
+    async def receive():
+        return messages.pop(0)
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {"type": "http", "method": method, "headers": headers}
+    asyncio.run(receiver.asgi_app(scope, receive, send))
+    return sent[0]["status"]
+
+
+def test_asgi_app(receiver):
+    body, signature = _signed(_event(1))
+    assert _asgi(receiver, "POST", body, signature) == 200
+    assert _asgi(receiver, "POST", body, "bad") == 401
+    assert _asgi(receiver, "PUT") == 405
+    receiver.max_body_size = 10
+    assert _asgi(receiver, "POST", body, signature) == 413